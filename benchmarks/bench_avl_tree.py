@@ -0,0 +1,73 @@
+"""
+Benchmark del núcleo del árbol AVL (inserción, búsqueda por rango y eliminación).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_avl_tree.py [n ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_structures.avl_tree import AVLTree
+
+
+class ObstaculoFalso:
+    """Obstáculo mínimo: el árbol solo necesita la posición X y el ancho"""
+    __slots__ = ('x', 'width')
+
+    def __init__(self, x, width=60):
+        self.x = x
+        self.width = width
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def bench(n, semilla=1234):
+    rnd = random.Random(semilla)
+    posiciones = rnd.sample(range(n * 10), n)
+    obstaculos = [ObstaculoFalso(x) for x in posiciones]
+    ventanas = [(x - 200, x + 1000) for x in rnd.sample(posiciones, min(n, 10000))]
+    arbol = AVLTree()
+
+    def insertar():
+        for o in obstaculos:
+            arbol.insertar_obstaculo(o)
+
+    def buscar():
+        for x_min, x_max in ventanas:
+            arbol.buscar_obstaculos_visibles(x_min, x_max)
+
+    def solapados():
+        # Huella del carro: 50 px
+        for x_min, _ in ventanas:
+            arbol.buscar_solapados(x_min + 200, x_min + 250)
+
+    def eliminar():
+        for x in posiciones:
+            arbol.eliminar_obstaculo(x)
+
+    def construir():
+        AVLTree().build_from_sorted(obstaculos)
+
+    t_con = medir(construir)
+    t_ins = medir(insertar)
+    t_bus = medir(buscar)
+    t_sol = medir(solapados)
+    t_eli = medir(eliminar)
+    print(f"n={n:>8}  carga masiva {t_con * 1000:>8.1f} ms  insertar {n / t_ins:>10.0f} op/s  "
+          f"rango {len(ventanas) / t_bus:>10.0f} op/s  "
+          f"solapados {len(ventanas) / t_sol:>10.0f} op/s  "
+          f"eliminar {n / t_eli:>10.0f} op/s")
+
+
+if __name__ == "__main__":
+    tamanos = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in tamanos:
+        bench(n)
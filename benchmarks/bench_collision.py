@@ -0,0 +1,67 @@
+"""
+Detección de colisiones: prueba uno por uno contra la pasada vectorizada.
+
+Para cada tamaño se arma una lista de candidatos alrededor del carro y se
+mide, por llamada:
+
+- uno por uno: un pygame.Rect por obstáculo y colliderect (la ruta de
+  siempre, que se sigue usando con pocos candidatos).
+- lote: empaquetar en arreglos de NumPy + colisiones_en_lote.
+- solo lote: colisiones_en_lote con los arreglos ya armados (el costo si
+  el índice entregara las columnas directamente).
+
+También verifica que ambas rutas devuelvan los mismos obstáculos. Sirve
+para elegir CollisionDetector.MIN_LOTE_VECTORIAL.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_collision.py
+"""
+import os
+import random
+import sys
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.collision_detector import CollisionDetector
+from game.obstacle import Obstacle
+
+TAMANOS = (4, 16, 32, 64, 256, 1000, 10000)
+TIPOS = ('rock', 'tree', 'pothole', 'hole')
+CARRO_X = 100
+CARRO_Y = 325
+POSICION = 5000
+
+
+def candidatos(n):
+    rnd = random.Random(n)
+    return [Obstacle(POSICION + rnd.randrange(-200, 200), rnd.choice((225, 325)), rnd.choice(TIPOS))
+            for _ in range(n)]
+
+
+def medir(funcion, n):
+    repeticiones = max(20, 200_000 // n)
+    return min(timeit.repeat(funcion, number=repeticiones, repeat=5)) / repeticiones
+
+
+def main():
+    detector = CollisionDetector()
+    y_final = CARRO_Y - 30
+    print(f"{'candidatos':>10} {'uno por uno':>12} {'lote':>10} {'solo lote':>10}")
+    for n in TAMANOS:
+        obstaculos = candidatos(n)
+        columnas = detector.empaquetar(obstaculos)
+        uno = detector._golpeados_uno_por_uno(CARRO_X, y_final, obstaculos, POSICION, True)
+        lote = [obstaculos[i] for i in detector.colisiones_en_lote(CARRO_X, y_final, POSICION, True, *columnas)]
+        assert uno == lote, "las dos rutas no coinciden"
+        t_uno = medir(lambda: detector._golpeados_uno_por_uno(CARRO_X, y_final, obstaculos, POSICION, True), n)
+        t_lote = medir(lambda: detector.colisiones_en_lote(CARRO_X, y_final, POSICION, True,
+                                                           *detector.empaquetar(obstaculos)), n)
+        t_solo = medir(lambda: detector.colisiones_en_lote(CARRO_X, y_final, POSICION, True, *columnas), n)
+        print(f"{n:>10} {t_uno * 1e6:>9.1f} µs {t_lote * 1e6:>7.1f} µs {t_solo * 1e6:>7.1f} µs")
+    print(f"MIN_LOTE_VECTORIAL = {CollisionDetector.MIN_LOTE_VECTORIAL}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Carga de cursos grandes: JSON completo contra curso binario con mmap.
+
+Para cada n se escribe un curso aleatorio en los dos formatos y se mide:
+- JSON: json.load de todo el archivo (lo que hacía load_config).
+- Binario: abrir el CourseFile y leer los chunks de la primera ventana,
+  que es lo único que el juego necesita para arrancar.
+- Binario: leer un chunk cualquiera (lo que hace el streamer cada tanto).
+
+La memoria es el pico de tracemalloc durante cada carga.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_course_file.py [n ...]
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.course_file import CourseFile, escribir_curso
+
+PRIMERA_VENTANA = 3000  # Px de curso que se cargan antes del primer frame
+SEPARACION_MEDIA = 300
+
+
+def curso_aleatorio(n, semilla=1234):
+    rnd = random.Random(semilla)
+    return [{'x': rnd.randrange(n * SEPARACION_MEDIA), 'y': rnd.choice((225, 325)),
+             'type': rnd.choice(('rock', 'tree', 'pothole', 'hole'))}
+            for _ in range(n)]
+
+
+def medir(funcion):
+    """(segundos, pico de memoria en bytes, resultado).
+
+    El tiempo se toma en una corrida sin tracemalloc, que la haría varias
+    veces más lenta; la memoria en una segunda corrida.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico, resultado
+
+
+def cargar_json(ruta):
+    with open(ruta, 'r') as archivo:
+        return json.load(archivo)['obstacles']
+
+
+def cargar_binario(ruta):
+    curso = CourseFile(ruta)
+    return curso, curso.datos_en_rango(curso.inicio, curso.inicio + PRIMERA_VENTANA)
+
+
+def bench(n, carpeta):
+    datos = curso_aleatorio(n)
+    ruta_json = os.path.join(carpeta, f'curso_{n}.json')
+    ruta_bin = os.path.join(carpeta, f'curso_{n}.bin')
+    with open(ruta_json, 'w') as archivo:
+        json.dump({'obstacles': datos}, archivo)
+    inicio = time.perf_counter()
+    escribir_curso(ruta_bin, datos)
+    conversion = time.perf_counter() - inicio
+    del datos
+
+    print(f"n={n}  JSON {os.path.getsize(ruta_json) / 2**20:.1f} MiB  "
+          f"binario {os.path.getsize(ruta_bin) / 2**20:.1f} MiB  (conversión {conversion:.2f} s)")
+    segundos, pico, (curso, ventana) = medir(lambda: cargar_binario(ruta_bin))
+    print(f"  mmap + primera ventana    {segundos * 1000:9.3f} ms  pico {pico / 2**20:8.2f} MiB  "
+          f"({len(ventana)} obstáculos)")
+    segundos, pico, obstaculos = medir(lambda: cargar_json(ruta_json))
+    print(f"  json.load completo        {segundos * 1000:9.1f} ms  pico {pico / 2**20:8.2f} MiB  "
+          f"({len(obstaculos)} obstáculos)")
+    del obstaculos
+
+    rnd = random.Random(7)
+    indices = [rnd.randrange(curso.num_chunks) for _ in range(1000)]
+    inicio = time.perf_counter()
+    leidos = sum(len(curso.datos_chunk(i)) for i in indices)
+    segundos = time.perf_counter() - inicio
+    print(f"  chunk al azar             {segundos / len(indices) * 1e6:9.1f} us/chunk  "
+          f"({leidos / len(indices):.1f} obstáculos por chunk)")
+    curso.cerrar()
+
+
+def main(tamanos):
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in tamanos:
+            bench(n, carpeta)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,81 @@
+"""
+Memoria del modo infinito (curso procedural por chunks).
+
+Simula el bucle del juego sin ventana: en cada frame el CourseStreamer
+genera los chunks que entran en la distancia de generación y el gestor
+poda los obstáculos que quedaron atrás. Cada cierto tramo se informa
+cuántos obstáculos hay en el índice y la memoria viva según tracemalloc;
+ambos deben quedarse planos aunque la distancia crezca.
+
+También comprueba que la misma semilla da el mismo curso.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_endless.py [distancia ...]
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+
+from game.course_generator import CourseGenerator, CourseStreamer
+from game.obstacle_manager import ObstacleManager
+
+VELOCIDAD = 5
+REPORTES = 5
+
+
+def curso(semilla, chunks):
+    generador = CourseGenerator(semilla)
+    return [datos for i in range(chunks) for datos in generador.datos_chunk(i)]
+
+
+def recorrer(distancia, backend='persistent_avl'):
+    gestor = ObstacleManager(backend)
+    streamer = CourseStreamer(gestor, CourseGenerator(semilla=7))
+    tramo = distancia // REPORTES
+    reportes = []
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as salida:
+        for posicion in range(0, distancia + 1, VELOCIDAD):
+            streamer.actualizar(posicion)
+            gestor.obtener_obstaculos_visibles(posicion)
+            gestor.eliminar_obstaculos_pasados(posicion)
+            if posicion % tramo == 0:
+                salida.seek(0)
+                salida.truncate()  # Los mensajes del gestor no deben contar como memoria
+                gc.collect()       # Solo cuenta lo que sigue vivo, no la basura pendiente
+                actual, _ = tracemalloc.get_traced_memory()
+                reportes.append((posicion, len(gestor.arbol), actual))
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for posicion, obstaculos, actual in reportes:
+        print(f"  x={posicion:>10}  obstáculos en índice {obstaculos:>3}  "
+              f"memoria viva {actual / 1024:8.1f} KiB")
+    frames = distancia // VELOCIDAD
+    segundos = time.perf_counter() - inicio
+    print(f"  {frames} frames en {segundos:.2f} s ({segundos / frames * 1e6:.1f} us/frame), "
+          f"chunks generados {streamer.siguiente_chunk}, pico {pico / 1024:.1f} KiB")
+
+
+def main(distancias):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assert curso(42, 50) == curso(42, 50), "la misma semilla dio cursos distintos"
+    assert curso(42, 50) != curso(43, 50)
+    print("misma semilla, mismo curso: OK")
+    for distancia in distancias:
+        print(f"distancia={distancia}")
+        recorrer(distancia)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,92 @@
+"""
+Tirones por salida de texto: print() en el bucle contra el bus de eventos.
+
+Simula una partida densa en modo infinito y mide el tiempo de cada frame
+en el hilo del juego (streaming, poda, spawn) con dos formas de registrar:
+
+- print: cada spawn y cada obstáculo podado se imprime en el momento,
+  como hacía el gestor antes del bus.
+- bus: el gestor publica eventos en el bus (nivel debug, límite de
+  líneas por segundo) y el hilo escritor los saca a la misma salida.
+
+La salida de eventos de los dos modos va a un sumidero nulo (os.devnull)
+para que no se mezcle con la tabla de resultados. Con --terminal-lenta
+ese sumidero tarda RETARDO_LINEA por línea (durmiendo, como una
+escritura bloqueante a una terminal lenta), que es donde print frena.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_event_bus.py [frames] [--terminal-lenta]
+"""
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.course_generator import CourseGenerator, CourseStreamer
+from game.obstacle_manager import ObstacleManager
+from utils.event_bus import configurar_bus, detener_bus
+
+VELOCIDAD = 20
+RETARDO_LINEA = 0.0002
+
+
+class SalidaLenta:
+    """Envoltorio de stdout que tarda RETARDO_LINEA por línea escrita"""
+
+    def __init__(self, destino):
+        self.destino = destino
+
+    def write(self, texto):
+        time.sleep(RETARDO_LINEA * texto.count('\n'))
+        return self.destino.write(texto)
+
+    def flush(self):
+        self.destino.flush()
+
+
+def recorrer(frames, con_print, sumidero):
+    # El hilo escritor del bus usa el sys.stdout del momento: hasta detener_bus va al sumidero
+    with contextlib.redirect_stdout(sumidero):
+        bus = configurar_bus('error' if con_print else 'debug', max_por_segundo=50)
+        tiempos = jugar(frames, con_print)
+        emitidos, suprimidos = bus.emitidos, bus.suprimidos
+        detener_bus()
+    return sorted(tiempos), emitidos, suprimidos
+
+
+def jugar(frames, con_print):
+    gestor = ObstacleManager('avl')
+    streamer = CourseStreamer(gestor, CourseGenerator(semilla=3, separacion_min=20, separacion_max=40))
+    tiempos = []
+    for frame in range(frames):
+        posicion = frame * VELOCIDAD
+        inicio = time.perf_counter()
+        streamer.actualizar(posicion, VELOCIDAD)
+        eliminados = gestor.eliminar_obstaculos_pasados(posicion)
+        if frame % 10 == 0:
+            gestor.crear_obstaculo_aleatorio(posicion)
+            if con_print:
+                print(f"Obstáculo agregado cerca de la posición {posicion}")
+        if con_print:
+            for obstaculo in eliminados:
+                print(f"Obstáculo eliminado en posición {obstaculo.x}")
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main(frames, terminal_lenta):
+    with open(os.devnull, 'w') as nulo:
+        sumidero = SalidaLenta(nulo) if terminal_lenta else nulo
+        resultados = [('print', recorrer(frames, True, sumidero)), ('bus', recorrer(frames, False, sumidero))]
+    print(f"{frames} frames a {VELOCIDAD} px/frame")
+    for nombre, (tiempos, emitidos, suprimidos) in resultados:
+        print(f"  {nombre:6} mediana {tiempos[len(tiempos) // 2] * 1000:6.3f} ms  "
+              f"p99 {tiempos[int(len(tiempos) * 0.99)] * 1000:6.3f} ms  peor {tiempos[-1] * 1000:7.3f} ms"
+              + (f"  eventos {emitidos} (suprimidos por límite {suprimidos})" if nombre == 'bus' else ''))
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if a != '--terminal-lenta']
+    main(int(argumentos[0]) if argumentos else 5000, '--terminal-lenta' in sys.argv)
@@ -0,0 +1,69 @@
+"""
+Inserción de lotes: insert_many contra insertar uno por uno.
+
+Para un índice con n obstáculos se agregan lotes de distintos tamaños
+(una oleada procedimental, un evento con cientos de obstáculos...).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_insert_many.py [n ...]
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_structures.obstacle_index import BACKENDS, crear_indice
+from game.obstacle import tipo_obstaculo
+
+
+class ObstaculoFalso:
+    """Lo mínimo que usan los índices (el columnar también guarda y/tamaño y el código del tipo)"""
+    __slots__ = ('x', 'y', 'width', 'height', 'obstacle_type', 'tipo')
+
+    def __init__(self, x):
+        self.x = x
+        self.y = 225
+        self.width, self.height = 60, 60
+        self.obstacle_type = 'rock'
+        self.tipo = tipo_obstaculo('rock')
+
+
+def medir(funcion):
+    """Como timeit: sin el recolector de basura, que mete pausas según el tamaño del heap"""
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return time.perf_counter() - inicio
+    finally:
+        gc.enable()
+
+
+def bench(n, semilla=1234):
+    rnd = random.Random(semilla)
+    curso = [ObstaculoFalso(rnd.randrange(n * 100)) for _ in range(n)]
+    print(f"n={n}")
+    for backend in BACKENDS:
+        for m in (10, 100, 1_000, 10_000, n):
+            lote = [ObstaculoFalso(rnd.randrange(n * 100)) for _ in range(m)]
+            uno = crear_indice(backend)
+            uno.build_from_sorted(curso)
+            if backend == 'numpy' and m > 1_000:
+                t_uno = float('nan')  # una copia de columnas por obstáculo: demasiado lento
+            else:
+                t_uno = medir(lambda: [uno.insertar_obstaculo(o) for o in lote])
+            lotes = crear_indice(backend)
+            lotes.build_from_sorted(curso)
+            t_lote = medir(lambda: lotes.insert_many(lote))
+            print(f"  {backend:>15}  m={m:>7}  uno por uno {t_uno * 1000:>9.2f} ms  "
+                  f"insert_many {t_lote * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    tamanos = [int(a) for a in sys.argv[1:]] or [100_000]
+    for n in tamanos:
+        bench(n)
@@ -0,0 +1,93 @@
+"""
+Compara los backends de índice de obstáculos (ver obstacle_index.BACKENDS).
+
+Cargas medidas por backend:
+  - carga:     build_from_sorted de n obstáculos
+  - memoria:   bytes que ocupa el índice (sin contar los obstáculos)
+  - ventanas:  consultas [pos-200, pos+1000] avanzando como en el juego
+  - poda:      prune_less_than por frame a lo largo del curso
+  - inserción: obstáculos sueltos en posiciones aleatorias
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_obstacle_index.py [n ...]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_structures.obstacle_index import BACKENDS, crear_indice
+from game.obstacle import tipo_obstaculo
+
+
+class ObstaculoFalso:
+    """Lo mínimo que usan los índices (el columnar también guarda y/tamaño y el código del tipo)"""
+    __slots__ = ('x', 'y', 'width', 'height', 'obstacle_type', 'tipo')
+
+    def __init__(self, x, y, tipo):
+        self.x = x
+        self.y = y
+        self.width, self.height = 60, 60
+        self.obstacle_type = tipo
+        self.tipo = tipo_obstaculo(tipo)
+
+
+def crear_curso(n, semilla=1234):
+    rnd = random.Random(semilla)
+    return [ObstaculoFalso(rnd.randint(0, n * 300), rnd.choice((225, 325)),
+                           rnd.choice(('rock', 'tree', 'pothole', 'hole')))
+            for _ in range(n)]
+
+
+def bench(backend, curso, consultas=20000, inserciones=2000):
+    largo = max(o.x for o in curso)
+    paso = max(1, largo // consultas)
+
+    # La memoria se mide en una carga aparte: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    indice = crear_indice(backend)
+    indice.build_from_sorted(curso)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del indice
+
+    indice = crear_indice(backend)
+    inicio = time.perf_counter()
+    indice.build_from_sorted(curso)
+    t_carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for pos in range(0, largo, paso):
+        indice.buscar_obstaculos_visibles(pos - 200, pos + 1000)
+    t_ventanas = (time.perf_counter() - inicio) / (largo // paso)
+
+    rnd = random.Random(99)
+    nuevos = [ObstaculoFalso(rnd.randint(0, largo), 225, 'rock') for _ in range(inserciones)]
+    inicio = time.perf_counter()
+    for obstaculo in nuevos:
+        indice.insertar_obstaculo(obstaculo)
+    t_insercion = (time.perf_counter() - inicio) / inserciones
+
+    inicio = time.perf_counter()
+    for pos in range(0, largo, paso):
+        indice.prune_less_than(pos - 300)
+    t_poda = (time.perf_counter() - inicio) / (largo // paso)
+
+    print(f"{backend:>13}  carga {t_carga * 1000:8.1f} ms  memoria {memoria / 2**20:7.1f} MiB  "
+          f"ventana {t_ventanas * 1e6:7.1f} us  poda {t_poda * 1e6:7.1f} us  "
+          f"inserción {t_insercion * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    tamanos = [int(a) for a in sys.argv[1:]] or [10_000, 200_000]
+    for n in tamanos:
+        curso = crear_curso(n)
+        print(f"n={n}")
+        for backend in BACKENDS:
+            try:
+                bench(backend, curso)
+            except ImportError as e:
+                print(f"{backend:>13}  no disponible ({e})")
@@ -0,0 +1,98 @@
+"""
+Memoria y costo de construcción de Obstacle: antes y después del flyweight.
+
+ObstaculoAnterior reproduce el Obstacle de antes: un __dict__ por
+instancia con ancho, alto y sprite propios, la cadena if/elif sobre el
+tipo y load_for_type en cada __init__. Obstacle es el actual: __slots__
+(x, y, tipo, marca) y todo lo demás en el ObstacleType compartido.
+
+Se construyen n obstáculos de cada uno y se informa el tiempo y la
+memoria que retienen según tracemalloc.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_obstacle_memory.py [n]
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+
+from game.obstacle import Obstacle
+from utils.asset_loader import load_for_type
+
+TIPOS = ('rock', 'tree', 'pothole', 'hole')
+
+
+class ObstaculoAnterior:
+    """Obstacle tal como era antes del flyweight"""
+
+    def __init__(self, x, y, obstacle_type):
+        self.x = x
+        self.y = y
+        self.obstacle_type = obstacle_type
+        if obstacle_type == 'tree':
+            self.width, self.height = 60, 80
+        elif obstacle_type == 'rock':
+            self.width, self.height = 60, 60
+        elif obstacle_type == 'pothole':
+            self.width, self.height = 70, 40
+        elif obstacle_type == 'hole':
+            self.width, self.height = 200, 100
+            self.y = 225
+        else:
+            self.width, self.height = 55, 55
+        self.sprite = load_for_type(obstacle_type, size=(self.width, self.height))
+
+
+def datos(n):
+    rnd = random.Random(1)
+    return [(rnd.randrange(n * 300), rnd.choice((225, 325)), rnd.choice(TIPOS)) for _ in range(n)]
+
+
+def construir(clase, filas):
+    return [clase(x, y, tipo) for x, y, tipo in filas]
+
+
+def medir(clase, filas):
+    gc.collect()
+    inicio = time.perf_counter()
+    obstaculos = construir(clase, filas)
+    segundos = time.perf_counter() - inicio
+    del obstaculos
+    gc.collect()
+    tracemalloc.start()
+    obstaculos = construir(clase, filas)
+    retenido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obstaculos
+    return segundos, retenido
+
+
+def main(n):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    for tipo in TIPOS:
+        ObstaculoAnterior(0, 0, tipo)  # Sprites en caché antes de medir
+        Obstacle(0, 0, tipo).sprite
+    filas = datos(n)
+    print(f"n={n}")
+    resultados = {}
+    for nombre, clase in (('antes (dict + sprite propio)', ObstaculoAnterior),
+                          ('ahora (__slots__ + flyweight)', Obstacle)):
+        segundos, retenido = medir(clase, filas)
+        resultados[clase] = (segundos, retenido)
+        print(f"  {nombre:30} construcción {segundos:6.2f} s ({segundos / n * 1e9:5.0f} ns c/u)  "
+              f"memoria {retenido / 2**20:7.1f} MiB ({retenido / n:5.0f} B c/u)")
+    (t0, m0), (t1, m1) = resultados[ObstaculoAnterior], resultados[Obstacle]
+    print(f"  construcción {t0 / t1:.1f}x más rápida, memoria {m0 / m1:.1f}x menor")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,99 @@
+"""
+Reciclaje de obstáculos con ObstaclePool en una partida larga.
+
+Simula una partida en modo infinito (CourseStreamer + poda por frame) con
+y sin pool, y compara cuántos Obstacle se crearon, cuántas recolecciones
+hizo el GC en cada generación, cuánto tiempo pasó recolectando (medido
+con gc.callbacks) y el tiempo total.
+
+En CPython un obstáculo podado se libera enseguida por conteo de
+referencias, y el GC generacional solo arranca cuando los objetos creados
+superan a los liberados en más de su umbral (700 por defecto). Con chunks
+chicos eso no pasa nunca y el pool solo ahorra asignaciones. Por eso acá
+los chunks son largos y densos: cada uno trae de golpe más obstáculos que
+el umbral, como una oleada, y hay un heap vivo grande que las
+recolecciones de generaciones mayores tienen que recorrer. El pool por
+defecto (TAMANO_POOL) cubre un chunk entero y reutiliza casi todos los
+obstáculos; uno chico (POOL_CHICO) descarta la mayoría de los podados
+antes de que llegue el chunk siguiente. Los TreeNode del índice se siguen
+creando, así que el GC no baja a cero.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_obstacle_pool.py [frames]
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.course_generator import CourseGenerator, CourseStreamer
+from game.obstacle_manager import ObstacleManager
+from utils.constants import TAMANO_POOL
+from utils.event_bus import configurar_bus, detener_bus
+
+VELOCIDAD = 20
+LARGO_CHUNK = 5000        # ~830 obstáculos por chunk, más que el umbral de gen0
+HEAP_VIVO = 300_000       # Objetos que viven toda la partida (el resto del juego)
+POOL_CHICO = 256          # Pool más chico que un chunk, para comparar
+
+
+class RelojGC:
+    """Suma el tiempo que pasa el recolector dentro de gc.callbacks"""
+
+    def __init__(self):
+        self.segundos = 0.0
+        self._inicio = 0.0
+
+    def __call__(self, fase, info):
+        if fase == 'start':
+            self._inicio = time.perf_counter()
+        else:
+            self.segundos += time.perf_counter() - self._inicio
+
+
+def recolecciones():
+    return [generacion['collections'] for generacion in gc.get_stats()]
+
+
+def partida(frames, tamano_pool=None):
+    """Juega `frames` frames; sin tamano_pool el gestor usa su configuración por defecto"""
+    if tamano_pool is None:
+        gestor = ObstacleManager('avl')
+    else:
+        gestor = ObstacleManager('avl', tamano_pool=tamano_pool)
+    heap_vivo = [[i] for i in range(HEAP_VIVO)]
+    streamer = CourseStreamer(gestor, CourseGenerator(semilla=3, largo_chunk=LARGO_CHUNK,
+                                                      separacion_min=4, separacion_max=8))
+    reloj = RelojGC()
+    gc.collect()
+    gc.callbacks.append(reloj)
+    antes = recolecciones()
+    inicio = time.perf_counter()
+    for frame in range(frames):
+        posicion = frame * VELOCIDAD
+        streamer.actualizar(posicion, VELOCIDAD)
+        gestor.obtener_obstaculos_visibles(posicion)
+        gestor.eliminar_obstaculos_pasados(posicion)
+    segundos = time.perf_counter() - inicio
+    despues = recolecciones()
+    gc.callbacks.remove(reloj)
+    del heap_vivo
+    return segundos, reloj.segundos, [d - a for a, d in zip(antes, despues)], gestor.pool.contadores()
+
+
+def main(frames):
+    configurar_bus('error')
+    print(f"{frames} frames a {VELOCIDAD} px/frame, chunks de {LARGO_CHUNK} px, heap vivo de {HEAP_VIVO} objetos")
+    for nombre, tamano in (('sin pool', 0), (f'pool de {POOL_CHICO}', POOL_CHICO),
+                           (f'por defecto ({TAMANO_POOL})', None)):
+        segundos, segundos_gc, gc_por_generacion, contadores = partida(frames, tamano)
+        print(f"  {nombre:19} {segundos:6.2f} s  en GC {segundos_gc * 1000:6.1f} ms  "
+              f"Obstacle creados {contadores['fallos']:>7}  "
+              f"recolecciones GC gen0/1/2 {'/'.join(map(str, gc_por_generacion))}")
+    detener_bus()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,93 @@
+"""
+Compara el árbol AVL mutable con su variante persistente (copia de camino).
+
+Mide inserción y eliminación, lo que cuesta guardar una copia del estado
+(snapshot O(1) contra reconstruir el árbol mutable) y la memoria extra
+por mutación cuando se conservan todas las versiones.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_persistent_avl.py [n ...]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_structures.avl_tree import AVLTree
+from data_structures.persistent_avl_tree import PersistentAVLTree
+
+
+class ObstaculoFalso:
+    """Obstáculo mínimo: el árbol solo necesita la posición X y el ancho"""
+    __slots__ = ('x', 'width')
+
+    def __init__(self, x, width=60):
+        self.x = x
+        self.width = width
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def copiar_mutable(arbol):
+    """Lo que costaba guardar el estado sin persistencia: un árbol nuevo"""
+    copia = AVLTree()
+    copia.build_from_sorted(arbol.obtener_lista_ordenada())
+    return copia
+
+
+def memoria_por_mutacion(n, mutaciones, semilla):
+    """Bytes nuevos por inserción conservando un snapshot después de cada una"""
+    rnd = random.Random(semilla)
+    arbol = PersistentAVLTree()
+    arbol.build_from_sorted([ObstaculoFalso(x) for x in rnd.sample(range(n * 10), n)])
+    nuevos = [ObstaculoFalso(rnd.randrange(n * 10)) for _ in range(mutaciones)]
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    versiones = []
+    for o in nuevos:
+        arbol.insertar_obstaculo(o)
+        versiones.append(arbol.snapshot())
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / len(versiones)
+
+
+def bench(n, semilla=1234, copias=20):
+    rnd = random.Random(semilla)
+    posiciones = rnd.sample(range(n * 10), n)
+    obstaculos = [ObstaculoFalso(x) for x in posiciones]
+    print(f"n={n}")
+    for clase in (AVLTree, PersistentAVLTree):
+        arbol = clase()
+
+        def insertar():
+            for o in obstaculos:
+                arbol.insertar_obstaculo(o)
+
+        def eliminar():
+            for x in posiciones:
+                arbol.eliminar_obstaculo(x)
+
+        t_ins = medir(insertar)
+        if clase is AVLTree:
+            t_copia = medir(lambda: [copiar_mutable(arbol) for _ in range(copias)])
+        else:
+            t_copia = medir(lambda: [arbol.snapshot() for _ in range(copias)])
+        t_eli = medir(eliminar)
+        print(f"  {clase.__name__:>17}  insertar {n / t_ins:>9.0f} op/s  eliminar {n / t_eli:>9.0f} op/s  "
+              f"copia del estado {t_copia / copias * 1e6:>11.1f} us")
+    print(f"  memoria por inserción guardando todas las versiones: "
+          f"{memoria_por_mutacion(n, 2000, semilla):.0f} bytes")
+
+
+if __name__ == "__main__":
+    tamanos = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in tamanos:
+        bench(n)
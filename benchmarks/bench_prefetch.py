@@ -0,0 +1,67 @@
+"""
+Tirones por carga de chunks: CourseStreamer contra CoursePrefetcher.
+
+Simula el bucle del juego sobre un curso procedural denso (cientos de
+obstáculos por chunk) y mide cuánto tarda en el hilo del juego la parte
+de streaming de cada frame. Entre frames se duerme el resto del frame,
+que es cuando el hilo de precarga puede trabajar. Con CourseStreamer los
+frames en que entra un chunk pagan la construcción de sus Obstacle; con
+CoursePrefetcher solo la inserción en el gestor.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_prefetch.py [frames]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.course_generator import CourseGenerator, CourseStreamer
+from game.course_prefetcher import CoursePrefetcher
+from game.obstacle_manager import ObstacleManager
+
+VELOCIDAD = 20
+DURACION_FRAME = 1 / 60
+RESTO_FRAME = 0.004  # Lo que el bucle pasa fuera del streaming (dibujo, reloj)
+
+
+def generador_denso():
+    return CourseGenerator(semilla=1, largo_chunk=2000, separacion_min=6, separacion_max=10)
+
+
+def recorrer(clase, frames):
+    gestor = ObstacleManager('avl')
+    streamer = clase(gestor, generador_denso())
+    tiempos = []
+    with contextlib.redirect_stdout(io.StringIO()) as salida:
+        for frame in range(frames):
+            posicion = frame * VELOCIDAD
+            inicio = time.perf_counter()
+            streamer.actualizar(posicion, VELOCIDAD)
+            gestor.eliminar_obstaculos_pasados(posicion)
+            tiempos.append(time.perf_counter() - inicio)
+            salida.seek(0)
+            salida.truncate()
+            time.sleep(RESTO_FRAME)
+    streamer.detener()
+    tiempos.sort()
+    print(f"{clase.__name__:17} mediana {tiempos[len(tiempos) // 2] * 1000:6.3f} ms  "
+          f"p99 {tiempos[int(len(tiempos) * 0.99)] * 1000:6.3f} ms  peor {tiempos[-1] * 1000:6.3f} ms  "
+          f"frames > {DURACION_FRAME * 1000 / 4:.1f} ms: {sum(t > DURACION_FRAME / 4 for t in tiempos)}")
+    if isinstance(streamer, CoursePrefetcher):
+        print(f"{'':17} chunks precargados {streamer.chunks_precargados}  "
+              f"construidos en el hilo del juego {streamer.chunks_sincronos}")
+
+
+def main(frames):
+    obstaculos_por_chunk = len(generador_denso().datos_chunk(0))
+    print(f"{frames} frames a {VELOCIDAD} px/frame, ~{obstaculos_por_chunk} obstáculos por chunk")
+    for clase in (CourseStreamer, CoursePrefetcher):
+        recorrer(clase, frames)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1500)
@@ -0,0 +1,169 @@
+"""
+Tiempo de frame del renderizado: capas estáticas en caché contra redibujar todo.
+
+RenderAnterior reproduce el dibujo de antes de LayerCache: el cielo con
+una línea por fila de pantalla, el degradado de la carretera línea por
+línea y los paneles de la interfaz con Surface y fuentes nuevas en cada
+frame. GameRenderer es el actual, que copia esas capas ya dibujadas.
+
+Los dos dibujan la misma escena (carretera en movimiento, obstáculos
+visibles, barra de energía, estadísticas e instrucciones) con el driver de
+video 'dummy' y se informa la mediana y el p99 del tiempo por frame.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_render.py [frames]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import pygame
+
+from game.car import Car
+from game.game_renderer import GameRenderer
+from game.game_state import GameState
+from game.obstacle_manager import ObstacleManager
+from ui.game_window import GameWindow
+from utils.event_bus import configurar_bus, detener_bus
+
+ANCHO, ALTO = 800, 600
+VELOCIDAD = 5
+CARRO_X = 100
+
+
+class RenderAnterior:
+    """Dibujo de un frame tal como era antes de LayerCache"""
+
+    def __init__(self, ventana, renderer):
+        self.ventana = ventana
+        self.renderer = renderer  # Para la parte que no cambió (obstáculos, carro)
+
+    def dibujar_todo(self, estado, carro, carro_y, obstaculos, posicion):
+        screen = self.ventana.screen
+        for y in range(self.ventana.height):
+            t = y / self.ventana.height
+            pygame.draw.line(screen, (int(30 + 40 * t), int(120 + 80 * t), int(200 + 40 * t)),
+                             (0, y), (self.ventana.width, y))
+        self.dibujar_carretera(screen, posicion)
+        carro.render(self.ventana, CARRO_X, carro_y)
+        self.renderer.dibujar_obstaculos(obstaculos, posicion, CARRO_X)
+        self.dibujar_barra_energia(screen, estado.energia, estado.energia_maxima)
+        self.dibujar_estadisticas(screen, estado.puntuacion, estado.obstaculos_evitados, estado.energia)
+        self.dibujar_instrucciones(screen)
+        self.ventana.update()
+
+    def dibujar_carretera(self, screen, posicion):
+        road = self.renderer.road_renderer
+        for i in range(road.altura_carretera):
+            c = int(40 + 40 * (i / road.altura_carretera))
+            pygame.draw.line(screen, (c, c, c), (0, road.inicio_carretera_y + i),
+                             (road.ventana_width, road.inicio_carretera_y + i))
+        pygame.draw.rect(screen, (20, 20, 20), (0, road.inicio_carretera_y, road.ventana_width, 4))
+        pygame.draw.rect(screen, (20, 20, 20), (0, road.fin_carretera_y - 4, road.ventana_width, 4))
+        pygame.draw.line(screen, (235, 235, 235), (0, road.inicio_carretera_y),
+                         (road.ventana_width, road.inicio_carretera_y), 2)
+        pygame.draw.line(screen, (235, 235, 235), (0, road.fin_carretera_y),
+                         (road.ventana_width, road.fin_carretera_y), 2)
+        road.dibujar_textura(screen, posicion)
+        road.dibujar_linea_central(screen, posicion)
+
+    def dibujar_barra_energia(self, screen, energia, energia_maxima):
+        ancho, alto, x, y = 260, 26, 18, 18
+        ratio = max(0, min(1, energia / energia_maxima))
+        panel = pygame.Surface((ancho + 20, alto + 20), pygame.SRCALPHA)
+        panel.fill((15, 15, 25, 130))
+        screen.blit(panel, (x - 10, y - 10))
+        pygame.draw.rect(screen, (70, 25, 25), (x, y, ancho, alto), border_radius=8)
+        gradiente = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        for i in range(ancho):
+            if i / ancho <= ratio:
+                t = i / ancho
+                color = (int(255 - 155 * t), int(80 + 170 * (1 - abs(t - 0.5) * 2)),
+                         int(40 + 40 * math.sin(t * 3.14)), 230)
+                pygame.draw.line(gradiente, color, (i, 0), (i, alto))
+        screen.blit(gradiente, (x, y))
+        pygame.draw.rect(screen, (230, 230, 240), (x, y, ancho, alto), 2, border_radius=8)
+        texto = pygame.font.Font(None, 24).render(f"Energía {int(energia)}/{int(energia_maxima)}",
+                                                  True, (255, 255, 255))
+        screen.blit(texto, texto.get_rect(center=(x + ancho // 2, y + alto // 2)))
+
+    def dibujar_estadisticas(self, screen, puntuacion, evitados, energia):
+        fuente = pygame.font.Font(None, 28)
+        panel = pygame.Surface((210, 90), pygame.SRCALPHA)
+        panel.fill((20, 25, 40, 140))
+        screen.blit(panel, (20, 60))
+        for i, (txt, col) in enumerate(((f"Score: {puntuacion}", (255, 255, 255)),
+                                        (f"Evitados: {evitados}", (200, 220, 255)),
+                                        (f"Energía: {int(energia)}", (255, 220, 180)))):
+            screen.blit(fuente.render(txt, True, col), (30, 70 + i * 28))
+
+    def dibujar_instrucciones(self, screen):
+        fuente = pygame.font.Font(None, 22)
+        panel = pygame.Surface((280, 160), pygame.SRCALPHA)
+        panel.fill((15, 20, 35, 150))
+        screen.blit(panel, (self.ventana.width - 296, 16))
+        for i, instr in enumerate(self.renderer.ui_renderer.INSTRUCCIONES):
+            col = (180, 255, 180) if "siempre" in instr else (210, 210, 230)
+            screen.blit(fuente.render(instr, True, col), (self.ventana.width - 272, 28 + i * 22))
+
+
+def medir(dibujar_frame, frames):
+    tiempos = []
+    for frame in range(frames):
+        inicio = time.perf_counter()
+        dibujar_frame(frame * VELOCIDAD)
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2], tiempos[int(len(tiempos) * 0.99)]
+
+
+def main(frames):
+    configurar_bus('error')
+    pygame.init()
+    ventana = GameWindow(ANCHO, ALTO, 'bench_render')
+    renderer = GameRenderer(ventana)
+    anterior = RenderAnterior(ventana, renderer)
+    carro = Car(0, 100, os.path.join(RAIZ, 'assets', 'car.png'))
+    carro_y = renderer.obtener_posicion_carril_superior()
+    gestor = ObstacleManager('avl')
+    rnd = random.Random(1)
+    gestor.cargar_obstaculos_iniciales([{'x': 300 + i * 150, 'y': rnd.choice((225, 325)),
+                                         'type': rnd.choice(('rock', 'tree', 'pothole'))}
+                                        for i in range(frames * VELOCIDAD // 150 + 10)])
+    estado = GameState({})
+
+    def frame_anterior(posicion):
+        random.seed(posicion)
+        anterior.dibujar_todo(estado, carro, carro_y, gestor.arbol.buscar_solapados(posicion - 150, posicion + ANCHO),
+                              posicion)
+
+    def frame_actual(posicion):
+        random.seed(posicion)
+        renderer.dibujar_todo(estado, carro, CARRO_X, carro_y,
+                              gestor.arbol.buscar_solapados(posicion - 150, posicion + ANCHO),
+                              posicion, gestor)
+
+    # Mismo píxel a píxel (la textura usa random, por eso la semilla fija)
+    frame_anterior(1000)
+    antes = pygame.image.tobytes(ventana.screen, 'RGB')
+    frame_actual(1000)
+    print(f"{ANCHO}x{ALTO}, {frames} frames; imagen idéntica: {pygame.image.tobytes(ventana.screen, 'RGB') == antes}")
+
+    resultados = [('antes (sin caché)', medir(frame_anterior, frames)),
+                  ('ahora (LayerCache)', medir(frame_actual, frames))]
+    for nombre, (mediana, p99) in resultados:
+        print(f"  {nombre:20} mediana {mediana * 1000:6.3f} ms  p99 {p99 * 1000:6.3f} ms")
+    print(f"  {resultados[0][1][0] / resultados[1][1][0]:.1f}x más rápido; "
+          f"capas construidas: {renderer.capas.construidas}")
+    pygame.quit()
+    detener_bus()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
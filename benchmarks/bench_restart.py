@@ -0,0 +1,73 @@
+"""
+Latencia de reinicio del curso en ObstacleManager.
+
+Compara la recarga completa (limpiar el índice y volver a crear todos los
+Obstacle desde los datos del JSON, como se hacía antes) con
+reiniciar_obstaculos, que reutiliza el curso prístino ya construido:
+restaura un snapshot en los índices persistentes o rearma el índice en
+los demás.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_restart.py [n ...]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+
+from game.obstacle_manager import ObstacleManager
+from utils.event_bus import configurar_bus, detener_bus
+
+BACKENDS = ('avl', 'persistent_avl', 'sorted_array')
+
+
+def curso_aleatorio(n, semilla=1234):
+    rnd = random.Random(semilla)
+    return [{'x': rnd.randint(0, n * 300), 'y': rnd.choice((225, 325)),
+             'type': rnd.choice(('rock', 'tree', 'pothole', 'hole'))}
+            for _ in range(n)]
+
+
+def medir(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def bench(n):
+    datos = curso_aleatorio(n)
+    repeticiones = 5 if n <= 100_000 else 1
+    print(f"n={n}")
+    for backend in BACKENDS:
+        gestor = ObstacleManager(backend)
+        gestor.cargar_obstaculos_iniciales(datos)
+
+        def recarga_completa():
+            gestor.arbol.limpiar_arbol()
+            gestor.cargar_obstaculos_iniciales(gestor.obstaculos_iniciales)
+
+        t_completa = medir(recarga_completa, repeticiones)
+        # Se simula una partida: el índice cambia antes de reiniciar
+        gestor.eliminar_obstaculos_pasados(n * 150)
+        t_reinicio = medir(gestor.reiniciar_obstaculos, repeticiones)
+        assert len(gestor.arbol) == n
+        print(f"  {backend:>15}  recarga completa {t_completa * 1000:>9.2f} ms  "
+              f"reiniciar_obstaculos {t_reinicio * 1000:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    configurar_bus('error')  # Sin los eventos de reinicio entre las filas de la tabla
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # convert_alpha necesita una pantalla
+    tamanos = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000]
+    for n in tamanos:
+        bench(n)
+    detener_bus()
@@ -0,0 +1,75 @@
+"""
+Túnel a velocidad alta: prueba en posiciones sueltas contra prueba barrida.
+
+Un curso de rocas (60 px de ancho) en el carril del carro, una cada
+SEPARACION px. El carro lo recorre sin saltar ni cambiar de carril a
+varias velocidades y se cuentan los choques con dos pruebas:
+
+- discreta: solo la huella del carro en la posición final del frame,
+  como antes.
+- barrida: la huella estirada sobre [posición anterior, posición nueva],
+  como hace ahora el motor.
+
+Con la barrida tiene que chocar con todas las rocas a cualquier
+velocidad; la discreta las pierde en cuanto el avance por frame supera
+ancho de la roca + ancho del carro. También se informa el costo por
+frame de cada una.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_swept_collision.py [rocas]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.collision_detector import CollisionDetector
+from game.game_state import GameState
+from game.obstacle_manager import ObstacleManager
+from utils.constants import ANCHO_CARRO
+from utils.event_bus import configurar_bus, detener_bus
+
+VELOCIDADES = (3, 20, 60, 100, 150, 300)
+SEPARACION = 400
+CARRO_X = 100
+CARRO_Y = 325   # Mismo carril que las rocas
+
+
+def recorrer(rocas, velocidad, barrida):
+    gestor = ObstacleManager('avl')
+    gestor.cargar_obstaculos_iniciales([{'x': 500 + i * SEPARACION, 'y': CARRO_Y, 'type': 'rock'}
+                                        for i in range(rocas)])
+    estado = GameState({'car_speed': velocidad, 'initial_energy': 10 ** 9})
+    detector = CollisionDetector()
+    final = 500 + rocas * SEPARACION
+    frames = 0
+    inicio = time.perf_counter()
+    while estado.posicion_en_carretera < final:
+        estado.actualizar_movimiento()
+        posicion = estado.posicion_en_carretera
+        desde = estado.posicion_anterior if barrida else posicion
+        candidatos = gestor.obtener_obstaculos_en_tramo(desde, posicion + ANCHO_CARRO)
+        detector.verificar_colisiones(CARRO_X, CARRO_Y, (), posicion, estado, candidatos=candidatos,
+                                      posicion_anterior=estado.posicion_anterior if barrida else None)
+        gestor.eliminar_obstaculos_pasados(posicion)
+        frames += 1
+    segundos = time.perf_counter() - inicio
+    return estado.obstaculos_golpeados, segundos / frames
+
+
+def main(rocas):
+    configurar_bus('error')
+    print(f"{rocas} rocas de 60 px cada {SEPARACION} px")
+    print(f"{'px/frame':>8} {'choques discreta':>17} {'choques barrida':>16} {'µs/frame discreta':>18} "
+          f"{'µs/frame barrida':>17}")
+    for velocidad in VELOCIDADES:
+        golpes_d, t_d = recorrer(rocas, velocidad, False)
+        golpes_b, t_b = recorrer(rocas, velocidad, True)
+        print(f"{velocidad:>8} {golpes_d:>17} {golpes_b:>16} {t_d * 1e6:>18.1f} {t_b * 1e6:>17.1f}")
+    detener_bus()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
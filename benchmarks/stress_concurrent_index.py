@@ -0,0 +1,201 @@
+"""
+Prueba de estrés del índice concurrente (ConcurrentObstacleIndex).
+
+Varios hilos insertan (uno por uno y en lotes con add_batch), otro poda con
+eliminar_obstaculos_pasados y otros consultan rangos, mientras el hilo
+principal simula el bucle del juego: pide la ventana visible y cada tanto
+agrega un obstáculo y poda él mismo, como el streamer del curso (esos
+cambios sí avisan al cursor). La ventana se compara con una consulta
+directa al árbol cuando ningún otro hilo escribió en el medio, y otra vez
+al final. También se comprueba que no se perdió ni se duplicó ningún
+obstáculo, que el árbol sigue balanceado y se informa cuánto tardan las
+lecturas del bucle.
+
+Por defecto se achica el intervalo de cambio de hilo para forzar
+intercalados raros; eso también infla la latencia por la pelea del GIL
+(p99 de decenas de ms). Con --latencia se usa el intervalo normal: cada
+lectura tarda menos de 1 ms, pero con seis hilos ocupados el bucle espera
+el GIL entre frames y consigue pocos por segundo (se informa cuántos).
+
+Uso (desde la raíz del repo):
+    python benchmarks/stress_concurrent_index.py [segundos] [--latencia]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_structures.avl_tree import iterar_nodos
+from game.obstacle_manager import ObstacleManager
+from utils.event_bus import configurar_bus, detener_bus
+
+HILOS_INSERCION = 3
+HILOS_LECTURA = 3
+LARGO_CURSO = 200_000
+FRAMES_ESCRITURA = 8  # Cada cuántos frames el bucle del juego agrega y poda
+
+
+class ObstaculoFalso:
+    """Obstáculo sin sprite"""
+    __slots__ = ('x', 'y', 'width', 'height', 'obstacle_type')
+
+    def __init__(self, x):
+        self.x = x
+        self.y = 225
+        self.width, self.height = 60, 60
+        self.obstacle_type = 'rock'
+
+
+def verificar_arbol(raiz):
+    """Recorre el árbol publicado y comprueba orden, balance y tamaños"""
+    alturas = {}
+    anterior = None
+    for nodo in iterar_nodos(raiz, 'postorder'):
+        hl = alturas.get(id(nodo.left), 0)
+        hr = alturas.get(id(nodo.right), 0)
+        assert abs(hl - hr) <= 1, "árbol desbalanceado"
+        assert nodo.height == 1 + max(hl, hr), "altura incorrecta"
+        tamano = len(nodo.obstaculos) + sum(h.tamano for h in (nodo.left, nodo.right) if h is not None)
+        assert nodo.tamano == tamano, "tamaño incorrecto"
+        alturas[id(nodo)] = nodo.height
+    for nodo in iterar_nodos(raiz, 'inorder'):
+        assert anterior is None or anterior < nodo.x_position, "claves desordenadas"
+        anterior = nodo.x_position
+
+
+def ventana_directa(gestor, posicion):
+    """Lo que debería mostrar la ventana visible, consultado al árbol sin el cursor"""
+    cursor = gestor.cursor_visible
+    return gestor.arbol.buscar_obstaculos_visibles(posicion - cursor.atras, posicion + cursor.adelante)
+
+
+def main(segundos, intercalado_fino=True):
+    configurar_bus('error')  # Sin los eventos de spawn y lotes entre los resultados
+    if intercalado_fino:
+        sys.setswitchinterval(1e-5)  # Más cambios de hilo, más intercalados raros
+    gestor = ObstacleManager('concurrent')
+    rnd = random.Random(1)
+    iniciales = [ObstaculoFalso(rnd.randrange(LARGO_CURSO)) for _ in range(20_000)]
+    gestor.arbol.build_from_sorted(iniciales)
+
+    fin = time.perf_counter() + segundos
+    insertados = [[] for _ in range(HILOS_INSERCION)]
+    podados = []
+    lecturas = [0] * HILOS_LECTURA
+    errores = []
+    posicion = [0]
+
+    def insertar(indice):
+        rnd_hilo = random.Random(100 + indice)
+        try:
+            while time.perf_counter() < fin:
+                base = posicion[0]
+                if rnd_hilo.random() < 0.2:
+                    lote = [ObstaculoFalso(base + rnd_hilo.randrange(5_000)) for _ in range(rnd_hilo.randrange(1, 200))]
+                    gestor.add_batch(lote)
+                    insertados[indice].extend(lote)
+                else:
+                    o = ObstaculoFalso(base + rnd_hilo.randrange(5_000))
+                    gestor.arbol.insertar_obstaculo(o)
+                    insertados[indice].append(o)
+        except Exception as e:  # pragma: no cover - se informa al final
+            errores.append(e)
+
+    def podar():
+        try:
+            while time.perf_counter() < fin:
+                posicion[0] += 37
+                podados.extend(gestor.eliminar_obstaculos_pasados(posicion[0]))
+                time.sleep(0.0005)
+        except Exception as e:
+            errores.append(e)
+
+    def leer(indice):
+        rnd_hilo = random.Random(200 + indice)
+        try:
+            while time.perf_counter() < fin:
+                arbol = gestor.arbol.leer()  # Una versión fija para comparar consultas entre sí
+                x = rnd_hilo.randrange(LARGO_CURSO)
+                encontrados = arbol.buscar_obstaculos_visibles(x, x + 1_200)
+                assert len(encontrados) == arbol.count_in_range(x, x + 1_200)
+                assert all(a.x <= b.x for a, b in zip(encontrados, encontrados[1:]))
+                assert all(x <= o.x <= x + 1_200 for o in encontrados)
+                lecturas[indice] += 1
+        except Exception as e:
+            errores.append(e)
+
+    hilos = ([threading.Thread(target=insertar, args=(i,)) for i in range(HILOS_INSERCION)]
+             + [threading.Thread(target=podar)]
+             + [threading.Thread(target=leer, args=(i,)) for i in range(HILOS_LECTURA)])
+    for hilo in hilos:
+        hilo.start()
+    # Hilo principal: el bucle del juego
+    tiempos = []
+    insertados_juego = []
+    ventanas_comparadas = 0
+    rnd_juego = random.Random(300)
+    while time.perf_counter() < fin:
+        pos = posicion[0]
+        if len(tiempos) % FRAMES_ESCRITURA == 0:
+            # Cambios del propio hilo del juego (la poda suele no encontrar nada)
+            podados.extend(gestor.eliminar_obstaculos_pasados(pos))
+            o = ObstaculoFalso(pos + rnd_juego.randrange(1_000))
+            gestor.add_batch([o])
+            insertados_juego.append(o)
+        version = gestor.arbol.version
+        inicio = time.perf_counter()
+        visibles = list(gestor.obtener_obstaculos_visibles(pos))
+        gestor.obtener_obstaculos_en_tramo(pos, pos + 50)
+        tiempos.append(time.perf_counter() - inicio)
+        assert all(a.x <= b.x for a, b in zip(visibles, visibles[1:]))
+        directa = ventana_directa(gestor, pos)
+        if gestor.arbol.version == version:
+            # Nadie escribió mientras tanto: la ventana tiene que coincidir
+            assert visibles == directa, "la ventana visible quedó desactualizada"
+            ventanas_comparadas += 1
+        time.sleep(1 / 240)
+    for hilo in hilos:
+        hilo.join()
+    # Una sola escritura de otro hilo seguida de una poda vacía del hilo del
+    # juego: el aviso de la poda no puede dar por vista esa escritura
+    pos = posicion[0]
+    podados.extend(gestor.eliminar_obstaculos_pasados(pos))
+    gestor.obtener_obstaculos_visibles(pos)
+    ultimo = ObstaculoFalso(pos + 10)
+    hilo = threading.Thread(target=gestor.arbol.insertar_obstaculo, args=(ultimo,))
+    hilo.start()
+    hilo.join()
+    insertados_juego.append(ultimo)
+    assert gestor.eliminar_obstaculos_pasados(pos) == []
+    assert list(gestor.obtener_obstaculos_visibles(pos)) == ventana_directa(gestor, pos), \
+        "la ventana visible no ve los cambios de los otros hilos"
+    insertados.append(insertados_juego)
+
+    if errores:
+        raise errores[0]
+    final = gestor.arbol.obtener_lista_ordenada()
+    esperados = {id(o) for o in iniciales}
+    for lista in insertados:
+        esperados.update(id(o) for o in lista)
+    ids_podados = [id(o) for o in podados]
+    ids_final = [id(o) for o in final]
+    assert len(ids_podados) == len(set(ids_podados)), "un obstáculo se podó dos veces"
+    assert len(ids_final) == len(set(ids_final)), "obstáculo duplicado en el índice"
+    assert set(ids_final).isdisjoint(ids_podados), "un obstáculo podado sigue en el índice"
+    assert set(ids_final) | set(ids_podados) == esperados, "se perdieron obstáculos"
+    verificar_arbol(gestor.arbol.root)
+    detener_bus()
+    tiempos.sort()
+    print(f"{segundos:.0f} s  inserciones {sum(map(len, insertados))}  podados {len(podados)}  "
+          f"consultas {sum(lecturas)}  frames {len(tiempos)} ({len(tiempos) / segundos:.0f}/s)  "
+          f"ventanas comparadas {ventanas_comparadas}  OK")
+    print(f"lectura del bucle: mediana {tiempos[len(tiempos) // 2] * 1000:.2f} ms  "
+          f"p99 {tiempos[int(len(tiempos) * 0.99)] * 1000:.2f} ms  peor {tiempos[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if a != '--latencia']
+    main(float(argumentos[0]) if argumentos else 5.0, intercalado_fino='--latencia' not in sys.argv)
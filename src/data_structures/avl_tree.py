@@ -1,143 +1,672 @@
+from itertools import islice
+
+from data_structures.avl_validation import ContadoresAVL, validar_camino
+
+RECORRIDOS = ('preorder', 'inorder', 'postorder')
+
+
+def fin_obstaculos(obstaculos):
+    """Mayor borde derecho (x + ancho) de un grupo de obstáculos"""
+    if len(obstaculos) == 1:
+        return obstaculos[0].x + obstaculos[0].width
+    return max((o.x + o.width for o in obstaculos), default=float('-inf'))
+
+
 class TreeNode:
-    """Nodo simple del árbol AVL"""
-    def __init__(self, x_position):
+    """Nodo simple del árbol AVL (con __slots__ para ahorrar memoria)"""
+    __slots__ = ('x_position', 'obstaculos', 'height', 'tamano', 'fin', 'max_fin', 'left', 'right')
+
+    def __init__(self, x_position, obstaculos=()):
         self.x_position = x_position  # Posición X como clave del nodo
-        self.obstacle = None          # El obstáculo que está en esta posición
+        self.obstaculos = obstaculos  # Tupla con los obstáculos en esta posición
         self.height = 1              # Altura del nodo para balanceo
+        self.tamano = len(obstaculos)  # Obstáculos en todo el subárbol
+        # Borde derecho más lejano de este nodo y de todo su subárbol
+        self.fin = self.max_fin = fin_obstaculos(obstaculos)
         self.left = None             # Hijo izquierdo
         self.right = None            # Hijo derecho
 
+    @property
+    def obstacle(self):
+        """Primer obstáculo de la posición (compatibilidad con el visualizador)"""
+        return self.obstaculos[0] if self.obstaculos else None
+
+def iterar_nodos(raiz, orden='inorder'):
+    """Genera los nodos de un subárbol en preorden, inorden o postorden sin recursión.
+
+    Es perezoso: quien lo consume puede detenerse tras los primeros nodos.
+    """
+    if orden not in RECORRIDOS:
+        raise ValueError(f"Recorrido desconocido: {orden}")
+    pila = []
+    nodo = raiz
+    if orden == 'preorder':
+        if nodo is not None:
+            pila.append(nodo)
+        while pila:
+            nodo = pila.pop()
+            yield nodo
+            if nodo.right is not None:
+                pila.append(nodo.right)
+            if nodo.left is not None:
+                pila.append(nodo.left)
+    elif orden == 'inorder':
+        while pila or nodo is not None:
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.left
+            nodo = pila.pop()
+            yield nodo
+            nodo = nodo.right
+    else:
+        ultimo = None
+        while pila or nodo is not None:
+            if nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.left
+                continue
+            tope = pila[-1]
+            if tope.right is not None and tope.right is not ultimo:
+                nodo = tope.right
+            else:
+                ultimo = pila.pop()
+                yield ultimo
+
+
 class AVLTree:
-    """Árbol AVL simplificado para manejar obstáculos del juego"""
+    """Árbol AVL simplificado para manejar obstáculos del juego.
+
+    Inserción, eliminación y búsqueda son iterativas: se guarda el camino
+    desde la raíz en una pila y se rebalancea de abajo hacia arriba.
+
+    Cada nodo guarda cuántos obstáculos tiene su subárbol, así que len(),
+    count_in_range, rank y select cuestan O(log n). También guarda el borde
+    derecho (x + ancho) más lejano del subárbol: con eso buscar_solapados
+    responde qué obstáculos tocan un tramo en O(log n + k), teniendo en
+    cuenta su ancho.
+
+    `version` aumenta con cada cambio. Las consultas de rango, recorridos y
+    conteos se memorizan contra esa versión, así que un frame sin cambios
+    (por ejemplo en pausa) no recorre el árbol. Las listas memorizadas se
+    comparten entre llamadas: no deben modificarse.
+
+    `contadores` lleva rotaciones y el mayor desbalance visto. Con
+    `depuracion = True` cada cambio revisa los nodos del camino que tocó
+    (ver avl_validation) y deja el resultado en `ultima_depuracion`.
+    """
+
+    MAX_MEMO = 64  # Consultas distintas guardadas por versión
+    FACTOR_RECONSTRUIR = 4  # insert_many reconstruye si lote * factor >= nodos
+    LOTE_POR_UNION = False  # insert_many de lotes chicos: split/join o inserción en sitio
     
     def __init__(self):
         self.root = None
+        self._num_nodos = 0
+        self.version = 0
+        self._memo = {}
+        self._memo_version = 0
+        self.contadores = ContadoresAVL()
+        self.depuracion = False
+        self.ultima_depuracion = None
+
+    def __len__(self):
+        """Cantidad total de obstáculos"""
+        return self.root.tamano if self.root is not None else 0
+
+    def contar_nodos(self):
+        """Cantidad de nodos (posiciones X distintas) del árbol"""
+        return self._num_nodos
+
+    def rank(self, x_position):
+        """Cantidad de obstáculos con X estrictamente menor que x_position"""
+        return self._contar_menores(x_position, False)
+
+    def count_in_range(self, x_min, x_max):
+        """Cantidad de obstáculos con x_min <= X <= x_max"""
+        if x_max < x_min:
+            return 0
+        return self._contar_menores(x_max, True) - self._contar_menores(x_min, False)
+
+    def select(self, k):
+        """k-ésimo obstáculo (desde 0) en orden de X"""
+        if k < 0:
+            k += len(self)
+        nodo = self.root
+        while nodo is not None:
+            izquierdo = nodo.left.tamano if nodo.left is not None else 0
+            if k < izquierdo:
+                nodo = nodo.left
+                continue
+            k -= izquierdo
+            if k < len(nodo.obstaculos):
+                return nodo.obstaculos[k]
+            k -= len(nodo.obstaculos)
+            nodo = nodo.right
+        raise IndexError("select fuera de rango")
+
+    def _contar_menores(self, x_position, incluir_igual):
+        """Obstáculos con X < x_position (o <= si incluir_igual)"""
+        total = 0
+        nodo = self.root
+        while nodo is not None:
+            if x_position < nodo.x_position or (x_position == nodo.x_position and not incluir_igual):
+                nodo = nodo.left
+            else:
+                total += len(nodo.obstaculos)
+                if nodo.left is not None:
+                    total += nodo.left.tamano
+                nodo = nodo.right
+        return total
+
+    def _registrar_cambio(self, *claves_tocadas, camino=()):
+        """Invalida las consultas memorizadas y, en modo depuración, revisa lo tocado"""
+        self.version += 1
+        if self.depuracion and (claves_tocadas or camino):
+            self._depurar(claves_tocadas, camino)
+
+    def _depurar(self, claves, camino=()):
+        """Valida los caminos hacia las claves tocadas y sus sucesoras, y los nodos de `camino`"""
+        claves = list(claves)
+        claves.extend(self.siguiente_clave(x) for x in claves[:])
+        # Una rotación en la raíz cuelga nodos fuera de los caminos: la raíz va con el camino
+        nodos = [self.root, *camino] if camino and self.root is not None else ()
+        resultado = validar_camino(self.root, [x for x in claves if x is not None], nodos)
+        self.ultima_depuracion = resultado
+        self.contadores.violaciones += len(resultado.violaciones)
+
+    def _memorizado(self, clave, calcular):
+        """Devuelve el resultado guardado para `clave` o lo calcula con la versión actual"""
+        if self._memo_version != self.version:
+            self._memo.clear()
+            self._memo_version = self.version
+        resultado = self._memo.get(clave)
+        if resultado is None:
+            if len(self._memo) >= self.MAX_MEMO:
+                self._memo.clear()
+            resultado = self._memo[clave] = calcular()
+        return resultado
     
     def buscar_obstaculos_visibles(self, x_min, x_max):
-        """Busca obstáculos que están en el rango de visión del jugador"""
+        """Busca obstáculos que están en el rango de visión del jugador (ordenados por X)"""
+        return self._memorizado(('rango', x_min, x_max),
+                                lambda: self._buscar_en_rango(x_min, x_max))
+
+    def _buscar_en_rango(self, x_min, x_max):
+        """Recorrido inorden podado a [x_min, x_max], sin recursión"""
         obstaculos_encontrados = []
-        self._buscar_en_rango(self.root, x_min, x_max, obstaculos_encontrados)
+        pila = []
+        nodo = self.root
+        while True:
+            # Bajar por la izquierda saltando los subárboles fuera del rango
+            while nodo is not None:
+                if nodo.x_position < x_min:
+                    nodo = nodo.right
+                else:
+                    pila.append(nodo)
+                    nodo = nodo.left
+            if not pila:
+                break
+            nodo = pila.pop()
+            if nodo.x_position > x_max:
+                break
+            obstaculos_encontrados.extend(nodo.obstaculos)
+            nodo = nodo.right
         return obstaculos_encontrados
     
-    def _buscar_en_rango(self, nodo, x_min, x_max, lista_obstaculos):
-        """Método privado para buscar obstáculos en un rango"""
-        if nodo is None:
-            return
-        if x_min <= nodo.x_position <= x_max and nodo.obstacle is not None:
-            lista_obstaculos.append(nodo.obstacle)
-        if nodo.x_position > x_min and nodo.left is not None:
-            self._buscar_en_rango(nodo.left, x_min, x_max, lista_obstaculos)
-        if nodo.x_position < x_max and nodo.right is not None:
-            self._buscar_en_rango(nodo.right, x_min, x_max, lista_obstaculos)
+    def buscar_solapados(self, x_ini, x_fin):
+        """Obstáculos cuyo tramo [x, x + ancho] se cruza con (x_ini, x_fin), ordenados por X.
+
+        Igual que pygame.Rect.colliderect, tocarse en el borde no cuenta:
+        se devuelven los que cumplen x < x_fin y x + ancho > x_ini. Los
+        subárboles cuyo max_fin no pasa de x_ini se saltan enteros.
+        """
+        solapados = []
+        pila = []
+        nodo = self.root
+        while True:
+            while nodo is not None and nodo.max_fin > x_ini:
+                pila.append(nodo)
+                nodo = nodo.left
+            if not pila:
+                break
+            nodo = pila.pop()
+            if nodo.x_position >= x_fin:
+                break
+            if nodo.fin > x_ini:
+                solapados.extend(o for o in nodo.obstaculos if o.x + o.width > x_ini)
+            nodo = nodo.right
+        return solapados
+
+    def buscar_obstaculos_despues_de(self, x_desde, x_hasta):
+        """Como buscar_obstaculos_visibles pero excluyendo x_desde: rango (x_desde, x_hasta]"""
+        obstaculos_encontrados = []
+        pila = []
+        nodo = self.root
+        while True:
+            while nodo is not None:
+                if nodo.x_position <= x_desde:
+                    nodo = nodo.right
+                else:
+                    pila.append(nodo)
+                    nodo = nodo.left
+            if not pila:
+                break
+            nodo = pila.pop()
+            if nodo.x_position > x_hasta:
+                break
+            obstaculos_encontrados.extend(nodo.obstaculos)
+            nodo = nodo.right
+        return obstaculos_encontrados
+
+    def siguiente_clave(self, x_position):
+        """Menor posición X del árbol estrictamente mayor que x_position (o None)"""
+        candidato = None
+        nodo = self.root
+        while nodo is not None:
+            if nodo.x_position > x_position:
+                candidato = nodo.x_position
+                nodo = nodo.left
+            else:
+                nodo = nodo.right
+        return candidato
     
     def insertar_obstaculo(self, obstaculo):
-        """Inserta un obstáculo en el árbol usando su posición X como clave"""
-        self.root = self._insertar_nodo(self.root, obstaculo.x)
-        nodo_encontrado = self._buscar_nodo(self.root, obstaculo.x)
-        if nodo_encontrado:
-            nodo_encontrado.obstacle = obstaculo
-    
-    def _insertar_nodo(self, nodo, x_position):
-        """Método privado para insertar un nodo en el árbol"""
+        """Inserta un obstáculo usando su posición X como clave y devuelve su nodo.
+
+        Un solo descenso: si la X ya existe el obstáculo se agrega al grupo
+        de ese nodo en lugar de reemplazar al anterior.
+        """
+        nodo, cambio = self._insertar_en_sitio(obstaculo)
+        if cambio:
+            self._registrar_cambio(obstaculo.x)
+        return nodo
+
+    def _insertar_en_sitio(self, obstaculo):
+        """Inserción sin tocar la versión; devuelve (nodo, si el árbol cambió)"""
+        x_position = obstaculo.x
+        fin = x_position + obstaculo.width
+        nodo = self.root
         if nodo is None:
-            return TreeNode(x_position)
-        if x_position < nodo.x_position:
-            nodo.left = self._insertar_nodo(nodo.left, x_position)
-        elif x_position > nodo.x_position:
-            nodo.right = self._insertar_nodo(nodo.right, x_position)
+            self.root = TreeNode(x_position, (obstaculo,))
+            self._num_nodos = 1
+            return self.root, True
+        camino = []
+        while True:
+            # Tamaño y max_fin se ajustan al bajar, así el rebalanceo puede cortar antes
+            nodo.tamano += 1
+            if fin > nodo.max_fin:
+                nodo.max_fin = fin
+            camino.append(nodo)
+            if x_position < nodo.x_position:
+                if nodo.left is None:
+                    nodo.left = nuevo = TreeNode(x_position, (obstaculo,))
+                    break
+                nodo = nodo.left
+            elif x_position > nodo.x_position:
+                if nodo.right is None:
+                    nodo.right = nuevo = TreeNode(x_position, (obstaculo,))
+                    break
+                nodo = nodo.right
+            else:
+                if any(o is obstaculo for o in nodo.obstaculos):
+                    for ancestro in camino:
+                        ancestro.tamano -= 1
+                    return nodo, False
+                nodo.obstaculos += (obstaculo,)
+                if fin > nodo.fin:
+                    nodo.fin = fin
+                return nodo, True
+        self._num_nodos += 1
+        self._rebalancear_camino(camino, tamanos_listos=True)
+        return nuevo, True
+    
+    def build_from_sorted(self, obstaculos):
+        """Reemplaza el contenido del árbol por `obstaculos` en tiempo lineal.
+
+        Se ordena una sola vez por X (casi gratis si ya vienen ordenados) y se
+        arma un árbol perfectamente balanceado tomando el elemento del medio
+        como raíz. Los obstáculos con la misma X quedan en el mismo nodo.
+        """
+        claves, valores = self._agrupar_por_x(obstaculos)
+        self.root = self._construir_balanceado(claves, valores, 0, len(claves))
+        self._num_nodos = len(claves)
+        self._registrar_cambio()
+
+    def _agrupar_por_x(self, obstaculos, ordenado=False):
+        """Ordena por X (si hace falta) y devuelve (claves, grupos) listos para _construir_balanceado"""
+        claves = []
+        valores = []
+        if not ordenado:
+            obstaculos = sorted(obstaculos, key=lambda o: o.x)
+        for obstaculo in obstaculos:
+            if claves and claves[-1] == obstaculo.x:
+                valores[-1] += (obstaculo,)
+            else:
+                claves.append(obstaculo.x)
+                valores.append((obstaculo,))
+        return claves, valores
+
+    def insert_many(self, obstaculos, ordenado=False):
+        """Inserta un lote de obstáculos con un solo cambio de versión.
+
+        Si el lote es comparable al árbol se mezclan las dos secuencias
+        ordenadas y se reconstruye en O(n + m). Si es pequeño, el lote
+        ordenado se arma como un AVL aparte y se une por split/join en
+        O(m log(n/m + 1)) (LOTE_POR_UNION), o se inserta en sitio, que en
+        el árbol mutable sale más barato. Los obstáculos que ya estaban se
+        ignoran. Con ordenado=True se usa el lote tal cual viene (ordenado
+        por X) en vez de ordenar una copia.
+        """
+        if not ordenado:
+            obstaculos = sorted(obstaculos, key=lambda o: o.x)
+        if not obstaculos:
+            return
+        if self.root is None or len(obstaculos) * self.FACTOR_RECONSTRUIR >= self._num_nodos:
+            claves, valores = self._mezclar_con_lote(*self._agrupar_por_x(obstaculos, ordenado=True))
+            self.root = self._construir_balanceado(claves, valores, 0, len(claves))
+            self._num_nodos = len(claves)
+        elif self.LOTE_POR_UNION:
+            claves, valores = self._agrupar_por_x(obstaculos, ordenado=True)
+            lote = self._construir_balanceado(claves, valores, 0, len(claves))
+            self.root, repetidas = self._union(self.root, lote)
+            self._num_nodos += len(claves) - repetidas
         else:
-            return nodo
-        nodo.height = 1 + max(self._obtener_altura(nodo.left), 
-                              self._obtener_altura(nodo.right))
-        return self._balancear_nodo(nodo, x_position)
+            for obstaculo in obstaculos:
+                self._insertar_en_sitio(obstaculo)
+        self._registrar_cambio(*(o.x for o in obstaculos))
+
+    def _mezclar_con_lote(self, claves_lote, valores_lote):
+        """Mezcla los nodos actuales (en orden) con el lote ya agrupado"""
+        claves = []
+        valores = []
+        i = 0
+        for nodo in iterar_nodos(self.root, 'inorder'):
+            while i < len(claves_lote) and claves_lote[i] < nodo.x_position:
+                claves.append(claves_lote[i])
+                valores.append(valores_lote[i])
+                i += 1
+            claves.append(nodo.x_position)
+            if i < len(claves_lote) and claves_lote[i] == nodo.x_position:
+                valores.append(self._juntar_grupos(nodo.obstaculos, valores_lote[i]))
+                i += 1
+            else:
+                valores.append(nodo.obstaculos)
+        claves.extend(claves_lote[i:])
+        valores.extend(valores_lote[i:])
+        return claves, valores
+
+    def _juntar_grupos(self, existentes, nuevos):
+        """Agrega al grupo de una X los obstáculos nuevos que no estaban"""
+        return existentes + tuple(o for o in nuevos if not any(e is o for e in existentes))
+
+    def _union(self, arbol, lote):
+        """Une dos AVL con split/join; devuelve (raíz, claves del lote que ya existían)"""
+        if lote is None:
+            return arbol, 0
+        if arbol is None:
+            return lote, 0
+        menores, igual, mayores = self._partir_en_tres(arbol, lote.x_position)
+        repetidas = 0
+        if igual is not None:
+            lote.obstaculos = self._juntar_grupos(igual.obstaculos, lote.obstaculos)
+            if igual.fin > lote.fin:
+                lote.fin = igual.fin
+            repetidas = 1
+        izquierdo, rep_izq = self._union(menores, lote.left)
+        derecho, rep_der = self._union(mayores, lote.right)
+        return self._unir(izquierdo, lote, derecho), repetidas + rep_izq + rep_der
+
+    def _partir_en_tres(self, nodo, x_position):
+        """Divide el subárbol en (claves < x, nodo con clave x o None, claves > x)"""
+        if nodo is None:
+            return None, None, None
+        if x_position < nodo.x_position:
+            menores, igual, mayores = self._partir_en_tres(nodo.left, x_position)
+            return menores, igual, self._unir(mayores, nodo, nodo.right)
+        if x_position > nodo.x_position:
+            menores, igual, mayores = self._partir_en_tres(nodo.right, x_position)
+            return self._unir(nodo.left, nodo, menores), igual, mayores
+        return nodo.left, nodo, nodo.right
+
+    def _construir_balanceado(self, claves, valores, inicio, fin):
+        """Construye el subárbol de claves[inicio:fin] (profundidad O(log n))"""
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = TreeNode(claves[medio], valores[medio])
+        nodo.left = self._construir_balanceado(claves, valores, inicio, medio)
+        nodo.right = self._construir_balanceado(claves, valores, medio + 1, fin)
+        self._actualizar_nodo(nodo)
+        return nodo
     
     def _buscar_nodo(self, nodo, x_position):
         """Busca un nodo específico por su posición X"""
-        if nodo is None or nodo.x_position == x_position:
-            return nodo
-        if x_position < nodo.x_position:
-            return self._buscar_nodo(nodo.left, x_position)
-        else:
-            return self._buscar_nodo(nodo.right, x_position)
-    
-    def eliminar_obstaculo(self, x_position):
-        """Elimina un obstáculo del árbol por su posición X"""
-        self.root = self._eliminar_nodo(self.root, x_position)
+        while nodo is not None and nodo.x_position != x_position:
+            nodo = nodo.left if x_position < nodo.x_position else nodo.right
+        return nodo
     
-    def _eliminar_nodo(self, nodo, x_position):
-        """Método privado para eliminar un nodo"""
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        """Elimina los obstáculos en la posición X.
+
+        Si se pasa `obstaculo` solo se quita ese del grupo, y el nodo
+        desaparece únicamente cuando queda vacío.
+        """
+        camino = []
+        nodo = self.root
+        while nodo is not None and nodo.x_position != x_position:
+            camino.append(nodo)
+            nodo = nodo.left if x_position < nodo.x_position else nodo.right
         if nodo is None:
-            return nodo
-        if x_position < nodo.x_position:
-            nodo.left = self._eliminar_nodo(nodo.left, x_position)
-        elif x_position > nodo.x_position:
-            nodo.right = self._eliminar_nodo(nodo.right, x_position)
-        else:
-            if nodo.left is None:
-                return nodo.right
-            elif nodo.right is None:
-                return nodo.left
-            sucesor = self._encontrar_minimo(nodo.right)
+            return
+        if obstaculo is not None:
+            restantes = tuple(o for o in nodo.obstaculos if o is not obstaculo)
+            if len(restantes) == len(nodo.obstaculos):
+                return  # Ese obstáculo no está en el grupo
+            if restantes:
+                nodo.obstaculos = restantes
+                nodo.fin = fin_obstaculos(restantes)
+                camino.append(nodo)
+                for ancestro in reversed(camino):
+                    ancestro.tamano -= 1
+                    self._actualizar_max_fin(ancestro)
+                self._registrar_cambio(x_position)
+                return
+        if nodo.left is not None and nodo.right is not None:
+            # Dos hijos: se copia el sucesor inorden y se elimina ese nodo
+            camino.append(nodo)
+            sucesor = nodo.right
+            while sucesor.left is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.left
             nodo.x_position = sucesor.x_position
-            nodo.obstacle = sucesor.obstacle
-            nodo.right = self._eliminar_nodo(nodo.right, sucesor.x_position)
-        nodo.height = 1 + max(self._obtener_altura(nodo.left), 
-                              self._obtener_altura(nodo.right))
-        return self._balancear_nodo(nodo, x_position)
+            nodo.obstaculos = sucesor.obstaculos
+            nodo.fin = sucesor.fin
+            nodo = sucesor
+        hijo = nodo.left if nodo.left is not None else nodo.right
+        self._reemplazar_hijo(camino[-1] if camino else None, nodo, hijo)
+        self._num_nodos -= 1
+        self._rebalancear_camino(camino)
+        # Con dos hijos el camino baja por la cadena del sucesor, que no está
+        # en el camino hacia x_position: se revisa nodo por nodo
+        self._registrar_cambio(x_position, camino=camino)
+    
+    def _reemplazar_hijo(self, padre, viejo, nuevo):
+        """Cuelga `nuevo` donde estaba `viejo` (o en la raíz si no hay padre)"""
+        if padre is None:
+            self.root = nuevo
+        elif padre.left is viejo:
+            padre.left = nuevo
+        else:
+            padre.right = nuevo
+    
+    def _rebalancear_camino(self, camino, tamanos_listos=False):
+        """Recalcula alturas, tamaños, max_fin y rota desde el fondo del camino hacia la raíz.
+
+        En cuanto un subárbol conserva su altura anterior ya no hace falta
+        rotar más arriba; desde ahí solo se corrigen tamaños y max_fin (o se
+        termina, si el llamador ya los ajustó al bajar).
+        """
+        estable = False
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            if estable and tamanos_listos:
+                return
+            izquierdo = nodo.left
+            derecho = nodo.right
+            tamano = len(nodo.obstaculos)
+            max_fin = nodo.fin
+            hl = hr = 0
+            if izquierdo is not None:
+                hl = izquierdo.height
+                tamano += izquierdo.tamano
+                if izquierdo.max_fin > max_fin:
+                    max_fin = izquierdo.max_fin
+            if derecho is not None:
+                hr = derecho.height
+                tamano += derecho.tamano
+                if derecho.max_fin > max_fin:
+                    max_fin = derecho.max_fin
+            if estable:
+                nodo.tamano = tamano
+                nodo.max_fin = max_fin
+                continue
+            altura_previa = nodo.height
+            balance = hl - hr
+            if balance > 1 or balance < -1:
+                subarbol = self._balancear_nodo(nodo)
+                self._reemplazar_hijo(camino[i - 1] if i else None, nodo, subarbol)
+                estable = subarbol.height == altura_previa
+            else:
+                nodo.height = 1 + (hl if hl > hr else hr)
+                nodo.tamano = tamano
+                nodo.max_fin = max_fin
+                estable = nodo.height == altura_previa
     
+    def prune_less_than(self, x_limite):
+        """Quita de una vez todas las claves menores que `x_limite`.
+
+        Parte el árbol en O(log n) y devuelve los obstáculos eliminados,
+        ordenados por X, como un solo lote.
+        """
+        if self.root is None or self._encontrar_minimo(self.root).x_position >= x_limite:
+            return []
+        menores, self.root = self._partir(self.root, x_limite)
+        self._registrar_cambio(x_limite)
+        eliminados = []
+        for nodo in iterar_nodos(menores, 'inorder'):
+            eliminados.extend(nodo.obstaculos)
+            self._num_nodos -= 1
+        return eliminados
+
+    def _partir(self, nodo, x_limite):
+        """Divide el subárbol en (claves < x_limite, claves >= x_limite)"""
+        if nodo is None:
+            return None, None
+        if nodo.x_position < x_limite:
+            menores, mayores = self._partir(nodo.right, x_limite)
+            return self._unir(nodo.left, nodo, menores), mayores
+        menores, mayores = self._partir(nodo.left, x_limite)
+        return menores, self._unir(mayores, nodo, nodo.right)
+
+    def _unir(self, izquierdo, medio, derecho):
+        """Une dos AVL usando `medio` como pivote (izquierdo < medio < derecho).
+
+        Baja por el lado más alto hasta encontrar un subárbol de altura
+        parecida, así que cuesta O(|diferencia de alturas|).
+        """
+        hl = izquierdo.height if izquierdo is not None else 0
+        hr = derecho.height if derecho is not None else 0
+        if hl > hr + 1:
+            izquierdo.right = self._unir(izquierdo.right, medio, derecho)
+            return self._balancear_nodo(izquierdo)
+        if hr > hl + 1:
+            derecho.left = self._unir(izquierdo, medio, derecho.left)
+            return self._balancear_nodo(derecho)
+        medio.left = izquierdo
+        medio.right = derecho
+        self._actualizar_nodo(medio)
+        return medio
+
     def _encontrar_minimo(self, nodo):
         """Encuentra el nodo con el valor mínimo"""
         while nodo.left is not None:
             nodo = nodo.left
         return nodo
 
-    def _balancear_nodo(self, nodo, x_position):
-        """Balancea el árbol después de una inserción o eliminación"""
+    def _balancear_nodo(self, nodo):
+        """Balancea un nodo desbalanceado y devuelve la nueva raíz del subárbol"""
         if nodo is None:
             return nodo
+        self._actualizar_nodo(nodo)
         balance = self._obtener_balance(nodo)
+        desbalance = balance if balance >= 0 else -balance
+        if desbalance > self.contadores.max_desbalance:
+            self.contadores.max_desbalance = desbalance
         if balance > 1:
-            if nodo.left and self._obtener_balance(nodo.left) >= 0:
-                return self._rotar_derecha(nodo)
-            elif nodo.left and self._obtener_balance(nodo.left) < 0:
+            if self._obtener_balance(nodo.left) < 0:
                 nodo.left = self._rotar_izquierda(nodo.left)
-                return self._rotar_derecha(nodo)
+            return self._rotar_derecha(nodo)
         if balance < -1:
-            if nodo.right and self._obtener_balance(nodo.right) <= 0:
-                return self._rotar_izquierda(nodo)
-            elif nodo.right and self._obtener_balance(nodo.right) > 0:
+            if self._obtener_balance(nodo.right) > 0:
                 nodo.right = self._rotar_derecha(nodo.right)
-                return self._rotar_izquierda(nodo)
+            return self._rotar_izquierda(nodo)
         return nodo
     
     def _rotar_izquierda(self, nodo_z):
         """Rotación simple a la izquierda"""
         if nodo_z is None or nodo_z.right is None:
             return nodo_z
+        self.contadores.rotaciones += 1
         nodo_y = nodo_z.right
         temp = nodo_y.left
         nodo_y.left = nodo_z
         nodo_z.right = temp
-        nodo_z.height = 1 + max(self._obtener_altura(nodo_z.left), 
-                                self._obtener_altura(nodo_z.right))
-        nodo_y.height = 1 + max(self._obtener_altura(nodo_y.left), 
-                                self._obtener_altura(nodo_y.right))
+        self._actualizar_nodo(nodo_z)
+        self._actualizar_nodo(nodo_y)
         return nodo_y
     
     def _rotar_derecha(self, nodo_z):
         """Rotación simple a la derecha"""
         if nodo_z is None or nodo_z.left is None:
             return nodo_z
+        self.contadores.rotaciones += 1
         nodo_y = nodo_z.left
         temp = nodo_y.right
         nodo_y.right = nodo_z
         nodo_z.left = temp
-        nodo_z.height = 1 + max(self._obtener_altura(nodo_z.left), 
-                                self._obtener_altura(nodo_z.right))
-        nodo_y.height = 1 + max(self._obtener_altura(nodo_y.left), 
-                                self._obtener_altura(nodo_y.right))
+        self._actualizar_nodo(nodo_z)
+        self._actualizar_nodo(nodo_y)
         return nodo_y
     
+    def _actualizar_nodo(self, nodo):
+        """Recalcula altura, tamaño y max_fin de un nodo a partir de sus hijos"""
+        izquierdo = nodo.left
+        derecho = nodo.right
+        hl = hr = tamano = 0
+        max_fin = nodo.fin
+        if izquierdo is not None:
+            hl = izquierdo.height
+            tamano = izquierdo.tamano
+            if izquierdo.max_fin > max_fin:
+                max_fin = izquierdo.max_fin
+        if derecho is not None:
+            hr = derecho.height
+            tamano += derecho.tamano
+            if derecho.max_fin > max_fin:
+                max_fin = derecho.max_fin
+        nodo.height = 1 + (hl if hl > hr else hr)
+        nodo.tamano = tamano + len(nodo.obstaculos)
+        nodo.max_fin = max_fin
+
+    def _actualizar_max_fin(self, nodo):
+        """Recalcula solo el max_fin de un nodo a partir de sus hijos"""
+        max_fin = nodo.fin
+        if nodo.left is not None and nodo.left.max_fin > max_fin:
+            max_fin = nodo.left.max_fin
+        if nodo.right is not None and nodo.right.max_fin > max_fin:
+            max_fin = nodo.right.max_fin
+        nodo.max_fin = max_fin
+    
     def _obtener_altura(self, nodo):
         """Obtiene la altura de un nodo"""
         if nodo is None:
@@ -152,85 +681,46 @@ class AVLTree:
     
     def obtener_lista_ordenada(self):
         """Devuelve una lista de obstáculos ordenados por posición X (in-order)."""
-        obstaculos = []
-        self._recorrer_inorden(self.root, obstaculos)
-        return obstaculos
-    
-    def _recorrer_inorden(self, nodo, lista):
-        """Recorrido inorden para obtener obstáculos ordenados"""
-        if nodo is not None:
-            self._recorrer_inorden(nodo.left, lista)
-            if nodo.obstacle is not None:
-                lista.append(nodo.obstacle)
-            self._recorrer_inorden(nodo.right, lista)
+        return self.inorder()
+
+    def iter_obstaculos(self, orden='inorder'):
+        """Generador de obstáculos en el recorrido pedido; se puede cortar en cualquier momento"""
+        for nodo in iterar_nodos(self.root, orden):
+            yield from nodo.obstaculos
+
+    def iter_claves(self, orden='inorder'):
+        """Generador de claves (x_position) en el recorrido pedido"""
+        for nodo in iterar_nodos(self.root, orden):
+            yield nodo.x_position
+
+    def traversal_prefix(self, orden, max_items):
+        """Primeras `max_items` claves del recorrido, sin recorrer el resto del árbol"""
+        return list(islice(self.iter_claves(orden), max_items))
+
     def preorder(self):
         """Lista de obstáculos (si existen) en recorrido preorden."""
-        res = []
-        self._preorden(self.root, res)
-        return res
+        return self._memorizado('preorder', lambda: list(self.iter_obstaculos('preorder')))
 
     def inorder(self):
-        """Alias de obtener_lista_ordenada (inorden)."""
-        return self.obtener_lista_ordenada()
+        """Lista de obstáculos (si existen) en recorrido inorden."""
+        return self._memorizado('inorder', lambda: list(self.iter_obstaculos('inorder')))
 
     def postorder(self):
         """Lista de obstáculos (si existen) en recorrido postorden."""
-        res = []
-        self._postorden(self.root, res)
-        return res
-
-    def _preorden(self, nodo, lista):
-        if nodo is None:
-            return
-        if nodo.obstacle is not None:
-            lista.append(nodo.obstacle)
-        self._preorden(nodo.left, lista)
-        self._preorden(nodo.right, lista)
-
-    def _postorden(self, nodo, lista):
-        if nodo is None:
-            return
-        self._postorden(nodo.left, lista)
-        self._postorden(nodo.right, lista)
-        if nodo.obstacle is not None:
-            lista.append(nodo.obstacle)
+        return self._memorizado('postorder', lambda: list(self.iter_obstaculos('postorder')))
 
     def obten_recorridos_x(self):
         """
         Devuelve dict con listas de claves (x_position) en cada recorrido.
         Útil para visualización rápida.
         """
-        return {
-            "preorder": self._preorder_x(),
-            "inorder": self._inorder_x(),
-            "postorder": self._postorder_x()
-        }
-
-    def _preorder_x(self):
-        out = []
-        def rec(n):
-            if not n: return
-            out.append(n.x_position)
-            rec(n.left); rec(n.right)
-        rec(self.root)
-        return out
-
-    def _inorder_x(self):
-        out = []
-        def rec(n):
-            if not n: return
-            rec(n.left); out.append(n.x_position); rec(n.right)
-        rec(self.root)
-        return out
-
-    def _postorder_x(self):
-        out = []
-        def rec(n):
-            if not n: return
-            rec(n.left); rec(n.right); out.append(n.x_position)
-        rec(self.root)
-        return out
+        return self._memorizado('recorridos_x', lambda: {
+            orden: list(self.iter_claves(orden))
+            for orden in RECORRIDOS
+        })
 
     def limpiar_arbol(self):
         """Elimina todos los obstáculos del árbol"""
-        self.root = None
\ No newline at end of file
+        self.root = None
+        self._num_nodos = 0
+        self._registrar_cambio()
@@ -0,0 +1,189 @@
+"""
+Validación de invariantes del árbol AVL.
+
+Tres niveles, de más barato a más caro:
+
+- ContadoresAVL: el árbol los actualiza al mutar (rotaciones, mayor
+  desbalance visto antes de rotar, violaciones halladas en depuración).
+- validar_camino: revisa solo los nodos del camino hacia unas claves (y
+  los que la operación recorrió aparte), con comprobaciones locales O(1)
+  por nodo. Es lo que usa el modo depuración
+  del árbol después de cada cambio.
+- validar_arbol: recorrido iterativo completo (sin recursión) que
+  recalcula alturas, tamaños y bordes desde cero. Para uso offline o con
+  la tecla B.
+
+Los resultados se devuelven como objetos (ResultadoValidacion con una
+lista de Violacion); quien llama decide si imprimirlos.
+"""
+
+
+class Violacion:
+    """Un invariante roto en un nodo concreto"""
+    __slots__ = ('x_position', 'regla', 'detalle')
+
+    def __init__(self, x_position, regla, detalle=''):
+        self.x_position = x_position
+        self.regla = regla        # 'balance', 'altura', 'tamano', 'orden', 'max_fin', 'fin', 'vacio'
+        self.detalle = detalle
+
+    def __repr__(self):
+        return f"Violacion(x={self.x_position}, {self.regla}: {self.detalle})"
+
+
+class ResultadoValidacion:
+    """Resultado de validar un árbol o un camino"""
+
+    def __init__(self, modo):
+        self.modo = modo            # 'completa' o 'camino'
+        self.violaciones = []
+        self.nodos_revisados = 0
+        self.altura = 0
+
+    @property
+    def ok(self):
+        return not self.violaciones
+
+    def resumen(self):
+        """Una línea de texto para mostrar al usuario"""
+        if self.ok:
+            return f"AVL OK ({self.modo}: {self.nodos_revisados} nodos, altura {self.altura})"
+        primeras = ', '.join(repr(v) for v in self.violaciones[:5])
+        return (f"AVL con {len(self.violaciones)} violaciones ({self.modo}: "
+                f"{self.nodos_revisados} nodos): {primeras}")
+
+
+class ContadoresAVL:
+    """Contadores baratos que el árbol mantiene mientras muta"""
+    __slots__ = ('rotaciones', 'max_desbalance', 'violaciones')
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.rotaciones = 0       # Rotaciones simples (una doble cuenta como dos)
+        self.max_desbalance = 0   # Mayor |balance| visto al rebalancear (2 es lo normal antes de rotar)
+        self.violaciones = 0      # Violaciones halladas por el modo depuración
+
+    def como_dict(self):
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__}
+
+
+def _fin_grupo(nodo):
+    return max((o.x + o.width for o in nodo.obstaculos), default=float('-inf'))
+
+
+def revisar_nodo(nodo, violaciones):
+    """Comprobaciones locales O(1) de un nodo contra sus hijos directos"""
+    izquierdo = nodo.left
+    derecho = nodo.right
+    hl = izquierdo.height if izquierdo is not None else 0
+    hr = derecho.height if derecho is not None else 0
+    x = nodo.x_position
+    if not nodo.obstaculos:
+        violaciones.append(Violacion(x, 'vacio', "nodo sin obstáculos"))
+    if abs(hl - hr) > 1:
+        violaciones.append(Violacion(x, 'balance', f"{hl - hr}"))
+    if nodo.height != 1 + max(hl, hr):
+        violaciones.append(Violacion(x, 'altura', f"guardada {nodo.height}, hijos dan {1 + max(hl, hr)}"))
+    if izquierdo is not None and not izquierdo.x_position < x:
+        violaciones.append(Violacion(x, 'orden', f"hijo izquierdo {izquierdo.x_position}"))
+    if derecho is not None and not derecho.x_position > x:
+        violaciones.append(Violacion(x, 'orden', f"hijo derecho {derecho.x_position}"))
+    tamano = (len(nodo.obstaculos) + (izquierdo.tamano if izquierdo is not None else 0)
+              + (derecho.tamano if derecho is not None else 0))
+    if nodo.tamano != tamano:
+        violaciones.append(Violacion(x, 'tamano', f"guardado {nodo.tamano}, hijos dan {tamano}"))
+    fin = _fin_grupo(nodo)
+    if nodo.fin != fin:
+        violaciones.append(Violacion(x, 'fin', f"guardado {nodo.fin}, grupo da {fin}"))
+    max_fin = max([nodo.fin] + [h.max_fin for h in (izquierdo, derecho) if h is not None])
+    if nodo.max_fin != max_fin:
+        violaciones.append(Violacion(x, 'max_fin', f"guardado {nodo.max_fin}, hijos dan {max_fin}"))
+
+
+def validar_camino(raiz, claves, nodos=()):
+    """Revisa localmente los nodos en el camino desde la raíz hacia cada clave.
+
+    `nodos` son nodos que la operación recorrió fuera de esos caminos (por
+    ejemplo la cadena hacia el sucesor en una eliminación); se revisan
+    junto con sus hijos y nietos, que es hasta donde una rotación sobre
+    ellos pudo mover nodos.
+    """
+    resultado = ResultadoValidacion('camino')
+    revisados = set()
+    pendientes = [(nodo, 2) for nodo in nodos]
+    while pendientes:
+        nodo, niveles = pendientes.pop()
+        if id(nodo) not in revisados:
+            revisados.add(id(nodo))
+            revisar_nodo(nodo, resultado.violaciones)
+        if niveles:
+            pendientes.extend((hijo, niveles - 1) for hijo in (nodo.left, nodo.right) if hijo is not None)
+    for clave in claves:
+        nodo = raiz
+        profundidad = 0
+        while nodo is not None:
+            profundidad += 1
+            if id(nodo) not in revisados:
+                revisados.add(id(nodo))
+                revisar_nodo(nodo, resultado.violaciones)
+            if clave == nodo.x_position:
+                break
+            nodo = nodo.left if clave < nodo.x_position else nodo.right
+        resultado.altura = max(resultado.altura, profundidad)
+    resultado.nodos_revisados = len(revisados)
+    return resultado
+
+
+def validar_arbol(raiz):
+    """Validación completa e iterativa: recalcula todo desde las hojas.
+
+    A diferencia de revisar_nodo no confía en las alturas ni tamaños
+    guardados en los hijos, así que un error se reporta una sola vez en
+    el nodo donde aparece y no se arrastra hacia arriba.
+    """
+    resultado = ResultadoValidacion('completa')
+    violaciones = resultado.violaciones
+    # Postorden iterativo: (altura, tamaño, max_fin, clave mínima, clave máxima) reales por nodo
+    reales = {}
+    pila = [(raiz, False)] if raiz is not None else []
+    while pila:
+        nodo, hijos_listos = pila.pop()
+        if not hijos_listos:
+            pila.append((nodo, True))
+            if nodo.right is not None:
+                pila.append((nodo.right, False))
+            if nodo.left is not None:
+                pila.append((nodo.left, False))
+            continue
+        x = nodo.x_position
+        hl, tl, fl, min_izq, max_izq = reales.pop(id(nodo.left), (0, 0, float('-inf'), None, None))
+        hr, tr, fr, min_der, max_der = reales.pop(id(nodo.right), (0, 0, float('-inf'), None, None))
+        altura = 1 + max(hl, hr)
+        tamano = len(nodo.obstaculos) + tl + tr
+        fin = _fin_grupo(nodo)
+        max_fin = max(fin, fl, fr)
+        if not nodo.obstaculos:
+            violaciones.append(Violacion(x, 'vacio', "nodo sin obstáculos"))
+        if abs(hl - hr) > 1:
+            violaciones.append(Violacion(x, 'balance', f"{hl - hr}"))
+        if nodo.height != altura:
+            violaciones.append(Violacion(x, 'altura', f"guardada {nodo.height}, real {altura}"))
+        if max_izq is not None and not max_izq < x:
+            violaciones.append(Violacion(x, 'orden', f"subárbol izquierdo llega a {max_izq}"))
+        if min_der is not None and not min_der > x:
+            violaciones.append(Violacion(x, 'orden', f"subárbol derecho baja a {min_der}"))
+        if nodo.tamano != tamano:
+            violaciones.append(Violacion(x, 'tamano', f"guardado {nodo.tamano}, real {tamano}"))
+        if nodo.fin != fin:
+            violaciones.append(Violacion(x, 'fin', f"guardado {nodo.fin}, real {fin}"))
+        if nodo.max_fin != max_fin:
+            violaciones.append(Violacion(x, 'max_fin', f"guardado {nodo.max_fin}, real {max_fin}"))
+        reales[id(nodo)] = (altura, tamano, max_fin,
+                            min_izq if min_izq is not None else x,
+                            max_der if max_der is not None else x)
+        resultado.nodos_revisados += 1
+    if raiz is not None:
+        resultado.altura = reales[id(raiz)][0]
+    return resultado
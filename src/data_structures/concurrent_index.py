@@ -0,0 +1,119 @@
+import threading
+
+from data_structures.persistent_avl_tree import PersistentAVLTree
+
+
+class ConcurrentObstacleIndex:
+    """
+    Índice de obstáculos para varios hilos (publicación de raíz estilo RCU).
+
+    Guarda un PersistentAVLTree publicado que nunca se modifica. Los
+    lectores solo leen la referencia `_publicado` y consultan esa versión:
+    no toman ningún lock, así que el bucle del juego no se frena aunque
+    otro hilo esté escribiendo.
+
+    Cada escritura trabaja sobre un snapshot O(1) del árbol publicado y al
+    final, con el lock tomado solo para comparar y cambiar una referencia,
+    publica el resultado si nadie publicó antes; si no, reintenta. Tras
+    MAX_REINTENTOS conflictos la escritura se hace entera con el lock
+    tomado, para que un lote grande no se quede sin publicar nunca.
+    """
+
+    MAX_REINTENTOS = 3
+
+    def __init__(self):
+        self._publicado = PersistentAVLTree()
+        self._cerrojo = threading.Lock()
+
+    @property
+    def root(self):
+        return self._publicado.root
+
+    @property
+    def version(self):
+        return self._publicado.version
+
+    @property
+    def contadores(self):
+        """Contadores del árbol (todas las versiones publicadas comparten los mismos)"""
+        return self._publicado.contadores
+
+    def leer(self):
+        """Árbol publicado en este momento; es inmutable y se puede consultar sin locks"""
+        return self._publicado
+
+    def _escribir(self, operacion):
+        """Aplica `operacion(arbol)` sobre un snapshot y lo publica; devuelve su resultado"""
+        for _ in range(self.MAX_REINTENTOS):
+            base = self._publicado
+            trabajo = base.snapshot()
+            resultado = operacion(trabajo)
+            if trabajo.version == base.version:
+                return resultado  # No cambió nada: no hay que publicar
+            with self._cerrojo:
+                if self._publicado is base:
+                    self._publicado = trabajo
+                    return resultado
+        with self._cerrojo:
+            trabajo = self._publicado.snapshot()
+            resultado = operacion(trabajo)
+            self._publicado = trabajo
+            return resultado
+
+    # Escrituras
+
+    def insertar_obstaculo(self, obstaculo):
+        return self._escribir(lambda arbol: arbol.insertar_obstaculo(obstaculo))
+
+    def insert_many(self, obstaculos, ordenado=False):
+        obstaculos = list(obstaculos)  # Un reintento necesita volver a recorrerlos
+        return self._escribir(lambda arbol: arbol.insert_many(obstaculos, ordenado))
+
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        return self._escribir(lambda arbol: arbol.eliminar_obstaculo(x_position, obstaculo))
+
+    def prune_less_than(self, x_limite):
+        return self._escribir(lambda arbol: arbol.prune_less_than(x_limite))
+
+    def build_from_sorted(self, obstaculos):
+        obstaculos = list(obstaculos)
+        return self._escribir(lambda arbol: arbol.build_from_sorted(obstaculos))
+
+    def limpiar_arbol(self):
+        return self._escribir(lambda arbol: arbol.limpiar_arbol())
+
+    def snapshot(self):
+        """Instantánea O(1) del árbol publicado"""
+        return self._publicado.snapshot()
+
+    def restaurar(self, instantanea):
+        return self._escribir(lambda arbol: arbol.restaurar(instantanea))
+
+    # Lecturas (sin locks, sobre la versión publicada)
+
+    def __len__(self):
+        return len(self._publicado)
+
+    def contar_nodos(self):
+        return self._publicado.contar_nodos()
+
+    def buscar_obstaculos_visibles(self, x_min, x_max):
+        return self._publicado.buscar_obstaculos_visibles(x_min, x_max)
+
+    def buscar_solapados(self, x_ini, x_fin):
+        return self._publicado.buscar_solapados(x_ini, x_fin)
+
+    def buscar_obstaculos_despues_de(self, x_desde, x_hasta):
+        return self._publicado.buscar_obstaculos_despues_de(x_desde, x_hasta)
+
+    def siguiente_clave(self, x_position):
+        return self._publicado.siguiente_clave(x_position)
+
+    def count_in_range(self, x_min, x_max):
+        return self._publicado.count_in_range(x_min, x_max)
+
+    def iter_obstaculos(self, orden='inorder'):
+        return self._publicado.iter_obstaculos(orden)
+
+    def obtener_lista_ordenada(self):
+        return self._publicado.obtener_lista_ordenada()
@@ -0,0 +1,182 @@
+import numpy as np
+
+
+class NumpyColumnarIndex:
+    """
+    Índice de obstáculos en columnas NumPy (x, y, ancho, alto, tipo) ordenadas por X.
+
+    La columna `tipo` guarda ObstacleType.codigo, el código del flyweight.
+
+    Las consultas de rango son dos np.searchsorted sobre la columna x, y
+    las columnas quedan listas para procesar en bloque (por ejemplo
+    colisiones vectorizadas). Insertar copia las columnas, así que conviene
+    para cursos estáticos o con pocas inserciones. La poda por delante solo
+    recorta vistas; la memoria se compacta en la siguiente inserción.
+    """
+
+    root = None  # No es un árbol (el overlay AVL no tiene nada que dibujar)
+
+    COLUMNAS = (('x', np.float64), ('y', np.float32), ('ancho', np.float32),
+                ('alto', np.float32), ('tipo', np.int16))
+
+    def __init__(self):
+        self.version = 0
+        self._vaciar()
+
+    def _vaciar(self):
+        self._ancho_max = 0  # Ancho más grande visto (cota para buscar_solapados)
+        for nombre, dtype in self.COLUMNAS:
+            setattr(self, nombre, np.empty(0, dtype=dtype))
+        self.obstaculos = np.empty(0, dtype=object)
+
+    def __len__(self):
+        return len(self.x)
+
+    def contar_nodos(self):
+        """Filas ocupadas (una por obstáculo)"""
+        return len(self.x)
+
+    def _fila(self, obstaculo):
+        return (obstaculo.x, obstaculo.y, obstaculo.width, obstaculo.height,
+                obstaculo.tipo.codigo)
+
+    def _contiene(self, obstaculo):
+        """True si ese objeto ya ocupa una fila con su X"""
+        inicio = int(np.searchsorted(self.x, obstaculo.x, side='left'))
+        fin = int(np.searchsorted(self.x, obstaculo.x, side='right'))
+        return any(o is obstaculo for o in self.obstaculos[inicio:fin])
+
+    def insertar_obstaculo(self, obstaculo):
+        """Inserta manteniendo el orden (los iguales quedan en orden de llegada)"""
+        if self._contiene(obstaculo):
+            return
+        i = int(np.searchsorted(self.x, obstaculo.x, side='right'))
+        for (nombre, _), valor in zip(self.COLUMNAS, self._fila(obstaculo)):
+            setattr(self, nombre, np.insert(getattr(self, nombre), i, valor))
+        # np.insert no sirve para objetos: podría desarmar el obstáculo
+        obstaculos = np.empty(len(self.obstaculos) + 1, dtype=object)
+        obstaculos[:i] = self.obstaculos[:i]
+        obstaculos[i] = obstaculo
+        obstaculos[i + 1:] = self.obstaculos[i:]
+        self.obstaculos = obstaculos
+        self._ancho_max = max(self._ancho_max, obstaculo.width)
+        self.version += 1
+
+    def insert_many(self, obstaculos, ordenado=False):
+        """Inserta un lote copiando cada columna una sola vez (ignora los que ya estaban)"""
+        lote = [o for o in obstaculos if not self._contiene(o)]
+        if not ordenado:
+            lote.sort(key=lambda o: o.x)
+        if not lote:
+            return
+        filas = [self._fila(o) for o in lote]
+        x_lote = np.fromiter((f[0] for f in filas), dtype=np.float64, count=len(filas))
+        # Posición final de cada obstáculo nuevo (los iguales van después de los existentes)
+        destinos = np.searchsorted(self.x, x_lote, side='right') + np.arange(len(lote))
+        viejos = np.ones(len(self.x) + len(lote), dtype=bool)
+        viejos[destinos] = False
+        for posicion, (nombre, dtype) in enumerate(self.COLUMNAS):
+            columna = np.empty(len(viejos), dtype=dtype)
+            columna[viejos] = getattr(self, nombre)
+            columna[destinos] = [f[posicion] for f in filas]
+            setattr(self, nombre, columna)
+        obstaculos = np.empty(len(viejos), dtype=object)
+        obstaculos[viejos] = self.obstaculos
+        nuevos = np.empty(len(lote), dtype=object)
+        nuevos[:] = lote
+        obstaculos[destinos] = nuevos
+        self.obstaculos = obstaculos
+        self._ancho_max = max(self._ancho_max, max(o.width for o in lote))
+        self.version += 1
+
+    def _quitar(self, inicio, fin):
+        mantener = np.ones(len(self.x), dtype=bool)
+        mantener[inicio:fin] = False
+        for nombre, _ in self.COLUMNAS:
+            setattr(self, nombre, getattr(self, nombre)[mantener])
+        self.obstaculos = self.obstaculos[mantener]
+        self.version += 1
+
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        inicio = int(np.searchsorted(self.x, x_position, side='left'))
+        fin = int(np.searchsorted(self.x, x_position, side='right'))
+        if inicio == fin:
+            return
+        if obstaculo is not None:
+            for i in range(inicio, fin):
+                if self.obstaculos[i] is obstaculo:
+                    inicio, fin = i, i + 1
+                    break
+            else:
+                return
+        self._quitar(inicio, fin)
+
+    def indices_en_rango(self, x_min, x_max):
+        """(inicio, fin) de las filas con x_min <= x <= x_max"""
+        return (int(np.searchsorted(self.x, x_min, side='left')),
+                int(np.searchsorted(self.x, x_max, side='right')))
+
+    def buscar_obstaculos_visibles(self, x_min, x_max):
+        inicio, fin = self.indices_en_rango(x_min, x_max)
+        return self.obstaculos[inicio:fin].tolist()
+
+    def buscar_solapados(self, x_ini, x_fin):
+        inicio = int(np.searchsorted(self.x, x_ini - self._ancho_max, side='right'))
+        fin = int(np.searchsorted(self.x, x_fin, side='left'))
+        tocan = self.x[inicio:fin] + self.ancho[inicio:fin] > x_ini
+        return self.obstaculos[inicio:fin][tocan].tolist()
+
+    def buscar_obstaculos_despues_de(self, x_desde, x_hasta):
+        inicio = int(np.searchsorted(self.x, x_desde, side='right'))
+        fin = int(np.searchsorted(self.x, x_hasta, side='right'))
+        return self.obstaculos[inicio:fin].tolist()
+
+    def siguiente_clave(self, x_position):
+        i = int(np.searchsorted(self.x, x_position, side='right'))
+        return self.x[i].item() if i < len(self.x) else None
+
+    def count_in_range(self, x_min, x_max):
+        if x_max < x_min:
+            return 0
+        inicio, fin = self.indices_en_rango(x_min, x_max)
+        return fin - inicio
+
+    def prune_less_than(self, x_limite):
+        fin = int(np.searchsorted(self.x, x_limite, side='left'))
+        if fin == 0:
+            return []
+        eliminados = self.obstaculos[:fin].tolist()
+        # Vistas: no se copia nada; se liberan las referencias a los objetos
+        self.obstaculos[:fin] = None
+        for nombre, _ in self.COLUMNAS:
+            setattr(self, nombre, getattr(self, nombre)[fin:])
+        self.obstaculos = self.obstaculos[fin:]
+        if self.x.base is not None and len(self.x) * 2 < len(self.x.base):
+            # La parte muerta ya supera a la viva: se compacta
+            for nombre, _ in self.COLUMNAS:
+                setattr(self, nombre, getattr(self, nombre).copy())
+            self.obstaculos = self.obstaculos.copy()
+        self.version += 1
+        return eliminados
+
+    def build_from_sorted(self, obstaculos):
+        obstaculos = sorted(obstaculos, key=lambda o: o.x)
+        filas = [self._fila(o) for o in obstaculos]
+        for posicion, (nombre, dtype) in enumerate(self.COLUMNAS):
+            setattr(self, nombre, np.fromiter((f[posicion] for f in filas), dtype=dtype, count=len(filas)))
+        self.obstaculos = np.empty(len(obstaculos), dtype=object)
+        self.obstaculos[:] = obstaculos
+        self._ancho_max = float(self.ancho.max()) if len(self.ancho) else 0
+        self.version += 1
+
+    def iter_obstaculos(self, orden='inorder'):
+        if orden != 'inorder':
+            raise ValueError(f"NumpyColumnarIndex solo recorre en orden de X, no '{orden}'")
+        return iter(self.obstaculos.tolist())
+
+    def obtener_lista_ordenada(self):
+        return self.obstaculos.tolist()
+
+    def limpiar_arbol(self):
+        self._vaciar()
+        self.version += 1
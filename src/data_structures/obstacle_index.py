@@ -0,0 +1,105 @@
+"""
+Interfaz común de los índices de obstáculos y fábrica de backends.
+
+ObstacleManager solo usa los métodos de ObstacleIndex, así que el AVL se
+puede cambiar por otro índice desde game_config.json ("obstacle_index").
+"""
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class ObstacleIndex(Protocol):
+    """Índice de obstáculos ordenado por su posición X.
+
+    Todos los backends guardan varios obstáculos por X (en orden de
+    inserción) y aumentan `version` con cada cambio.
+    """
+
+    root: object    # Raíz si el backend es un árbol (None en los demás)
+    version: int
+
+    def __len__(self):
+        """Cantidad total de obstáculos"""
+        ...
+
+    def contar_nodos(self):
+        """Cantidad de nodos o entradas que ocupa el índice"""
+        ...
+
+    def insertar_obstaculo(self, obstaculo):
+        """Agrega un obstáculo usando obstaculo.x como clave (si ya está, no hace nada)"""
+        ...
+
+    def insert_many(self, obstaculos, ordenado=False):
+        """Agrega un lote con un solo cambio de versión, ignorando los que ya estaban.
+
+        Con ordenado=True el lote ya viene ordenado por X y no se reordena.
+        """
+        ...
+
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        """Quita todos los obstáculos de esa X, o solo `obstaculo` si se pasa"""
+        ...
+
+    def buscar_obstaculos_visibles(self, x_min, x_max):
+        """Obstáculos con x_min <= X <= x_max, ordenados por X"""
+        ...
+
+    def buscar_solapados(self, x_ini, x_fin):
+        """Obstáculos con x < x_fin y x + ancho > x_ini, ordenados por X"""
+        ...
+
+    def buscar_obstaculos_despues_de(self, x_desde, x_hasta):
+        """Obstáculos con x_desde < X <= x_hasta, ordenados por X"""
+        ...
+
+    def siguiente_clave(self, x_position):
+        """Menor X estrictamente mayor que x_position (o None)"""
+        ...
+
+    def count_in_range(self, x_min, x_max):
+        """Cantidad de obstáculos con x_min <= X <= x_max"""
+        ...
+
+    def prune_less_than(self, x_limite):
+        """Quita y devuelve (ordenados) los obstáculos con X < x_limite"""
+        ...
+
+    def build_from_sorted(self, obstaculos):
+        """Reemplaza el contenido por `obstaculos` (se ordenan por X)"""
+        ...
+
+    def iter_obstaculos(self, orden='inorder'):
+        """Generador de obstáculos; 'inorder' es el orden por X"""
+        ...
+
+    def obtener_lista_ordenada(self):
+        """Lista de todos los obstáculos ordenados por X"""
+        ...
+
+    def limpiar_arbol(self):
+        """Elimina todos los obstáculos"""
+        ...
+
+
+BACKENDS = ('avl', 'persistent_avl', 'concurrent', 'sorted_array', 'numpy')
+
+
+def crear_indice(nombre='avl'):
+    """Crea el índice de obstáculos pedido por nombre (ver BACKENDS)"""
+    if nombre == 'avl':
+        from data_structures.avl_tree import AVLTree
+        return AVLTree()
+    if nombre == 'persistent_avl':
+        from data_structures.persistent_avl_tree import PersistentAVLTree
+        return PersistentAVLTree()
+    if nombre == 'concurrent':
+        from data_structures.concurrent_index import ConcurrentObstacleIndex
+        return ConcurrentObstacleIndex()
+    if nombre == 'sorted_array':
+        from data_structures.sorted_array_index import SortedArrayIndex
+        return SortedArrayIndex()
+    if nombre == 'numpy':
+        from data_structures.numpy_index import NumpyColumnarIndex
+        return NumpyColumnarIndex()
+    raise ValueError(f"Índice de obstáculos desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
@@ -0,0 +1,214 @@
+from data_structures.avl_tree import AVLTree, TreeNode, fin_obstaculos
+
+
+def copiar_nodo(nodo):
+    """Copia superficial de un nodo (los hijos se comparten)"""
+    copia = TreeNode.__new__(TreeNode)
+    copia.x_position = nodo.x_position
+    copia.obstaculos = nodo.obstaculos
+    copia.height = nodo.height
+    copia.tamano = nodo.tamano
+    copia.fin = nodo.fin
+    copia.max_fin = nodo.max_fin
+    copia.left = nodo.left
+    copia.right = nodo.right
+    return copia
+
+
+class PersistentAVLTree(AVLTree):
+    """
+    Variante persistente del árbol AVL (copia de camino).
+
+    Un nodo ya publicado nunca se modifica: insertar o eliminar copia solo
+    los O(log n) nodos del camino (y los que participan en rotaciones) y
+    cambia `root` por la nueva raíz, que comparte el resto del árbol con
+    la anterior. Por eso:
+
+    - snapshot() cuesta O(1) y devuelve un árbol independiente que se puede
+      consultar (o mutar) sin afectar a este.
+    - restaurar(instantanea) vuelve a un estado anterior en O(1).
+    - Otro hilo puede leer un snapshot o una raíz sin bloqueos: lo que ve
+      no cambia aunque este árbol siga recibiendo obstáculos.
+
+    Las consultas son las de AVLTree. Las mutaciones son algo más lentas
+    porque cada una reserva nodos nuevos en vez de reutilizarlos.
+    """
+
+    # Aquí insertar en sitio no existe: unir el lote por split/join copia
+    # menos nodos que m inserciones con copia de camino
+    LOTE_POR_UNION = True
+
+    def snapshot(self):
+        """Instantánea inmutable del estado actual en O(1)"""
+        copia = PersistentAVLTree()
+        copia.root = self.root
+        copia._num_nodos = self._num_nodos
+        copia.version = self.version
+        # Mismo linaje: los contadores y el modo depuración se comparten
+        copia.contadores = self.contadores
+        copia.depuracion = self.depuracion
+        return copia
+
+    def restaurar(self, instantanea):
+        """Vuelve al estado de `instantanea` (obtenida con snapshot) en O(1)"""
+        self.root = instantanea.root
+        self._num_nodos = instantanea._num_nodos
+        self._registrar_cambio()
+
+    def insertar_obstaculo(self, obstaculo):
+        """Inserta un obstáculo y devuelve su nodo (en la nueva versión del árbol)"""
+        raiz, nodo = self._insertar(self.root, obstaculo, obstaculo.x + obstaculo.width)
+        if raiz is not self.root:
+            self.root = raiz
+            self._registrar_cambio(obstaculo.x)
+        return nodo
+
+    def _insertar(self, nodo, obstaculo, fin):
+        """Devuelve (nueva raíz del subárbol, nodo del obstáculo)"""
+        x_position = obstaculo.x
+        if nodo is None:
+            self._num_nodos += 1
+            nuevo = TreeNode(x_position, (obstaculo,))
+            return nuevo, nuevo
+        if x_position == nodo.x_position:
+            if any(o is obstaculo for o in nodo.obstaculos):
+                return nodo, nodo
+            nuevo = copiar_nodo(nodo)
+            nuevo.obstaculos = nodo.obstaculos + (obstaculo,)
+            if fin > nuevo.fin:
+                nuevo.fin = fin
+            self._actualizar_nodo(nuevo)
+            return nuevo, nuevo
+        if x_position < nodo.x_position:
+            hijo, encontrado = self._insertar(nodo.left, obstaculo, fin)
+            if hijo is nodo.left:
+                return nodo, encontrado
+            nuevo = copiar_nodo(nodo)
+            nuevo.left = hijo
+        else:
+            hijo, encontrado = self._insertar(nodo.right, obstaculo, fin)
+            if hijo is nodo.right:
+                return nodo, encontrado
+            nuevo = copiar_nodo(nodo)
+            nuevo.right = hijo
+        return self._balancear_nodo(nuevo), encontrado
+
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        """Elimina los obstáculos en la posición X (o solo `obstaculo`)"""
+        raiz = self._eliminar(self.root, x_position, obstaculo)
+        if raiz is not self.root:
+            self.root = raiz
+            self._registrar_cambio(x_position, camino=self._nodos_tocados(x_position) if self.depuracion else ())
+
+    def _nodos_tocados(self, x_position):
+        """Nodos que una eliminación pudo copiar o rotar, para el modo depuración.
+
+        Los caminos hacia x_position y hacia su sucesor y, si el sucesor
+        tomó su lugar, la cadena izquierda bajo él por donde bajó
+        _quitar_minimo.
+        """
+        tocados = []
+        for clave in (x_position, self.siguiente_clave(x_position)):
+            nodo = self.root
+            while nodo is not None and clave is not None and nodo.x_position != clave:
+                tocados.append(nodo)
+                nodo = nodo.left if clave < nodo.x_position else nodo.right
+            if nodo is not None and clave is not None and clave != x_position:
+                tocados.append(nodo)
+                nodo = nodo.right
+                while nodo is not None:
+                    tocados.append(nodo)
+                    nodo = nodo.left
+        return tocados
+
+    def _eliminar(self, nodo, x_position, obstaculo):
+        """Devuelve la nueva raíz del subárbol (la misma si no había nada que quitar)"""
+        if nodo is None:
+            return None
+        if x_position < nodo.x_position:
+            hijo = self._eliminar(nodo.left, x_position, obstaculo)
+            if hijo is nodo.left:
+                return nodo
+            nuevo = copiar_nodo(nodo)
+            nuevo.left = hijo
+        elif x_position > nodo.x_position:
+            hijo = self._eliminar(nodo.right, x_position, obstaculo)
+            if hijo is nodo.right:
+                return nodo
+            nuevo = copiar_nodo(nodo)
+            nuevo.right = hijo
+        else:
+            if obstaculo is not None:
+                restantes = tuple(o for o in nodo.obstaculos if o is not obstaculo)
+                if len(restantes) == len(nodo.obstaculos):
+                    return nodo
+                if restantes:
+                    nuevo = copiar_nodo(nodo)
+                    nuevo.obstaculos = restantes
+                    nuevo.fin = fin_obstaculos(restantes)
+                    self._actualizar_nodo(nuevo)
+                    return nuevo
+            self._num_nodos -= 1
+            if nodo.left is None:
+                return nodo.right
+            if nodo.right is None:
+                return nodo.left
+            # Dos hijos: el sucesor inorden (copiado) ocupa su lugar
+            derecho, sucesor = self._quitar_minimo(nodo.right)
+            nuevo = copiar_nodo(sucesor)
+            nuevo.left = nodo.left
+            nuevo.right = derecho
+        return self._balancear_nodo(nuevo)
+
+    def _quitar_minimo(self, nodo):
+        """Devuelve (subárbol sin su mínimo, nodo mínimo)"""
+        if nodo.left is None:
+            return nodo.right, nodo
+        izquierdo, minimo = self._quitar_minimo(nodo.left)
+        nuevo = copiar_nodo(nodo)
+        nuevo.left = izquierdo
+        return self._balancear_nodo(nuevo), minimo
+
+    def _unir(self, izquierdo, medio, derecho):
+        """Como AVLTree._unir, pero copiando los nodos que cambia"""
+        hl = izquierdo.height if izquierdo is not None else 0
+        hr = derecho.height if derecho is not None else 0
+        if hl > hr + 1:
+            izquierdo = copiar_nodo(izquierdo)
+            izquierdo.right = self._unir(izquierdo.right, medio, derecho)
+            return self._balancear_nodo(izquierdo)
+        if hr > hl + 1:
+            derecho = copiar_nodo(derecho)
+            derecho.left = self._unir(izquierdo, medio, derecho.left)
+            return self._balancear_nodo(derecho)
+        medio = copiar_nodo(medio)
+        medio.left = izquierdo
+        medio.right = derecho
+        self._actualizar_nodo(medio)
+        return medio
+
+    def _rotar_izquierda(self, nodo_z):
+        """Rotación simple a la izquierda sobre copias de los dos nodos que cambian"""
+        if nodo_z is None or nodo_z.right is None:
+            return nodo_z
+        self.contadores.rotaciones += 1
+        nodo_z = copiar_nodo(nodo_z)
+        nodo_y = copiar_nodo(nodo_z.right)
+        nodo_z.right = nodo_y.left
+        nodo_y.left = nodo_z
+        self._actualizar_nodo(nodo_z)
+        self._actualizar_nodo(nodo_y)
+        return nodo_y
+
+    def _rotar_derecha(self, nodo_z):
+        """Rotación simple a la derecha sobre copias de los dos nodos que cambian"""
+        if nodo_z is None or nodo_z.left is None:
+            return nodo_z
+        self.contadores.rotaciones += 1
+        nodo_z = copiar_nodo(nodo_z)
+        nodo_y = copiar_nodo(nodo_z.left)
+        nodo_z.left = nodo_y.right
+        nodo_y.right = nodo_z
+        self._actualizar_nodo(nodo_z)
+        self._actualizar_nodo(nodo_y)
+        return nodo_y
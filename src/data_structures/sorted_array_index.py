@@ -0,0 +1,154 @@
+from bisect import bisect_left, bisect_right
+
+
+class SortedArrayIndex:
+    """
+    Índice de obstáculos sobre dos listas paralelas ordenadas por X (bisect).
+
+    Pensado para cursos estáticos: las consultas de rango son dos búsquedas
+    binarias y un slice, y ocupa mucha menos memoria que un nodo por X.
+    Insertar en el medio cuesta O(n) (memmove en C). Lo que se poda por
+    delante solo avanza `_inicio`; las listas se compactan cuando la parte
+    muerta supera a la viva. Para buscar_solapados se recuerda el ancho más
+    grande visto: basta mirar desde x_ini - _ancho_max.
+    """
+
+    root = None  # No es un árbol (el overlay AVL no tiene nada que dibujar)
+
+    def __init__(self):
+        self._claves = []
+        self._obstaculos = []
+        self._inicio = 0
+        self._ancho_max = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self._claves) - self._inicio
+
+    def contar_nodos(self):
+        """Entradas ocupadas (una por obstáculo)"""
+        return len(self)
+
+    def _compactar(self):
+        """Descarta físicamente la parte ya podada"""
+        if self._inicio:
+            del self._claves[:self._inicio]
+            del self._obstaculos[:self._inicio]
+            self._inicio = 0
+
+    def insertar_obstaculo(self, obstaculo):
+        """Inserta manteniendo el orden (los iguales quedan en orden de llegada)"""
+        if self._contiene(obstaculo):
+            return
+        self._insertar_en_sitio(obstaculo)
+        self.version += 1
+
+    def _contiene(self, obstaculo):
+        """True si ese mismo objeto ya está en el índice (como en el AVL, no se repite)"""
+        inicio = bisect_left(self._claves, obstaculo.x, self._inicio)
+        fin = bisect_right(self._claves, obstaculo.x, inicio)
+        return any(self._obstaculos[i] is obstaculo for i in range(inicio, fin))
+
+    def _insertar_en_sitio(self, obstaculo):
+        i = bisect_right(self._claves, obstaculo.x, self._inicio)
+        self._claves.insert(i, obstaculo.x)
+        self._obstaculos.insert(i, obstaculo)
+        if obstaculo.width > self._ancho_max:
+            self._ancho_max = obstaculo.width
+
+    def insert_many(self, obstaculos, ordenado=False):
+        """Mezcla un lote en O(n + m log m): sorted aprovecha los dos tramos ya ordenados.
+
+        Los obstáculos que ya estaban se ignoran, igual que en el AVL. El lote
+        no se ordena aparte, así que `ordenado` no cambia nada: un lote ya
+        ordenado es un tramo más y la mezcla queda en O(n + m).
+        """
+        lote = [o for o in obstaculos if not self._contiene(o)]
+        if not lote:
+            return
+        if len(lote) * 256 < len(self):
+            # Lote chico: cada insert es un memmove, más barato que reordenar todo
+            for obstaculo in lote:
+                self._insertar_en_sitio(obstaculo)
+            self.version += 1
+            return
+        self._compactar()
+        # sorted es estable: con la misma X los existentes quedan antes
+        self._obstaculos = sorted(self._obstaculos + lote, key=lambda o: o.x)
+        self._claves = [o.x for o in self._obstaculos]
+        self._ancho_max = max(self._ancho_max, max(o.width for o in lote))
+        self.version += 1
+
+    def eliminar_obstaculo(self, x_position, obstaculo=None):
+        inicio = bisect_left(self._claves, x_position, self._inicio)
+        fin = bisect_right(self._claves, x_position, inicio)
+        if inicio == fin:
+            return
+        if obstaculo is not None:
+            for i in range(inicio, fin):
+                if self._obstaculos[i] is obstaculo:
+                    inicio, fin = i, i + 1
+                    break
+            else:
+                return
+        del self._claves[inicio:fin]
+        del self._obstaculos[inicio:fin]
+        self.version += 1
+
+    def buscar_obstaculos_visibles(self, x_min, x_max):
+        inicio = bisect_left(self._claves, x_min, self._inicio)
+        return self._obstaculos[inicio:bisect_right(self._claves, x_max, inicio)]
+
+    def buscar_solapados(self, x_ini, x_fin):
+        inicio = bisect_right(self._claves, x_ini - self._ancho_max, self._inicio)
+        fin = bisect_left(self._claves, x_fin, inicio)
+        return [o for o in self._obstaculos[inicio:fin] if o.x + o.width > x_ini]
+
+    def buscar_obstaculos_despues_de(self, x_desde, x_hasta):
+        inicio = bisect_right(self._claves, x_desde, self._inicio)
+        return self._obstaculos[inicio:bisect_right(self._claves, x_hasta, inicio)]
+
+    def siguiente_clave(self, x_position):
+        i = bisect_right(self._claves, x_position, self._inicio)
+        return self._claves[i] if i < len(self._claves) else None
+
+    def count_in_range(self, x_min, x_max):
+        if x_max < x_min:
+            return 0
+        inicio = bisect_left(self._claves, x_min, self._inicio)
+        return bisect_right(self._claves, x_max, inicio) - inicio
+
+    def prune_less_than(self, x_limite):
+        fin = bisect_left(self._claves, x_limite, self._inicio)
+        if fin == self._inicio:
+            return []
+        eliminados = self._obstaculos[self._inicio:fin]
+        # Se liberan las referencias ya, aunque la lista se compacte después
+        self._obstaculos[self._inicio:fin] = [None] * (fin - self._inicio)
+        self._inicio = fin
+        if self._inicio * 2 > len(self._claves):
+            self._compactar()
+        self.version += 1
+        return eliminados
+
+    def build_from_sorted(self, obstaculos):
+        self._obstaculos = sorted(obstaculos, key=lambda o: o.x)
+        self._claves = [o.x for o in self._obstaculos]
+        self._inicio = 0
+        self._ancho_max = max((o.width for o in self._obstaculos), default=0)
+        self.version += 1
+
+    def iter_obstaculos(self, orden='inorder'):
+        if orden != 'inorder':
+            raise ValueError(f"SortedArrayIndex solo recorre en orden de X, no '{orden}'")
+        return iter(self._obstaculos[self._inicio:])
+
+    def obtener_lista_ordenada(self):
+        return self._obstaculos[self._inicio:]
+
+    def limpiar_arbol(self):
+        self._claves = []
+        self._obstaculos = []
+        self._inicio = 0
+        self._ancho_max = 0
+        self.version += 1
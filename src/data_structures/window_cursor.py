@@ -0,0 +1,134 @@
+from collections import deque
+
+
+class WindowCursor:
+    """
+    Ventana deslizante [posición - atrás, posición + adelante] sobre el árbol.
+
+    Como el carro solo avanza, en cada frame se sueltan por detrás los
+    obstáculos que salieron de la ventana y solo se piden al árbol los que
+    entran por delante. La siguiente clave fuera de la ventana queda
+    guardada, así que un frame sin obstáculos nuevos no toca el árbol.
+
+    Los cambios del árbol deben avisarse con notificar_*, pasando la versión
+    que tenía el árbol justo antes del cambio; si la versión cambia sin
+    aviso, la ventana se recarga completa. Eso cubre también los cambios
+    hechos desde otro hilo: un aviso solo se acepta si su cambio es el
+    único desde la última sincronización, y la versión se lee antes de
+    consultar, así que una escritura a mitad de actualizar se ve como
+    cambio en el frame siguiente.
+    """
+
+    def __init__(self, arbol, atras, adelante):
+        self.arbol = arbol
+        self.atras = atras
+        self.adelante = adelante
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida la ventana actual; el próximo actualizar la recarga completa"""
+        self._obstaculos = deque()
+        self._x_min = None
+        self._x_max = None
+        self._siguiente_x = None
+        self._siguiente_valido = False
+        self._posicion = None
+        self._version = None
+
+    def configurar(self, atras, adelante):
+        """Cambia el tamaño de la ventana"""
+        self.atras = atras
+        self.adelante = adelante
+        self.reiniciar()
+
+    def actualizar(self, posicion):
+        """Mueve la ventana a `posicion` y devuelve los obstáculos visibles (ordenados por X)"""
+        version = self.arbol.version
+        if posicion == self._posicion and self._version == version:
+            return self._obstaculos
+        x_min = posicion - self.atras
+        x_max = posicion + self.adelante
+        if (self._x_max is None or self._version != version
+                or x_min < self._x_min or x_min > self._x_max):
+            # Primera vez, retroceso (reinicio) o salto mayor que la ventana
+            self._obstaculos = deque(self.arbol.buscar_obstaculos_visibles(x_min, x_max))
+            self._siguiente_valido = False
+        else:
+            obstaculos = self._obstaculos
+            while obstaculos and obstaculos[0].x < x_min:
+                obstaculos.popleft()
+            if x_max > self._x_max:
+                if not self._siguiente_valido:
+                    self._siguiente_x = self.arbol.siguiente_clave(self._x_max)
+                    self._siguiente_valido = True
+                if self._siguiente_x is not None and self._siguiente_x <= x_max:
+                    obstaculos.extend(self.arbol.buscar_obstaculos_despues_de(self._x_max, x_max))
+                    self._siguiente_valido = False
+        self._x_min = x_min
+        self._x_max = x_max
+        self._posicion = posicion
+        self._version = version
+        return self._obstaculos
+
+    def _sincronizar_version(self, version_antes):
+        """Acepta el aviso solo si su cambio es el único desde la última sincronización.
+
+        La ventana tiene que estar en `version_antes` y el árbol exactamente
+        una versión más adelante. Si se coló otro cambio (de otro hilo) o el
+        avisado no cambió el árbol, el aviso se ignora: la versión de la
+        ventana queda vieja y el próximo actualizar la recarga.
+        """
+        if self._version != version_antes or self.arbol.version != version_antes + 1:
+            return False
+        self._version = version_antes + 1
+        return True
+
+    def notificar_insercion(self, obstaculo, version_antes):
+        """Mantiene la ventana al día cuando se inserta un obstáculo en el árbol"""
+        if self._x_max is None or not self._sincronizar_version(version_antes):
+            return
+        self._agregar_a_ventana(obstaculo)
+
+    def notificar_insercion_lote(self, obstaculos, version_antes):
+        """Como notificar_insercion, para un lote que el árbol agregó en un solo cambio"""
+        if self._x_max is None or not self._sincronizar_version(version_antes):
+            return
+        for obstaculo in obstaculos:
+            self._agregar_a_ventana(obstaculo)
+
+    def _agregar_a_ventana(self, obstaculo):
+        """Ubica un obstáculo nuevo en la ventana o en la siguiente clave"""
+        x = obstaculo.x
+        if x > self._x_max:
+            if self._siguiente_valido and (self._siguiente_x is None or x < self._siguiente_x):
+                self._siguiente_x = x
+            return
+        if x < self._x_min:
+            return
+        # Los nuevos suelen entrar cerca del frente: se busca desde la derecha
+        obstaculos = self._obstaculos
+        i = len(obstaculos)
+        while i > 0 and obstaculos[i - 1].x > x:
+            i -= 1
+        # Un obstáculo que ya estaba en el índice no se agregó de nuevo: tampoco aquí
+        j = i
+        while j > 0 and obstaculos[j - 1].x == x:
+            j -= 1
+            if obstaculos[j] is obstaculo:
+                return
+        obstaculos.insert(i, obstaculo)
+
+    def notificar_eliminacion(self, obstaculos_eliminados, version_antes):
+        """Quita de la ventana los obstáculos que se borraron del árbol"""
+        if self._x_max is None or not self._sincronizar_version(version_antes):
+            return
+        for obstaculo in obstaculos_eliminados:
+            x = obstaculo.x
+            if x > self._x_max:
+                if self._siguiente_valido and x == self._siguiente_x:
+                    self._siguiente_valido = False
+            elif x >= self._x_min:
+                try:
+                    self._obstaculos.remove(obstaculo)
+                except ValueError:
+                    pass
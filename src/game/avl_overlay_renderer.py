@@ -1,10 +1,13 @@
 import pygame
+from data_structures.avl_tree import iterar_nodos, RECORRIDOS
 
 class AVLMiniRenderer:
     """
     Renderiza una vista mini del árbol AVL dentro del juego (overlay en tiempo real).
     Estético y ligero: sin matplotlib, sólo Pygame.
     """
+    NIVELES_DIBUJADOS = 6  # Niveles del árbol que entran en el panel (hasta 63 nodos)
+
     def __init__(self, screen_width, screen_height, width=250, height=170, margin=12):
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -15,70 +18,77 @@ class AVLMiniRenderer:
         self.font_tiny = pygame.font.Font(None, 14)
         self.bg_cache = None
         self._cache_size = (width, height)
+        # Datos del árbol ya calculados para (versión, raíz)
+        self._cache_clave = None
+        self._cache_datos = None
                 # Configuración del panel de recorridos
         self.traversal_width = 350
         self.traversal_height = 160
+        self.traversal_max_chars = 45  # Máximo de caracteres por línea de recorrido
 
     # -------- Utilidades internas --------
-    def _calc_heights(self, node):
-        if not node:
-            return 0
-        hl = self._calc_heights(node.left)
-        hr = self._calc_heights(node.right)
-        node._tmp_height_overlay = max(hl, hr) + 1
-        return node._tmp_height_overlay
-
     def _balance(self, node):
+        # Alturas guardadas en los nodos: no hace falta recorrer los subárboles
         if not node:
             return 0
-        hl = getattr(node.left, '_tmp_height_overlay', 0) if node.left else 0
-        hr = getattr(node.right, '_tmp_height_overlay', 0) if node.right else 0
+        hl = node.left.height if node.left else 0
+        hr = node.right.height if node.right else 0
         return hl - hr
 
     def _collect_nodes(self, root):
-        """Devuelve lista de (node, depth, order_index) usando inorden para orden horizontal."""
+        """Devuelve lista de (node, depth, order_index) usando inorden para orden horizontal.
+
+        Iterativo y solo hasta NIVELES_DIBUJADOS niveles: el costo depende
+        de lo que cabe en el panel, no del tamaño del árbol.
+        """
         nodes = []
-        index = 0
-        def inorder(n, depth):
-            nonlocal index
-            if not n: return
-            inorder(n.left, depth + 1)
-            nodes.append((n, depth, index))
-            index += 1
-            inorder(n.right, depth + 1)
-        inorder(root, 0)
+        pila = []
+        node, depth = root, 0
+        while True:
+            while node is not None and depth < self.NIVELES_DIBUJADOS:
+                pila.append((node, depth))
+                node = node.left
+                depth += 1
+            if not pila:
+                break
+            node, depth = pila.pop()
+            nodes.append((node, depth, len(nodes)))
+            node, depth = node.right, depth + 1
         return nodes
 
     def _get_traversals(self, root):
-        """Calcula los tres recorridos del árbol AVL."""
-        preorder = []
-        inorder = []
-        postorder = []
-        
-        def preorder_traversal(node):
-            if node:
-                preorder.append(int(getattr(node, 'x_position', 0)))
-                preorder_traversal(node.left)
-                preorder_traversal(node.right)
-        
-        def inorder_traversal(node):
-            if node:
-                inorder_traversal(node.left)
-                inorder.append(int(getattr(node, 'x_position', 0)))
-                inorder_traversal(node.right)
-        
-        def postorder_traversal(node):
-            if node:
-                postorder_traversal(node.left)
-                postorder_traversal(node.right)
-                postorder.append(int(getattr(node, 'x_position', 0)))
-        
-        if root:
-            preorder_traversal(root)
-            inorder_traversal(root)
-            postorder_traversal(root)
-        
-        return preorder, inorder, postorder
+        """Texto de los tres recorridos del árbol AVL, ya truncado.
+
+        Los recorridos son generadores: solo se visitan los nodos que caben
+        en la línea, no todo el árbol.
+        """
+        return tuple(self._formatear_recorrido(iterar_nodos(root, orden))
+                     for orden in RECORRIDOS)
+
+    def _formatear_recorrido(self, nodos):
+        """Une claves hasta pasar el máximo de caracteres y trunca con '...'"""
+        max_chars = self.traversal_max_chars
+        partes = []
+        largo = -2  # el primer elemento no lleva ", "
+        for node in nodos:
+            partes.append(str(int(getattr(node, 'x_position', 0))))
+            largo += len(partes[-1]) + 2
+            if largo > max_chars:
+                break
+        text = ", ".join(partes)
+        if len(text) > max_chars:
+            text = text[:max_chars-3] + "..."
+        return text
+
+    def _datos_arbol(self, root, version):
+        """Nodos y recorridos del árbol; se reutilizan mientras la versión no cambie"""
+        clave = (version, id(root))
+        if version is not None and clave == self._cache_clave:
+            return self._cache_datos
+        datos = (self._collect_nodes(root), self._get_traversals(root))
+        self._cache_clave = clave
+        self._cache_datos = datos
+        return datos
 
     def _draw_panel_background(self):
         """Genera (o reutiliza) fondo degradado semi-transparente con borde."""
@@ -113,7 +123,7 @@ class AVLMiniRenderer:
         pygame.draw.rect(surf, (180, 230, 180, 200), surf.get_rect(), 2, border_radius=10)
         return surf
 
-    def _draw_traversals(self, screen, root):
+    def _draw_traversals(self, screen, root, recorridos=None, total_nodos=None):
         """Dibuja los recorridos del árbol en el lado izquierdo."""
         if not root:
             return
@@ -126,8 +136,8 @@ class AVLMiniRenderer:
         bg = self._draw_traversal_background()
         screen.blit(bg, (panel_x, panel_y))
         
-        # Obtener recorridos
-        preorder, inorder, postorder = self._get_traversals(root)
+        # Obtener recorridos (texto ya truncado)
+        preorder_text, inorder_text, postorder_text = recorridos or self._get_traversals(root)
         
         # Título con fuente más grande
         titulo = self.font_small.render("Recorridos AVL", True, (220, 255, 220))
@@ -136,48 +146,45 @@ class AVLMiniRenderer:
         # Configuración de texto con fuentes más grandes
         line_height = 28
         start_y = panel_y + 45
-        max_chars = 45  # Máximo de caracteres por línea (más caracteres por línea más ancha)
-        
-        # Función auxiliar para truncar texto si es muy largo
-        def format_traversal(traversal_list):
-            text = ", ".join(map(str, traversal_list))
-            if len(text) > max_chars:
-                text = text[:max_chars-3] + "..."
-            return text
         
         # Pre-orden con fuente más grande
-        preorder_text = format_traversal(preorder)
         pre_label = self.font_small.render("Pre-orden:", True, (255, 200, 200))
         pre_values = self.font_small.render(preorder_text, True, (255, 255, 255))
         screen.blit(pre_label, (panel_x + 15, start_y))
         screen.blit(pre_values, (panel_x + 15, start_y + 18))
         
         # In-orden con fuente más grande
-        inorder_text = format_traversal(inorder)
         in_label = self.font_small.render("In-orden:", True, (200, 255, 200))
         in_values = self.font_small.render(inorder_text, True, (255, 255, 255))
         screen.blit(in_label, (panel_x + 15, start_y + line_height))
         screen.blit(in_values, (panel_x + 15, start_y + line_height + 18))
         
         # Post-orden con fuente más grande
-        postorder_text = format_traversal(postorder)
         post_label = self.font_small.render("Post-orden:", True, (200, 200, 255))
         post_values = self.font_small.render(postorder_text, True, (255, 255, 255))
         screen.blit(post_label, (panel_x + 15, start_y + line_height * 2))
         screen.blit(post_values, (panel_x + 15, start_y + line_height * 2 + 18))
         
         # Información adicional
-        info_text = f"Total nodos: {len(preorder)}"
+        info_text = f"Total nodos: {total_nodos}"
         info_render = self.font_small.render(info_text, True, (180, 255, 180))
         screen.blit(info_render, (panel_x + 15, panel_y + self.traversal_height - 25))
 
-    def dibujar(self, screen, root):
+    def dibujar(self, screen, root, version=None, total_nodos=None):
+        """Dibuja el overlay; con `version` (del AVLTree) evita recalcular si el árbol no cambió.
+
+        `total_nodos` permite mostrar el conteo que el árbol ya mantiene en O(1).
+        """
+        nodes, recorridos = self._datos_arbol(root, version)
+        if total_nodos is None:
+            # Sin el conteo del árbol hay que recorrerlo (nodes solo tiene los niveles dibujados)
+            total_nodos = sum(1 for _ in iterar_nodos(root))
         panel_x = self.screen_width - self.width - self.margin
         panel_y = self.screen_height - self.height - self.margin
         panel_rect = pygame.Rect(panel_x, panel_y, self.width, self.height)
 
         # Dibujar primero los recorridos (al lado izquierdo del panel principal)
-        self._draw_traversals(screen, root)
+        self._draw_traversals(screen, root, recorridos, total_nodos)
 
         # Fondo del panel principal
         bg = self._draw_panel_background()
@@ -188,9 +195,6 @@ class AVLMiniRenderer:
             screen.blit(texto, texto.get_rect(center=(panel_x + self.width//2, panel_y + self.height//2)))
             return
 
-        # Preparar datos
-        self._calc_heights(root)
-        nodes = self._collect_nodes(root)
         if not nodes:
             return
         max_index = max(idx for (_, _, idx) in nodes)
@@ -247,7 +251,7 @@ class AVLMiniRenderer:
         # Título y metadatos
         titulo = self.font_small.render("AVL Obstáculos", True, (210, 220, 235))
         screen.blit(titulo, (panel_x + 12, panel_y + 5))
-        meta = self.font_tiny.render(f"Nodos: {len(nodes)} Prof: {max_depth+1}", True, (180, 195, 210))
+        meta = self.font_tiny.render(f"Nodos: {total_nodos} Prof: {root.height}", True, (180, 195, 210))
         screen.blit(meta, (panel_x + self.width - meta.get_width() - 10, panel_y + 6))
 
         # Leyenda rápida (opcional minimalista)
@@ -1,52 +1,122 @@
 import pygame
+from utils.constants import ANCHO_CARRO, ALTO_CARRO
+
+try:
+    import numpy as np
+except ImportError:  # Sin NumPy se usa siempre la prueba uno por uno
+    np = None
 
 class CollisionDetector:
     """Clase especializada en detectar colisiones entre el carro y obstáculos"""
     
+    MIN_LOTE_VECTORIAL = 64  # Con menos candidatos armar los arreglos cuesta más que probar uno por uno (ver bench_collision)
+    
     def __init__(self):
         pass
     
     def verificar_colisiones(self, carro_x, carro_y, obstaculos_visibles, posicion_en_carretera, estado_juego,
-                              desplazamiento_vertical=0, esta_saltando=False):
-        """Verifica colisiones. Si está saltando y elevación suficiente, se ignora obstáculo."""
+                              desplazamiento_vertical=0, esta_saltando=False, candidatos=None,
+                              posicion_anterior=None):
+        """Verifica colisiones. Si está saltando y elevación suficiente, se ignora obstáculo.
+
+        `candidatos` son los obstáculos que pueden tocar al carro (por ejemplo
+        los que se cruzan con su huella en X); si no se pasa se prueban todos
+        los visibles. Los candidatos cuyo final quedó detrás del carro se
+        marcan como pasados (y evitados si no se golpearon) una sola vez.
+        Con `posicion_anterior` la prueba es barrida: el carro ocupa todo el
+        tramo que recorrió desde ahí, así que a velocidad alta (o con
+        frames perdidos) no atraviesa obstáculos angostos sin tocarlos.
+        Con MIN_LOTE_VECTORIAL candidatos o más (y NumPy instalado) se usa
+        colisiones_en_lote, que da los mismos golpes.
+        """
         y_final = carro_y + desplazamiento_vertical
-        recticulo_altura = 50
-        rectangulo_carro = pygame.Rect(carro_x, y_final, 50, recticulo_altura)
+        recorrido = 0
+        if posicion_anterior is not None:
+            recorrido = max(0, posicion_en_carretera - posicion_anterior)
+        
+        if candidatos is None:
+            candidatos = obstaculos_visibles
+        if np is not None and len(candidatos) >= self.MIN_LOTE_VECTORIAL:
+            candidatos = list(candidatos)
+            indices = self.colisiones_en_lote(carro_x, y_final, posicion_en_carretera, esta_saltando,
+                                              *self.empaquetar(candidatos), recorrido=recorrido)
+            golpeados = [candidatos[i] for i in indices]
+        else:
+            golpeados = self._golpeados_uno_por_uno(carro_x, y_final, candidatos,
+                                                    posicion_en_carretera, esta_saltando, recorrido)
         
-        for obstaculo in obstaculos_visibles:
+        # Procesar resultado de las colisiones
+        for obstaculo in golpeados:
+            estado_juego.agregar_obstaculo_golpeado(obstaculo, esta_saltando)
+        
+        # Ya no pueden chocar los que terminan detrás de la cola del carro. Con
+        # la prueba barrida todo obstáculo cae en ese caso en un solo frame
+        # (su final está en el tramo recorrido), y la bandera evita contarlo dos veces
+        for obstaculo in candidatos:
+            if obstaculo.x + obstaculo.width <= posicion_en_carretera:
+                estado_juego.marcar_obstaculo_pasado(obstaculo)
+    
+    def _golpeados_uno_por_uno(self, carro_x, y_final, candidatos, posicion_en_carretera, esta_saltando,
+                               recorrido=0):
+        """Obstáculos que chocan con el carro, probando uno por uno con pygame.Rect.
+
+        El rectángulo del carro se estira `recorrido` px hacia atrás para
+        cubrir lo que avanzó en el frame.
+        """
+        recticulo_altura = ALTO_CARRO
+        rectangulo_carro = pygame.Rect(carro_x - recorrido, y_final, ANCHO_CARRO + recorrido, recticulo_altura)
+        golpeados = []
+        for obstaculo in candidatos:
             # Calcular posición del obstáculo en pantalla
             x_pantalla = obstaculo.x - posicion_en_carretera + carro_x
             rectangulo_obstaculo = pygame.Rect(x_pantalla, obstaculo.y, obstaculo.width, obstaculo.height)
             
-            # Verificar colisión
-            colision_detectada = False
-            
-            # Para obstáculos tipo 'hole', solo se pueden evitar saltando suficientemente alto
-            if obstaculo.obstacle_type == 'hole':
-                # Los holes requieren salto obligatorio - no se pueden evitar por carriles
-                if esta_saltando and (y_final + recticulo_altura) < (obstaculo.y + obstaculo.height * 0.3):
-                    pass  # Salto exitoso sobre el hole
-                else:
-                    # Si no está saltando lo suficiente, verificar colisión con hole
-                    if rectangulo_carro.colliderect(rectangulo_obstaculo):
-                        colision_detectada = True
-            else:
-                # Lógica normal para otros obstáculos
-                if esta_saltando and (y_final + recticulo_altura) < (obstaculo.y + obstaculo.height * 0.4):
-                    pass  # Salto exitoso sobre obstáculo normal
-                else:
-                    if rectangulo_carro.colliderect(rectangulo_obstaculo):
-                        colision_detectada = True
-            
-            # Procesar resultado de la colisión
-            if colision_detectada:
-                estado_juego.agregar_obstaculo_golpeado(obstaculo, esta_saltando)
-            else:
-                # Si pasó el obstáculo sin chocar, contar como evitado
-                if (obstaculo.x < posicion_en_carretera and 
-                    obstaculo not in estado_juego.obstaculos_golpeados):
-                    estado_juego.contar_obstaculo_evitado()
-    
+            # Cada tipo dice cuánto hay que elevarse para saltarlo (los 'hole' piden
+            # más: no se pueden evitar por carriles, solo saltando suficientemente alto)
+            umbral = obstaculo.tipo.umbral_salto
+            if esta_saltando and (y_final + recticulo_altura) < (obstaculo.y + obstaculo.height * umbral):
+                continue  # Salto exitoso sobre el obstáculo
+            if rectangulo_carro.colliderect(rectangulo_obstaculo):
+                golpeados.append(obstaculo)
+        return golpeados
+
+    @staticmethod
+    def empaquetar(obstaculos):
+        """Columnas (x, y, ancho, alto, umbral de salto) de una lista de obstáculos"""
+        n = len(obstaculos)
+        x = np.fromiter((o.x for o in obstaculos), dtype=np.float64, count=n)
+        y = np.fromiter((o.y for o in obstaculos), dtype=np.float64, count=n)
+        tipos = [o.tipo for o in obstaculos]
+        ancho = np.fromiter((t.width for t in tipos), dtype=np.float64, count=n)
+        alto = np.fromiter((t.height for t in tipos), dtype=np.float64, count=n)
+        umbral = np.fromiter((t.umbral_salto for t in tipos), dtype=np.float64, count=n)
+        return x, y, ancho, alto, umbral
+
+    @staticmethod
+    def colisiones_en_lote(carro_x, y_final, posicion_en_carretera, esta_saltando, x, y, ancho, alto, umbral,
+                           recorrido=0):
+        """Índices de los obstáculos golpeados, en una sola pasada vectorizada.
+
+        Reproduce _golpeados_uno_por_uno: pygame.Rect trunca sus
+        coordenadas hacia cero, colliderect pide solape estricto y descarta
+        rectángulos sin área, y la prueba del salto usa los valores sin
+        truncar. `recorrido` estira el carro hacia atrás como en la ruta
+        uno por uno.
+        """
+        x_pantalla = np.trunc(x - posicion_en_carretera + carro_x)
+        oy = np.trunc(y)
+        ow = np.trunc(ancho)
+        oh = np.trunc(alto)
+        cx = int(carro_x - recorrido)
+        cw = int(ANCHO_CARRO + recorrido)
+        cy = int(y_final)
+        choca = ((ow != 0) & (oh != 0)
+                 & (cx < x_pantalla + ow) & (x_pantalla < cx + cw)
+                 & (cy < oy + oh) & (oy < cy + ALTO_CARRO))
+        if esta_saltando:
+            choca &= ~((y_final + ALTO_CARRO) < (y + alto * umbral))
+        return np.flatnonzero(choca)
+
     def hay_colision(self, rect1, rect2):
         """Verifica si dos rectángulos colisionan"""
         return rect1.colliderect(rect2)
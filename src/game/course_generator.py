@@ -0,0 +1,108 @@
+"""
+Curso procedural por chunks para el modo infinito.
+
+La carretera se parte en chunks de largo fijo. Cada chunk se genera con
+su propio random.Random sembrado con (semilla, índice), así que un chunk
+sale igual sin importar en qué orden ni cuántas veces se pida: la misma
+semilla da siempre el mismo curso.
+
+CourseStreamer solo genera los chunks que tocan la ventana visible del
+gestor por delante del carro (el resto de la pantalla más
+FRAMES_ANTICIPACION frames de recorrido, ver
+ObstacleManager.configurar_ventana) y no guarda los obstáculos: una vez
+en el índice, la poda normal del gestor (eliminar_obstaculos_pasados)
+los saca cuando quedan atrás. Así la memoria depende del ancho de esa
+ventana y no de cuánto se maneje.
+"""
+import random
+
+from utils.constants import LARGO_CHUNK, SEPARACION_MIN, SEPARACION_MAX, ANCHO_MAX_OBSTACULO
+
+TIPOS_OBSTACULOS = ("rock", "tree", "pothole", "hole")
+CARRILES_Y = (225, 325)
+
+
+class CourseGenerator:
+    """Genera los datos de cada chunk de forma determinista a partir de una semilla"""
+
+    def __init__(self, semilla=0, largo_chunk=LARGO_CHUNK, inicio=0,
+                 separacion_min=SEPARACION_MIN, separacion_max=SEPARACION_MAX):
+        self.semilla = semilla
+        self.largo_chunk = largo_chunk
+        self.inicio = inicio  # X donde empieza el chunk 0
+        self.separacion_min = separacion_min
+        self.separacion_max = separacion_max
+
+    def inicio_chunk(self, indice):
+        """X donde empieza el chunk `indice`"""
+        return self.inicio + indice * self.largo_chunk
+
+    def chunk_de(self, x):
+        """Índice del chunk que contiene la posición x"""
+        return int((x - self.inicio) // self.largo_chunk)
+
+    def datos_chunk(self, indice):
+        """Obstáculos del chunk como dicts {'x', 'y', 'type'} (mismo formato que el JSON).
+
+        Se deja media separación mínima libre en cada borde para que dos
+        chunks vecinos tampoco pongan obstáculos demasiado juntos.
+        """
+        rnd = random.Random(f"{self.semilla}:{indice}")
+        margen = self.separacion_min // 2
+        x = self.inicio_chunk(indice) + margen
+        x_tope = self.inicio_chunk(indice + 1) - margen - ANCHO_MAX_OBSTACULO
+        datos = []
+        while x <= x_tope:
+            tipo = rnd.choice(TIPOS_OBSTACULOS)
+            # Los holes ocupan ambos carriles y empiezan en el superior
+            y = 225 if tipo == 'hole' else rnd.choice(CARRILES_Y)
+            datos.append({'x': x, 'y': y, 'type': tipo})
+            x += rnd.randint(self.separacion_min, self.separacion_max)
+        return datos
+
+
+class CourseStreamer:
+    """Mantiene cargados los chunks que están por delante del carro.
+
+    `generador` es cualquier fuente de chunks con inicio_chunk, chunk_de y
+    datos_chunk: un CourseGenerator o un curso binario (utils.course_file).
+    Sin `distancia_adelante` se usa la de la ventana visible del gestor.
+    """
+
+    def __init__(self, gestor_obstaculos, generador, distancia_adelante=None):
+        self.gestor_obstaculos = gestor_obstaculos
+        self.generador = generador
+        if distancia_adelante is None:
+            distancia_adelante = gestor_obstaculos.distancia_adelante
+        self.distancia_adelante = distancia_adelante
+        self.siguiente_chunk = 0  # Primer chunk que todavía no se cargó
+
+    def actualizar(self, posicion_carro, velocidad=0):
+        """Carga en un solo lote los chunks que entraron en la distancia de generación.
+
+        Devuelve cuántos obstáculos se agregaron. La velocidad solo la usa
+        la precarga en segundo plano (game.course_prefetcher).
+        """
+        limite = posicion_carro + self.distancia_adelante
+        # Los chunks que ya quedaron atrás del carro (p. ej. tras un salto grande) no se generan
+        atrasado = self.generador.chunk_de(posicion_carro) - 1
+        if self.siguiente_chunk < atrasado:
+            self.siguiente_chunk = atrasado
+        lote = []
+        while self.generador.inicio_chunk(self.siguiente_chunk) <= limite:
+            for datos in self.generador.datos_chunk(self.siguiente_chunk):
+                lote.append(self.gestor_obstaculos.crear_obstaculo(datos['x'], datos['y'], datos['type']))
+            self.siguiente_chunk += 1
+        if lote:
+            self.gestor_obstaculos.add_batch(lote)
+        return len(lote)
+
+    def reiniciar(self):
+        """Vuelve al chunk 0; con la misma semilla se regenera el mismo curso"""
+        self.siguiente_chunk = 0
+
+    def detener(self):
+        """Cierra la fuente si tiene algo que liberar (el mmap de un curso binario)"""
+        cerrar = getattr(self.generador, 'cerrar', None)
+        if cerrar is not None:
+            cerrar()
@@ -0,0 +1,129 @@
+"""
+Precarga de chunks del curso en un hilo aparte.
+
+Con CourseStreamer el hilo del juego decodifica el chunk y construye sus
+Obstacle en el mismo frame en que el chunk entra en la distancia de
+generación; con chunks densos eso se nota como un tirón. CoursePrefetcher
+mueve ese trabajo a un hilo: con la velocidad y la posición del carro
+calcula qué chunks se van a necesitar en los próximos FRAMES_PRECARGA
+frames y se los pide al hilo, que deja los lotes ya construidos en una
+deque. append y popleft de una deque son atómicos, así que la entrega no
+usa locks; al hilo del juego solo le queda insertar el lote en el gestor.
+"""
+import threading
+import time
+from collections import deque
+
+from game.course_generator import CourseStreamer
+from utils.constants import FRAMES_PRECARGA
+
+
+class CoursePrefetcher(CourseStreamer):
+    """CourseStreamer que recibe los chunks ya construidos desde un hilo de precarga.
+
+    Si un chunk hace falta y el hilo todavía no lo entregó, se construye en
+    el hilo del juego como en CourseStreamer (cuenta en chunks_sincronos).
+    Al reiniciar se cambia de época y los lotes de la época anterior que
+    queden en la cola se descartan.
+    """
+
+    OBSTACULOS_POR_TURNO = 16
+
+    def __init__(self, gestor_obstaculos, generador, distancia_adelante=None,
+                 frames_precarga=FRAMES_PRECARGA):
+        super().__init__(gestor_obstaculos, generador, distancia_adelante)
+        self.frames_precarga = frames_precarga
+        self.chunks_precargados = 0   # Chunks que llegaron listos desde el hilo
+        self.chunks_sincronos = 0     # Chunks que hubo que construir en el hilo del juego
+        self._listos = deque()        # (época, índice, obstáculos) en orden de índice
+        self._epoca = 0
+        self._objetivo = 0            # El hilo construye los chunks menores que este índice
+        self._detenido = False
+        self._hay_trabajo = threading.Event()
+        # Construir Obstacle no toca pygame: los sprites son del tipo y se
+        # cargan en el primer dibujo, en el hilo del juego
+        self._hilo = threading.Thread(target=self._trabajar, name='precarga-curso', daemon=True)
+        self._hilo.start()
+
+    def _construir_chunk(self, indice, ceder=False):
+        """Obstacle del chunk; con `ceder` suelta el GIL cada OBSTACULOS_POR_TURNO obstáculos"""
+        obstaculos = []
+        crear = self.gestor_obstaculos.crear_obstaculo
+        for datos in self.generador.datos_chunk(indice):
+            obstaculos.append(crear(datos['x'], datos['y'], datos['type']))
+            if ceder and len(obstaculos) % self.OBSTACULOS_POR_TURNO == 0:
+                time.sleep(0)  # Si el hilo del juego espera el GIL, que no espere un intervalo entero
+        return obstaculos
+
+    def _trabajar(self):
+        """Bucle del hilo de precarga: construye chunks hasta `_objetivo` y espera más pedidos"""
+        epoca = None
+        producido = 0
+        while True:
+            self._hay_trabajo.wait()
+            self._hay_trabajo.clear()
+            if self._detenido:
+                return
+            if epoca != self._epoca:
+                epoca = self._epoca
+                producido = 0
+            # Lo que el juego ya cargó por su cuenta no hace falta construirlo
+            producido = max(producido, self.siguiente_chunk)
+            while producido < self._objetivo and epoca == self._epoca and not self._detenido:
+                self._listos.append((epoca, producido, self._construir_chunk(producido, ceder=True)))
+                producido += 1
+
+    def _tomar_listo(self, indice):
+        """Saca de la cola el lote del chunk `indice` si ya está; descarta los viejos"""
+        listos = self._listos
+        while listos:
+            epoca, indice_listo, obstaculos = listos[0]
+            if epoca != self._epoca or indice_listo < indice:
+                listos.popleft()
+            elif indice_listo == indice:
+                listos.popleft()
+                return obstaculos
+            else:
+                return None
+        return None
+
+    def actualizar(self, posicion_carro, velocidad=0):
+        """Pide al hilo los chunks de los próximos frames y carga los que ya hacen falta"""
+        generador = self.generador
+        limite = posicion_carro + self.distancia_adelante
+        atrasado = generador.chunk_de(posicion_carro) - 1
+        if self.siguiente_chunk < atrasado:
+            self.siguiente_chunk = atrasado
+        # Predicción: a esta velocidad, dentro de frames_precarga frames el
+        # límite de generación habrá avanzado velocidad * frames_precarga
+        objetivo = generador.chunk_de(limite + velocidad * self.frames_precarga) + 1
+        if objetivo > self._objetivo:
+            self._objetivo = objetivo
+            self._hay_trabajo.set()
+        lote = []
+        while generador.inicio_chunk(self.siguiente_chunk) <= limite:
+            obstaculos = self._tomar_listo(self.siguiente_chunk)
+            if obstaculos is None:
+                obstaculos = self._construir_chunk(self.siguiente_chunk)  # El hilo va atrasado
+                self.chunks_sincronos += 1
+            else:
+                self.chunks_precargados += 1
+            lote.extend(obstaculos)
+            self.siguiente_chunk += 1
+        if lote:
+            self.gestor_obstaculos.add_batch(lote)
+        return len(lote)
+
+    def reiniciar(self):
+        """Vuelve al chunk 0 en una época nueva; el hilo empieza de cero"""
+        self._epoca += 1
+        self._objetivo = 0
+        self._listos.clear()
+        super().reiniciar()
+
+    def detener(self):
+        """Termina el hilo de precarga y después cierra la fuente (el hilo ya no la lee)"""
+        self._detenido = True
+        self._hay_trabajo.set()
+        self._hilo.join()
+        super().detener()
@@ -3,6 +3,12 @@ from .input_manager import InputManager
 from .game_state import GameState
 from .collision_detector import CollisionDetector
 from .game_renderer import GameRenderer
+from .course_generator import CourseGenerator, CourseStreamer
+from .course_prefetcher import CoursePrefetcher
+from utils.course_file import CourseFile
+from utils.event_bus import emitir, INFO, AVISO, CURSO, VALIDACION, POOL
+from utils.constants import ANCHO_CARRO, ANCHO_MAX_OBSTACULO, LARGO_CHUNK, SEPARACION_MIN
+from data_structures.avl_validation import validar_arbol
 import time
 
 class GameEngineModular:
@@ -28,10 +34,37 @@ class GameEngineModular:
         # Posición del carrito
         self.carro_x = 50  # Posición fija en pantalla El carrito siempre arranca en el borde izquierdo
         self.carro_y = self.game_renderer.obtener_posicion_carril_superior()
+        # La ventana de obstáculos visibles depende de la pantalla y la velocidad
+        self.gestor_obstaculos.configurar_ventana(
+            ventana.width, self.estado_juego.velocidad_carro, self.carro_x
+        )
         
         # Meta del juego
         self.distancia_meta = configuracion.get('meta_distance', 10000)  # Distancia para ganar (valor predeterminado)
         self.victoria = False  # Nuevo estado para indicar que se ha ganado el juego
+        
+        # Modo infinito: sin meta, el curso se genera por chunks delante del carro
+        self.modo_infinito = configuracion.get('endless_mode', False)
+        self.streamer_curso = None
+        fuente_curso = None
+        if configuracion.get('course_file'):
+            # Curso binario: se lee por chunks con mmap en vez de cargarlo entero
+            fuente_curso = CourseFile(configuracion['course_file'])
+            emitir(CURSO, INFO, ruta=fuente_curso.ruta, obstaculos=len(fuente_curso),
+                   chunks=fuente_curso.num_chunks)
+        elif self.modo_infinito:
+            # Los chunks empiezan después del último obstáculo del curso del JSON
+            fin_curso = max((o['x'] for o in configuracion.get('obstacles', [])), default=0)
+            fuente_curso = CourseGenerator(
+                semilla=configuracion.get('course_seed', 0),
+                largo_chunk=configuracion.get('chunk_length', LARGO_CHUNK),
+                inicio=fin_curso + ANCHO_MAX_OBSTACULO + SEPARACION_MIN
+            )
+        if fuente_curso is not None:
+            # Con precarga los chunks se construyen en otro hilo antes de necesitarlos.
+            # Los dos generan hasta el borde de la ventana visible configurada arriba
+            clase_streamer = CoursePrefetcher if configuracion.get('course_prefetch', False) else CourseStreamer
+            self.streamer_curso = clase_streamer(gestor_obstaculos, fuente_curso)
     
     def actualizar(self):
         """Actualiza la lógica del juego - versión simplificada"""
@@ -63,22 +96,21 @@ class GameEngineModular:
         
         # AGREGAR OBSTÁCULOS FUNCIONA INCLUSO EN PAUSA
         if self.input_manager.quiere_agregar_obstaculo():
+            # El gestor publica el evento 'spawn'
             self.gestor_obstaculos.crear_obstaculo_aleatorio(self.estado_juego.posicion_en_carretera)
-            estado_texto = "PAUSADO" if self.estado_juego.juego_pausado else "ACTIVO"
-            print(f"Obstáculo agregado mientras el juego está {estado_texto}")
 
         # DEBUG Y VERIFICACIÓN FUNCIONAN SIEMPRE
         if self.input_manager.quiere_verificar_balance():
             self.verificar_balance_avl()
 
         if self.input_manager.quiere_debug():
-            # Contar nodos
-            def _contar(n):
-                if not n: return 0
-                return 1 + _contar(n.left) + _contar(n.right)
-            total = _contar(self.gestor_obstaculos.arbol.root)
+            # Conteos O(1): el árbol mantiene tamaños por subárbol
+            arbol = self.gestor_obstaculos.arbol
+            total = arbol.contar_nodos()
             estado_texto = "PAUSADO" if self.estado_juego.juego_pausado else "ACTIVO"
-            print(f"[DEBUG] Juego {estado_texto} - AVL activo={self.modo_avl_en_vivo} nodos={total}")
+            print(f"[DEBUG] Juego {estado_texto} - AVL activo={self.modo_avl_en_vivo} "
+                  f"nodos={total} obstaculos={len(arbol)}")
+            emitir(POOL, INFO, **self.gestor_obstaculos.pool.contadores())
         
         # Controles de juego (solo si el juego está ACTIVO)
         if self.estado_juego.esta_activo():
@@ -98,7 +130,7 @@ class GameEngineModular:
         self.estado_juego.actualizar_movimiento()
         
         # Verificar si se alcanzó la meta
-        if self.estado_juego.posicion_en_carretera >= self.distancia_meta:
+        if not self.modo_infinito and self.estado_juego.posicion_en_carretera >= self.distancia_meta:
             self.victoria = True
             self.estado_juego.juego_pausado = True  # Pausar el juego al ganar
             return
@@ -110,17 +142,30 @@ class GameEngineModular:
         self.desplazamiento_vertical_actual = self.carro.actualizar_salto(dt, self.carro_y)
         self.estado_juego.altura_actual_salto = -self.desplazamiento_vertical_actual
 
+        # Generar los chunks que entraron en la distancia de generación
+        if self.streamer_curso is not None:
+            self.streamer_curso.actualizar(self.estado_juego.posicion_en_carretera,
+                                           self.estado_juego.velocidad_carro)
+        
         # Obtener obstáculos visibles
         obstaculos_visibles = self.gestor_obstaculos.obtener_obstaculos_visibles(
             self.estado_juego.posicion_en_carretera
         )
         
+        # Solo pueden chocar los obstáculos que se cruzan con la huella que barrió
+        # el carro en este frame: a velocidad alta no se salta ninguno
+        posicion = self.estado_juego.posicion_en_carretera
+        posicion_anterior = self.estado_juego.posicion_anterior
+        candidatos = self.gestor_obstaculos.obtener_obstaculos_en_tramo(posicion_anterior, posicion + ANCHO_CARRO)
+        
         # Verificar colisiones
         self.collision_detector.verificar_colisiones(
             self.carro_x, self.carro_y, obstaculos_visibles,
             self.estado_juego.posicion_en_carretera, self.estado_juego,
             desplazamiento_vertical=self.desplazamiento_vertical_actual,
-            esta_saltando=self.carro.esta_saltando
+            esta_saltando=self.carro.esta_saltando,
+            candidatos=candidatos,
+            posicion_anterior=posicion_anterior
         )
         
         # Limpiar obstáculos pasados
@@ -150,6 +195,14 @@ class GameEngineModular:
     
     def dibujar_info_meta(self):
         """Muestra información sobre la meta y el progreso"""
+        if self.modo_infinito:
+            # Sin meta: solo la distancia recorrida
+            fuente = pygame.font.Font(None, 24)
+            texto = fuente.render(f"Distancia: {self.estado_juego.posicion_en_carretera:.0f} m",
+                                  True, (255, 255, 255))
+            self.ventana.screen.blit(texto, texto.get_rect(topright=(self.ventana.width - 20, 20)))
+            return
+        
         progreso = min(self.estado_juego.posicion_en_carretera / self.distancia_meta, 1.0)
         porcentaje = int(progreso * 100)
         
@@ -240,6 +293,8 @@ class GameEngineModular:
         
         # Reiniciar obstáculos
         self.gestor_obstaculos.reiniciar_obstaculos()
+        if self.streamer_curso is not None:
+            self.streamer_curso.reiniciar()
         
         # Reiniciar estado de victoria
         self.victoria = False
@@ -263,6 +318,9 @@ class GameEngineModular:
             # Mantener 60 FPS
             # Pa' que corra a 60 FPS, ni muy rápido ni muy lento
             reloj.tick(60)
+        
+        if self.streamer_curso is not None:
+            self.streamer_curso.detener()
 
     # Nada que cerrar ahora que el overlay es interno
 
@@ -270,21 +328,21 @@ class GameEngineModular:
     # (El código de hilos para matplotlib fue removido; ahora el árbol se dibuja en overlay)
 
     def verificar_balance_avl(self):
-        raiz = self.gestor_obstaculos.arbol.root
-        if not raiz:
-            print("AVL vacío")
-            return
-        desbalance = []
-        def dfs(n):
-            if not n: return 0
-            hl = dfs(n.left)
-            hr = dfs(n.right)
-            bal = hl - hr
-            if abs(bal) > 1:
-                desbalance.append((getattr(n,'x_position',None), bal))
-            return max(hl, hr) + 1
-        dfs(raiz)
-        if desbalance:
-            print("Nodos desbalanceados:", desbalance)
-        else:
-            print("AVL OK")
+        """Valida el árbol completo (iterativo, sin límite de recursión) y devuelve el resultado.
+
+        El resultado y los contadores del árbol se publican como evento
+        'avl_checked'; con un índice sin árbol se devuelve None.
+        """
+        arbol = self.gestor_obstaculos.arbol
+        backend = self.gestor_obstaculos.backend
+        if arbol.root is None:
+            emitir(VALIDACION, INFO, backend=backend, obstaculos=len(arbol), resumen=None)
+            return None
+        resultado = validar_arbol(arbol.root)
+        contadores = getattr(arbol, 'contadores', None)
+        emitir(VALIDACION, INFO if resultado.ok else AVISO, backend=backend, obstaculos=len(arbol),
+               resumen=resultado.resumen(), ok=resultado.ok, modo=resultado.modo,
+               nodos=resultado.nodos_revisados, altura=resultado.altura,
+               violaciones=[repr(v) for v in resultado.violaciones],
+               contadores=contadores.como_dict() if contadores is not None else None)
+        return resultado
@@ -2,6 +2,8 @@ import pygame
 from .road_renderer import RoadRenderer
 from .ui_renderer import UIRenderer
 from .avl_overlay_renderer import AVLMiniRenderer
+from .layer_cache import LayerCache
+from utils.event_bus import emitir, DEBUG, ERROR, OVERLAY, FALLO
 
 class GameRenderer:
     """Clase que coordina todo el renderizado del juego"""
@@ -9,23 +11,22 @@ class GameRenderer:
     def __init__(self, ventana):
         self.ventana = ventana
         self.road_renderer = RoadRenderer(ventana.width, ventana.height)
-        self.ui_renderer = UIRenderer(ventana.width, ventana.height)
+        # Capas estáticas compartidas; se rehacen solo si cambia el tamaño de la ventana o el tema
+        self.capas = LayerCache()
+        self.ui_renderer = UIRenderer(ventana.width, ventana.height, capas=self.capas)
         self.avl_overlay = AVLMiniRenderer(ventana.width, ventana.height)
     
     def dibujar_todo(self, estado_juego, carro, carro_x, carro_y, obstaculos_visibles, posicion_en_carretera, gestor_obstaculos, mostrar_avl=False):
         """Dibuja todos los elementos del juego"""
-        # Fondo cielo degradado
+        # Fondo fijo (cielo degradado y carretera sin textura) desde la caché de capas
         screen = self.ventana.screen
-        import pygame
-        for y in range(self.ventana.height):
-            t = y / self.ventana.height
-            r = int(30 + 40 * t)
-            g = int(120 + 80 * t)
-            b = int(200 + 40 * t)
-            pygame.draw.line(screen, (r,g,b), (0,y), (self.ventana.width,y))
+        tamano = screen.get_size()
+        self.capas.validar(tamano)
+        screen.blit(self.capas.capa('fondo', tamano, self._dibujar_fondo, alfa=False), (0, 0))
     
-        # Dibujar carretera
-        self.road_renderer.dibujar_carretera(self.ventana.screen, posicion_en_carretera)
+        # Dibujar las partes móviles de la carretera
+        self.road_renderer.dibujar_textura(screen, posicion_en_carretera)
+        self.road_renderer.dibujar_linea_central(screen, posicion_en_carretera)
     
         # Dibujar carro (si tiene sprite usarlo)
         if hasattr(carro, 'render') and getattr(carro, 'sprite', None) is not None:
@@ -59,22 +60,32 @@ class GameRenderer:
         # Overlay AVL (en tiempo real) si está activo
         if mostrar_avl:
             try:
-                arbol_root = gestor_obstaculos.arbol.root
-                # Debug: contar nodos
-                def _contar(n):
-                    if not n: return 0
-                    return 1 + _contar(n.left) + _contar(n.right)
-                total = _contar(arbol_root)
-                # Solo imprimir ocasionalmente (puntuacion divisible por 60)
+                arbol = gestor_obstaculos.arbol
+                # Solo avisar ocasionalmente (cada 120 frames)
                 if estado_juego.contador_frames % 120 == 0:
-                    print(f"[AVL Overlay] Dibujando {total} nodos")
-                self.avl_overlay.dibujar(self.ventana.screen, arbol_root)
+                    emitir(OVERLAY, DEBUG, nodos=arbol.contar_nodos())
+                self.avl_overlay.dibujar(self.ventana.screen, arbol.root, version=arbol.version,
+                                         total_nodos=arbol.contar_nodos())
             except Exception as e:
                 # Evitar que falle el juego por error de overlay
-                print("Error dibujando overlay AVL:", e)
+                emitir(FALLO, ERROR, donde='overlay AVL', error=repr(e))
 
         self.ventana.update()
     
+    def _dibujar_fondo(self, fondo):
+        """Cielo degradado (una línea por fila) y fondo de la carretera"""
+        for y in range(self.ventana.height):
+            t = y / self.ventana.height
+            r = int(30 + 40 * t)
+            g = int(120 + 80 * t)
+            b = int(200 + 40 * t)
+            pygame.draw.line(fondo, (r,g,b), (0,y), (self.ventana.width,y))
+        self.road_renderer.dibujar_fondo(fondo)
+    
+    def invalidar_capas(self):
+        """Fuerza a redibujar las capas fijas (por ejemplo tras cambiar colores del tema)"""
+        self.capas.invalidar()
+    
     def dibujar_carro(self, carro_x, carro_y):
         """Dibuja el carro del jugador"""
         rectangulo_carro = pygame.Rect(carro_x, carro_y, 50, 50)
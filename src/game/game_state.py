@@ -1,3 +1,12 @@
+import itertools
+
+from game.obstacle import GOLPEADO, PASADO, BITS_BANDERAS
+from utils.event_bus import emitir, INFO, COLISION, REINICIO
+
+# Épocas de partida, únicas entre todos los GameState: una marca de otra
+# partida (o de antes de un reinicio) nunca se confunde con la actual
+_epocas = itertools.count(1)
+
 class GameState:
     """Clase que maneja todo el estado del juego (puntuación, energía, etc.)"""
     
@@ -12,6 +21,7 @@ class GameState:
         
         # Posición y movimiento
         self.posicion_en_carretera = 0
+        self.posicion_anterior = 0  # Posición al empezar el frame (tramo barrido por las colisiones)
         self.velocidad_carro = self.configuracion.get('car_speed', 3)
         
         # Estadísticas del jugador
@@ -19,7 +29,8 @@ class GameState:
         self.energia_maxima = self.energia
         self.puntuacion = 0
         self.obstaculos_evitados = 0
-        self.obstaculos_golpeados = set()
+        self.obstaculos_golpeados = 0
+        self.epoca = next(_epocas)
         
         # Control de tiempo
         self.contador_frames = 0
@@ -40,6 +51,7 @@ class GameState:
     def reiniciar(self):
         """Reinicia el estado del juego"""
         self.posicion_en_carretera = 0
+        self.posicion_anterior = 0
         self.contador_frames = 0
         self.mostrar_arbol = False
         self.juego_pausado = False
@@ -47,12 +59,14 @@ class GameState:
         self.energia = self.energia_maxima
         self.puntuacion = 0
         self.obstaculos_evitados = 0
-        self.obstaculos_golpeados = set()
+        self.obstaculos_golpeados = 0
+        self.epoca = next(_epocas)  # Las banderas de la partida anterior quedan sin efecto
         self.tiempo_inicio = None
-        print("Estado del juego reiniciado")
+        emitir(REINICIO, INFO, que='estado del juego')
     
     def actualizar_movimiento(self):
         """Actualiza la posición en la carretera"""
+        self.posicion_anterior = self.posicion_en_carretera
         if not self.juego_pausado and not self.juego_terminado:
             self.posicion_en_carretera += self.velocidad_carro
             self.puntuacion = int(self.posicion_en_carretera / 10)
@@ -64,16 +78,34 @@ class GameState:
             self.energia = 0
             self.juego_terminado = True
     
+    def banderas(self, obstaculo):
+        """Banderas (GOLPEADO, PASADO) del obstáculo en esta partida"""
+        marca = obstaculo.marca
+        if marca >> BITS_BANDERAS != self.epoca:
+            return 0
+        return marca & ((1 << BITS_BANDERAS) - 1)
+    
+    def _marcar(self, obstaculo, bandera):
+        obstaculo.marca = (self.epoca << BITS_BANDERAS) | self.banderas(obstaculo) | bandera
+    
     def agregar_obstaculo_golpeado(self, obstaculo, esta_saltando=False):
-        """Registra un obstáculo como golpeado"""
-        if obstaculo not in self.obstaculos_golpeados:
-            self.obstaculos_golpeados.add(obstaculo)
+        """Registra un obstáculo como golpeado (una sola vez por partida)"""
+        if not self.banderas(obstaculo) & GOLPEADO:
+            self._marcar(obstaculo, GOLPEADO)
+            self.obstaculos_golpeados += 1
             # Solo reducir energía si no está saltando
             if not esta_saltando:
                 self.reducir_energia()
-                print(f"¡Colisión con {obstaculo.obstacle_type}! Energía: {self.energia}")
-            else:
-                print(f"¡Colisión durante salto con {obstaculo.obstacle_type}! Sin pérdida de energía. Energía: {self.energia}")
+            emitir(COLISION, INFO, obstaculo=obstaculo.obstacle_type, x=obstaculo.x,
+                   energia=self.energia, saltando=esta_saltando)
+    
+    def marcar_obstaculo_pasado(self, obstaculo):
+        """Registra que el carro dejó atrás el obstáculo; si no lo golpeó cuenta como evitado"""
+        banderas = self.banderas(obstaculo)
+        if not banderas & PASADO:
+            self._marcar(obstaculo, PASADO)
+            if not banderas & GOLPEADO:
+                self.contar_obstaculo_evitado()
     
     def contar_obstaculo_evitado(self):
         """Aumenta el contador de obstáculos evitados"""
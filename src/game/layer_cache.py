@@ -0,0 +1,54 @@
+import pygame
+
+
+class LayerCache:
+    """Capas estáticas pre-renderizadas (cielo, fondo de la carretera, paneles, marcos).
+
+    Cada capa se dibuja una sola vez con su función `dibujar` y después solo
+    se copia con blit. Todas se descartan juntas cuando cambia el tamaño de
+    la ventana (validar) o el tema (invalidar).
+    """
+
+    def __init__(self):
+        self._capas = {}
+        self.tamano = None
+        self.construidas = 0  # Capas dibujadas desde el inicio (para medir invalidaciones)
+
+    def __len__(self):
+        return len(self._capas)
+
+    def validar(self, tamano):
+        """Descarta las capas si la ventana cambió de tamaño"""
+        if tamano != self.tamano:
+            self.invalidar()
+            self.tamano = tamano
+
+    def invalidar(self):
+        """Descarta todas las capas (por ejemplo al cambiar de tema)"""
+        self._capas.clear()
+
+    def obtener(self, nombre, construir):
+        """Contenido de la capa `nombre` (una superficie, una lista de textos...); la primera vez lo arma construir()"""
+        contenido = self._capas.get(nombre)
+        if contenido is None:
+            contenido = self._capas[nombre] = construir()
+            self.construidas += 1
+        return contenido
+
+    def capa(self, nombre, tamano, dibujar, alfa=True):
+        """Superficie de la capa `nombre`; la primera vez se crea y se le aplica dibujar(superficie).
+
+        Con `alfa` la superficie es por píxel (SRCALPHA, empieza transparente);
+        si no, es opaca y dibujar puede usar set_alpha para una transparencia
+        uniforme. Si ya hay ventana se convierte a su formato para que el
+        blit sea directo.
+        """
+        def construir():
+            superficie = pygame.Surface(tamano, pygame.SRCALPHA if alfa else 0)
+            if pygame.display.get_surface() is not None:
+                superficie = superficie.convert_alpha() if alfa else superficie.convert()
+            if alfa:
+                superficie.fill((0, 0, 0, 0))
+            dibujar(superficie)
+            return superficie
+        return self.obtener(nombre, construir)
@@ -1,26 +1,101 @@
 import pygame
 from utils.asset_loader import load_for_type
 
+
+class ObstacleType:
+    """Datos compartidos por todos los obstáculos de un tipo (flyweight).
+
+    Tamaño, sprite y ajustes de colisión viven aquí una sola vez por tipo;
+    cada Obstacle solo guarda su posición y una referencia a su tipo. El
+    sprite se carga la primera vez que se pide, así que crear obstáculos
+    no necesita pygame.
+    """
+    __slots__ = ('nombre', 'codigo', 'width', 'height', 'y_fija', 'umbral_salto', '_sprite')
+
+    def __init__(self, nombre, codigo, width, height, y_fija=None, umbral_salto=0.4):
+        self.nombre = nombre
+        self.codigo = codigo
+        self.width = width
+        self.height = height
+        self.y_fija = y_fija              # Si no es None, todos los de este tipo van en esta Y
+        self.umbral_salto = umbral_salto  # Fracción de la altura que hay que superar saltando
+        self._sprite = None
+
+    @property
+    def sprite(self):
+        if self._sprite is None:
+            self._sprite = load_for_type(self.nombre, size=(self.width, self.height))
+        return self._sprite
+
+    def __repr__(self):
+        return f"ObstacleType({self.nombre!r})"
+
+
+TIPOS_OBSTACULO = {}   # nombre -> ObstacleType
+TIPOS_POR_CODIGO = []  # codigo -> ObstacleType
+
+
+def registrar_tipo(nombre, width, height, y_fija=None, umbral_salto=0.4):
+    """Agrega un tipo a la tabla y lo devuelve"""
+    tipo = ObstacleType(nombre, len(TIPOS_POR_CODIGO), width, height, y_fija, umbral_salto)
+    TIPOS_OBSTACULO[nombre] = tipo
+    TIPOS_POR_CODIGO.append(tipo)
+    return tipo
+
+
+def tipo_obstaculo(nombre):
+    """Flyweight del tipo; los tipos desconocidos se registran con el tamaño por defecto"""
+    tipo = TIPOS_OBSTACULO.get(nombre)
+    if tipo is None:
+        tipo = registrar_tipo(nombre, 55, 55)
+    return tipo
+
+
+# Tamaños diferenciados
+registrar_tipo('rock', 60, 60)
+registrar_tipo('tree', 60, 80)
+registrar_tipo('pothole', 70, 40)
+# Hole ocupa ambos carriles - desde Y=225 hasta Y=325, y solo se evita saltando bien alto
+registrar_tipo('hole', 200, 100, y_fija=225, umbral_salto=0.3)
+
+# Banderas de partida de cada obstáculo (ver GameState): se guardan en
+# Obstacle.marca junto con la época de la partida que las puso
+GOLPEADO = 1
+PASADO = 2
+BITS_BANDERAS = 2
+
+
 class Obstacle:
+    """Un obstáculo del curso: posición, tipo y marca de partida; el resto se lee del flyweight"""
+    __slots__ = ('x', 'y', 'tipo', 'marca')
+
     def __init__(self, x, y, obstacle_type):
+        tipo = tipo_obstaculo(obstacle_type)
         self.x = x
-        self.y = y
-        self.obstacle_type = obstacle_type
-        # Tamaños diferenciados
-        if obstacle_type == 'tree':
-            self.width, self.height = 60, 80
-        elif obstacle_type == 'rock':
-            self.width, self.height = 60, 60
-        elif obstacle_type == 'pothole':
-            self.width, self.height = 70, 40
-        elif obstacle_type == 'hole':
-            # Hole ocupa ambos carriles - desde Y=225 hasta Y=325
-            self.width, self.height = 200, 100  # Altura de 100 para cubrir ambos carriles
-            # Posición Y fija para que empiece en el carril superior
-            self.y = 225  # Empieza en el carril superior y se extiende hasta el inferior
-        else:
-            self.width, self.height = 55, 55
-        self.sprite = load_for_type(obstacle_type, size=(self.width, self.height))
+        # Los tipos con Y fija (el hole empieza en el carril superior) ignoran la Y pedida
+        self.y = y if tipo.y_fija is None else tipo.y_fija
+        self.tipo = tipo
+        self.marca = 0  # Época << BITS_BANDERAS | banderas (0: sin tocar)
+
+    def reiniciar(self, x, y, obstacle_type):
+        """Reutiliza el objeto para otro obstáculo (ver ObstaclePool)"""
+        self.__init__(x, y, obstacle_type)
+
+    @property
+    def obstacle_type(self):
+        return self.tipo.nombre
+
+    @property
+    def width(self):
+        return self.tipo.width
+
+    @property
+    def height(self):
+        return self.tipo.height
+
+    @property
+    def sprite(self):
+        return self.tipo.sprite
 
     def update(self):
         # Si hubiese lógica de movimiento independiente, aquí se aplicaría
@@ -36,7 +111,8 @@ class Obstacle:
         if blink:
             return
         rect = custom_rect if custom_rect is not None else pygame.Rect(self.x, self.y, self.width, self.height)
-        if self.sprite:
-            screen.blit(self.sprite, rect)
+        sprite = self.tipo.sprite
+        if sprite:
+            screen.blit(sprite, rect)
         else:
-            pygame.draw.rect(screen, (255,0,0), rect)
\ No newline at end of file
+            pygame.draw.rect(screen, (255,0,0), rect)
@@ -1,52 +1,160 @@
-from data_structures.avl_tree import AVLTree
+from data_structures.obstacle_index import crear_indice
+from data_structures.window_cursor import WindowCursor
 from game.obstacle import Obstacle
+from game.obstacle_pool import ObstaclePool
+from utils.event_bus import obtener_bus, emitir, DEBUG, INFO, SPAWN, LOTE, ELIMINADO, REINICIO
+from utils.constants import (SCREEN_WIDTH, CAR_SPEED, CAR_SCREEN_X, ANCHO_MAX_OBSTACULO,
+                             MARGEN_RENDER, FRAMES_ANTICIPACION, TAMANO_POOL)
 import random
+import threading
 
 class ObstacleManager:
-    """Clase simple para manejar obstáculos usando un árbol AVL"""
+    """Clase simple para manejar obstáculos usando un árbol AVL.
+
+    El índice se puede cambiar (ver data_structures.obstacle_index): por
+    defecto es el AVL, pero para cursos estáticos conviene 'sorted_array'
+    o 'numpy'. El atributo se sigue llamando `arbol` por compatibilidad.
+
+    Con el índice 'concurrent' otros hilos pueden agregar o podar
+    obstáculos. La ventana visible es solo del hilo que creó el gestor:
+    los cambios hechos desde otros hilos no la tocan y ella se recarga
+    sola al ver otra versión del índice.
+
+    Los obstáculos podados vuelven a un ObstaclePool y los nuevos salen de
+    ahí (crear_obstaculo). Se devuelven al pool recién en la poda
+    siguiente, así quien recibe la lista de eliminados puede usarla durante
+    el frame. Con índices que tienen snapshot ('persistent_avl',
+    'concurrent') el pool no guarda nada: una versión vieja (un snapshot,
+    o lo que lee otro hilo) todavía contiene el obstáculo podado, y
+    reinicializarlo le cambiaría las claves por debajo.
+    """
     
-    def __init__(self):
-        self.arbol = AVLTree()
+    def __init__(self, backend='avl', tamano_pool=TAMANO_POOL):
+        self.backend = backend
+        self.arbol = crear_indice(backend)
+        self.pool = ObstaclePool(0 if hasattr(self.arbol, 'snapshot') else tamano_pool)
+        self._por_reciclar = ()  # Podados en la última poda; van al pool en la siguiente
+        self._hilo_juego = threading.get_ident()
         self.obstaculos_iniciales = []
+        self._curso_pristino = ()         # Obstáculos ya construidos del curso cargado
+        self._ids_pristinos = frozenset()  # Nunca van al pool: el reinicio los reutiliza
+        self._instantanea_inicial = None  # Snapshot del índice recién cargado (si es persistente)
+        self.cursor_visible = WindowCursor(self.arbol, 0, 0)
+        self.configurar_ventana(SCREEN_WIDTH, CAR_SPEED, CAR_SCREEN_X)
+    
+    def configurar_ventana(self, ancho_viewport, velocidad, carro_x=CAR_SCREEN_X):
+        """Calcula la ventana visible a partir del ancho de pantalla y la velocidad.
+
+        Atrás: lo que el carro todavía puede tocar o lo que sigue en pantalla a
+        su izquierda, más un frame de avance. Adelante: el resto de la pantalla
+        más FRAMES_ANTICIPACION frames de recorrido. Los streamers del curso
+        generan hasta esa misma distancia (distancia_adelante).
+        """
+        atras = max(carro_x + MARGEN_RENDER, ANCHO_MAX_OBSTACULO) + velocidad
+        adelante = ancho_viewport - carro_x + MARGEN_RENDER + velocidad * FRAMES_ANTICIPACION
+        self.cursor_visible.configurar(atras, adelante)
+        self.distancia_adelante = adelante
     
     def cargar_obstaculos_iniciales(self, lista_obstaculos):
-        """Carga los obstáculos desde la configuración JSON"""
+        """Carga los obstáculos desde la configuración JSON.
+
+        Los Obstacle construidos se guardan en una tupla inmutable para que
+        reiniciar_obstaculos los reutilice en vez de crearlos de nuevo.
+        """
         self.obstaculos_iniciales = lista_obstaculos.copy()
-        for datos_obstaculo in lista_obstaculos:
-            obstaculo = Obstacle(
+        self._curso_pristino = tuple(sorted(
+            (Obstacle(
                 x=datos_obstaculo['x'],
                 y=datos_obstaculo['y'], 
                 obstacle_type=datos_obstaculo['type']
             )
-            self.arbol.insertar_obstaculo(obstaculo)
+             for datos_obstaculo in lista_obstaculos),
+            key=lambda o: o.x
+        ))
+        self._ids_pristinos = frozenset(map(id, self._curso_pristino))
+        self._instantanea_inicial = None
+        if len(self.arbol) == 0:
+            # Índice vacío: carga masiva en O(n) en vez de n inserciones
+            self.arbol.build_from_sorted(self._curso_pristino)
+            if hasattr(self.arbol, 'snapshot'):
+                self._instantanea_inicial = self.arbol.snapshot()
+        else:
+            for obstaculo in self._curso_pristino:
+                self.arbol.insertar_obstaculo(obstaculo)
+        self.cursor_visible.reiniciar()
     
+    def _en_hilo_del_juego(self):
+        """True si se llama desde el hilo dueño de la ventana visible"""
+        return threading.get_ident() == self._hilo_juego
+
     def obtener_obstaculos_visibles(self, posicion_carro):
         """Obtiene los obstáculos que el jugador puede ver"""
-        x_minimo = posicion_carro - 200  # 200 píxeles atrás
-        x_maximo = posicion_carro + 1000  # 1000 píxeles adelante
-        return self.arbol.buscar_obstaculos_visibles(x_minimo, x_maximo)
+        return self.cursor_visible.actualizar(posicion_carro)
     
+    def obtener_obstaculos_en_tramo(self, x_ini, x_fin):
+        """Obstáculos cuyo ancho se cruza con el tramo (x_ini, x_fin) de la carretera"""
+        return self.arbol.buscar_solapados(x_ini, x_fin)
+
+    def crear_obstaculo(self, x, y, tipo):
+        """Obstacle nuevo o reciclado del pool, todavía sin agregar al índice"""
+        return self.pool.obtener(x, y, tipo)
+
     def agregar_obstaculo_nuevo(self, x, y, tipo):
         """Agrega un nuevo obstáculo al árbol"""
-        nuevo_obstaculo = Obstacle(x=x, y=y, obstacle_type=tipo)
+        nuevo_obstaculo = self.pool.obtener(x, y, tipo)
+        version = self.arbol.version
         self.arbol.insertar_obstaculo(nuevo_obstaculo)
-        print(f"Obstáculo agregado en posición ({x}, {y}) de tipo {tipo}")
+        if self._en_hilo_del_juego():
+            self.cursor_visible.notificar_insercion(nuevo_obstaculo, version)
+        emitir(SPAWN, INFO, x=x, y=y, obstaculo=tipo)
     
+    def add_batch(self, obstaculos):
+        """Agrega un lote de obstáculos (oleadas, eventos) con una sola fusión en el índice"""
+        # Se ordena una sola vez acá; el índice recibe el lote ya ordenado
+        lote = sorted(obstaculos, key=lambda o: o.x)
+        if not lote:
+            return
+        version = self.arbol.version
+        self.arbol.insert_many(lote, ordenado=True)
+        if self._en_hilo_del_juego():
+            self.cursor_visible.notificar_insercion_lote(lote, version)
+        emitir(LOTE, INFO, cantidad=len(lote), x_min=lote[0].x, x_max=lote[-1].x)
+
     def eliminar_obstaculos_pasados(self, posicion_carro):
         """Elimina obstáculos que ya pasó el jugador para ahorrar memoria"""
         limite_eliminar = posicion_carro - 300
-        obstaculos_todos = self.arbol.obtener_lista_ordenada()
-        
-        for obstaculo in obstaculos_todos:
-            if obstaculo.x < limite_eliminar:
-                self.arbol.eliminar_obstaculo(obstaculo.x)
-                print(f"Obstáculo eliminado en posición {obstaculo.x}")
+        # Un solo corte del árbol: el costo no depende del tamaño del curso
+        version = self.arbol.version
+        eliminados = self.arbol.prune_less_than(limite_eliminar)
+        # Una poda vacía no cambió el árbol: no hay nada que avisar (y un
+        # aviso podría tapar una escritura de otro hilo)
+        if eliminados and self._en_hilo_del_juego():
+            self.cursor_visible.notificar_eliminacion(eliminados, version)
+        bus = obtener_bus()
+        if eliminados and bus.activo(DEBUG):
+            for obstaculo in eliminados:
+                bus.emitir(ELIMINADO, DEBUG, x=obstaculo.x, obstaculo=obstaculo.obstacle_type)
+        # Los podados de la poda anterior ya no los mira nadie: se reciclan,
+        # salvo los del curso prístino y objetos ajenos
+        if self._por_reciclar:
+            self.pool.devolver(o for o in self._por_reciclar
+                               if type(o) is Obstacle and id(o) not in self._ids_pristinos)
+        self._por_reciclar = eliminados if self.pool.capacidad else ()
+        return eliminados
     
     def reiniciar_obstaculos(self):
-        """Vuelve a cargar los obstáculos iniciales"""
-        self.arbol.limpiar_arbol()
-        self.cargar_obstaculos_iniciales(self.obstaculos_iniciales)
-        print("Obstáculos reiniciados")
+        """Vuelve al curso inicial reutilizando los obstáculos ya construidos.
+
+        Con un índice persistente se restaura el snapshot tomado al cargar
+        (O(1)); con los demás se rearma el índice desde la tupla prístina
+        en O(n), sin crear Obstacle ni buscar sprites otra vez.
+        """
+        if self._instantanea_inicial is not None:
+            self.arbol.restaurar(self._instantanea_inicial)
+        else:
+            self.arbol.build_from_sorted(self._curso_pristino)
+        self.cursor_visible.reiniciar()
+        emitir(REINICIO, INFO, que='obstáculos')
     
     def crear_obstaculo_aleatorio(self, posicion_carro):
         """Crea un obstáculo aleatorio adelante del carro"""
@@ -0,0 +1,56 @@
+from game.obstacle import Obstacle
+from utils.constants import TAMANO_POOL
+
+
+class ObstaclePool:
+    """Lista libre de Obstacle para reutilizar los que ya se podaron.
+
+    obtener saca uno de la lista y lo reinicializa en el lugar (acierto) o
+    crea uno nuevo (fallo); devolver guarda los podados hasta `capacidad`
+    y suelta el resto. Así una partida larga crea obstáculos casi solo al
+    principio; el GC recolecta menos cuando llegan muchos de golpe (ver
+    benchmarks/bench_obstacle_pool.py).
+
+    Solo se devuelven Obstacle que nadie más va a mirar: el gestor no
+    devuelve los del curso prístino (el reinicio los reutiliza).
+    list.append y list.pop son atómicos, así que el hilo de precarga puede
+    pedir obstáculos mientras el del juego devuelve; con varios hilos los
+    contadores pueden perder alguna cuenta.
+    """
+
+    def __init__(self, capacidad=TAMANO_POOL):
+        self.capacidad = capacidad
+        self._libres = []
+        self.aciertos = 0        # Obstáculos reutilizados
+        self.fallos = 0          # Obstáculos que hubo que crear
+        self.descartados = 0     # Devueltos con la lista llena (quedan para el GC)
+        self.maximo_libres = 0   # Marca de agua alta de la lista libre
+
+    def __len__(self):
+        return len(self._libres)
+
+    def obtener(self, x, y, obstacle_type):
+        """Un Obstacle en (x, y) del tipo pedido, reutilizado si hay alguno libre"""
+        try:
+            obstaculo = self._libres.pop()
+        except IndexError:
+            self.fallos += 1
+            return Obstacle(x, y, obstacle_type)
+        obstaculo.reiniciar(x, y, obstacle_type)
+        self.aciertos += 1
+        return obstaculo
+
+    def devolver(self, obstaculos):
+        """Guarda obstáculos que ya no están en el juego para reutilizarlos"""
+        libres = self._libres
+        for obstaculo in obstaculos:
+            if len(libres) < self.capacidad:
+                libres.append(obstaculo)
+            else:
+                self.descartados += 1
+        if len(libres) > self.maximo_libres:
+            self.maximo_libres = len(libres)
+
+    def contadores(self):
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'descartados': self.descartados,
+                'libres': len(self._libres), 'maximo_libres': self.maximo_libres}
@@ -13,6 +13,13 @@ class RoadRenderer:
     
     def dibujar_carretera(self, screen, posicion_en_carretera):
         """Dibuja la carretera completa con degradados y efectos"""
+        self.dibujar_fondo(screen)
+        self.dibujar_textura(screen, posicion_en_carretera)
+        # Línea central estilizada
+        self.dibujar_linea_central(screen, posicion_en_carretera)
+    
+    def dibujar_fondo(self, screen):
+        """Parte estática de la carretera (degradado y bordes); se puede guardar en una capa"""
         # Degradado vertical simple
         for i in range(self.altura_carretera):
             t = i / self.altura_carretera
@@ -28,17 +35,15 @@ class RoadRenderer:
         # Bordes externos brillantes
         pygame.draw.line(screen, (235, 235, 235), (0, self.inicio_carretera_y), (self.ventana_width, self.inicio_carretera_y), 2)
         pygame.draw.line(screen, (235, 235, 235), (0, self.fin_carretera_y), (self.ventana_width, self.fin_carretera_y), 2)
-
-        # Textura pseudo-asfalto (píxeles esporádicos)
+    
+    def dibujar_textura(self, screen, posicion_en_carretera):
+        """Textura pseudo-asfalto (píxeles esporádicos)"""
         import random
         for _ in range(120):
             x = random.randint(0, self.ventana_width-1)
             y = random.randint(self.inicio_carretera_y, self.fin_carretera_y-1)
             if (x + y + posicion_en_carretera) % 17 == 0:
                 screen.set_at((x, y), (90, 90, 90))
-
-        # Línea central estilizada
-        self.dibujar_linea_central(screen, posicion_en_carretera)
     
     def dibujar_linea_central(self, screen, posicion_en_carretera):
         """Dibuja la línea amarilla discontinua del centro con brillo"""
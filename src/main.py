@@ -1,5 +1,6 @@
 import pygame
 from utils.json_loader import load_config
+from utils.event_bus import configurar_bus, detener_bus
 from game.car import Car
 from game.obstacle_manager import ObstacleManager
 from game.game_engine import GameEngineModular
@@ -16,6 +17,10 @@ def main():
     configuracion = load_config('config/game_config.json')
     print("Configuración cargada")
     
+    # Los eventos del juego (colisiones, podas, spawns) van por el bus, no por print
+    configurar_bus(configuracion.get('log_level', 'info'), configuracion.get('log_file'),
+                   configuracion.get('log_rate', 50))
+    
     # Crear ventana del juego
     titulo_juego = configuracion.get('title', '2D Car Game - Versión Modular')
     ventana = GameWindow(SCREEN_WIDTH, SCREEN_HEIGHT, titulo_juego)
@@ -31,17 +36,32 @@ def main():
         print("[Aviso] No se encontró assets/car.png, usando rectángulo por defecto.")
         ruta_carro = None
     carro = Car(position=0, energy=configuracion.get('initial_energy', 100), sprite_path=ruta_carro)
-    gestor_obstaculos = ObstacleManager()
+    backend_indice = configuracion.get('obstacle_index', 'avl')
+    try:
+        gestor_obstaculos = ObstacleManager(backend_indice)
+    except ImportError as e:
+        print(f"[Aviso] Índice '{backend_indice}' no disponible ({e}), usando AVL.")
+        gestor_obstaculos = ObstacleManager()
+    reinicio = "O(1)" if hasattr(gestor_obstaculos.arbol, 'snapshot') else "O(n), O(1) con persistent_avl"
+    print(f"Índice de obstáculos: {type(gestor_obstaculos.arbol).__name__} (reinicio {reinicio})")
+    if configuracion.get('avl_debug', False) and hasattr(gestor_obstaculos.arbol, 'depuracion'):
+        # Cada cambio del árbol revisa los nodos de su camino
+        gestor_obstaculos.arbol.depuracion = True
+        print("Modo depuración del AVL activo")
     motor_juego = GameEngineModular(carro, gestor_obstaculos, ventana, configuracion)
     
     # Cargar obstáculos iniciales desde la configuración
-    obstaculos_iniciales = configuracion.get('obstacles', [])
+    # (con un curso binario los obstáculos llegan por chunks durante el juego)
+    obstaculos_iniciales = [] if configuracion.get('course_file') else configuracion.get('obstacles', [])
     gestor_obstaculos.cargar_obstaculos_iniciales(obstaculos_iniciales)
     print(f"Cargados {len(obstaculos_iniciales)} obstáculos iniciales")
     
     # Verificar configuración de la meta
-    distancia_meta = configuracion.get('meta_distance', 6000)
-    print(f"Meta establecida a {distancia_meta} metros")
+    if configuracion.get('endless_mode', False):
+        print(f"Modo infinito: curso procedural con semilla {configuracion.get('course_seed', 0)}")
+    else:
+        distancia_meta = configuracion.get('meta_distance', 6000)
+        print(f"Meta establecida a {distancia_meta} metros")
     
     # Ejecutar el juego
     print("Iniciando juego modular...")
@@ -49,6 +69,7 @@ def main():
     
     # Limpiar y salir
     pygame.quit()
+    detener_bus()
     print("Juego terminado")
 
 def mostrar_pantalla_inicio(ventana):
@@ -7,4 +7,17 @@ INITIAL_ENERGY = 100
 BACKGROUND_COLOR = (255, 255, 255)  # White
 CAR_COLOR = (0, 0, 255)  # Blue
 OBSTACLE_COLOR = (255, 0, 0)  # Red
-FPS = 60
\ No newline at end of file
+FPS = 60
+# Ventana de obstáculos visibles
+CAR_SCREEN_X = 50            # Posición fija del carro en pantalla
+ANCHO_CARRO = 50             # Ancho del rectángulo de colisión del carro
+ALTO_CARRO = 50              # Alto del rectángulo de colisión del carro
+ANCHO_MAX_OBSTACULO = 200    # El 'hole' es el obstáculo más ancho
+MARGEN_RENDER = 50           # Margen que usa el renderer a cada lado de la pantalla
+FRAMES_ANTICIPACION = 40     # Frames de recorrido que se cargan por delante
+# Modo infinito (curso procedural por chunks)
+LARGO_CHUNK = 1000           # Largo de carretera que cubre cada chunk generado
+SEPARACION_MIN = 250         # Distancia mínima entre obstáculos generados
+SEPARACION_MAX = 600         # Distancia máxima entre obstáculos generados
+FRAMES_PRECARGA = 120        # Frames por delante que el hilo de precarga deja chunks listos
+TAMANO_POOL = 4096           # Podados que se guardan para reutilizar (cubre una oleada densa)
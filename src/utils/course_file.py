@@ -0,0 +1,158 @@
+"""
+Formato binario de cursos para pistas de millones de obstáculos.
+
+El archivo tiene tres partes, todas little-endian:
+
+- Cabecera (CABECERA): firma, versión, cantidad de tipos, X donde empieza
+  el chunk 0, largo de chunk, cantidad de chunks y de registros. Después,
+  los nombres de los tipos en campos de ANCHO_NOMBRE_TIPO bytes.
+- Índice de chunks: num_chunks + 1 enteros de 64 bits. El chunk i ocupa
+  los registros [indice[i], indice[i + 1]).
+- Registros (REGISTRO) de ancho fijo, ordenados por X: x (int32),
+  y (int16) y código de tipo (uint8).
+
+CourseFile lo lee con mmap: abrirlo solo lee la cabecera y pedir un chunk
+solo toca sus páginas, así que el arranque y la RAM no dependen del largo
+del curso. Tiene la misma interfaz de chunks que CourseGenerator
+(inicio_chunk, chunk_de, datos_chunk), por lo que CourseStreamer lo puede
+usar como fuente.
+
+Conversión desde el JSON de configuración (desde la raíz del repo):
+    PYTHONPATH=src python -m utils.course_file config/game_config.json curso.bin
+"""
+import json
+import mmap
+import struct
+import sys
+
+from utils.constants import LARGO_CHUNK
+
+FIRMA = b'CRS1'
+VERSION = 1
+CABECERA = struct.Struct('<4sHHiIIQ4x')  # firma, versión, num_tipos, x_inicio, largo_chunk, num_chunks, num_registros
+ANCHO_NOMBRE_TIPO = 16
+ENTRADA_INDICE = struct.Struct('<Q')
+REGISTRO = struct.Struct('<ihBx')          # x, y, código de tipo (+1 byte de relleno)
+TIPOS_BASE = ("rock", "tree", "pothole", "hole")
+
+
+def escribir_curso(ruta, obstaculos, largo_chunk=LARGO_CHUNK):
+    """Escribe una lista de dicts {'x', 'y', 'type'} en formato binario.
+
+    Los obstáculos se ordenan por X. Devuelve la cantidad de registros.
+    """
+    obstaculos = sorted(obstaculos, key=lambda datos: datos['x'])
+    tipos = list(TIPOS_BASE)
+    codigos = {tipo: codigo for codigo, tipo in enumerate(tipos)}
+    x_inicio = int(obstaculos[0]['x']) if obstaculos else 0
+    num_chunks = (int(obstaculos[-1]['x']) - x_inicio) // largo_chunk + 1 if obstaculos else 0
+
+    registros = bytearray(REGISTRO.size * len(obstaculos))
+    indice = [0] * (num_chunks + 1)
+    for posicion, datos in enumerate(obstaculos):
+        tipo = datos['type']
+        if tipo not in codigos:
+            if len(tipos) == 256:
+                raise ValueError("el formato admite como máximo 256 tipos de obstáculo")
+            codigos[tipo] = len(tipos)
+            tipos.append(tipo)
+        x = int(datos['x'])
+        REGISTRO.pack_into(registros, posicion * REGISTRO.size, x, int(datos['y']), codigos[tipo])
+        indice[(x - x_inicio) // largo_chunk + 1] += 1
+    for i in range(num_chunks):
+        indice[i + 1] += indice[i]  # Conteos por chunk -> primer registro de cada chunk
+
+    with open(ruta, 'wb') as archivo:
+        archivo.write(CABECERA.pack(FIRMA, VERSION, len(tipos), x_inicio, largo_chunk,
+                                    num_chunks, len(obstaculos)))
+        for tipo in tipos:
+            nombre = tipo.encode('utf-8')
+            if len(nombre) > ANCHO_NOMBRE_TIPO:
+                raise ValueError(f"nombre de tipo demasiado largo: {tipo!r}")
+            archivo.write(nombre.ljust(ANCHO_NOMBRE_TIPO, b'\0'))
+        archivo.write(struct.pack(f'<{num_chunks + 1}Q', *indice))
+        archivo.write(registros)
+    return len(obstaculos)
+
+
+def convertir_json(ruta_json, ruta_binaria, largo_chunk=LARGO_CHUNK):
+    """Convierte el arreglo `obstacles` de un JSON de configuración al formato binario"""
+    with open(ruta_json, 'r') as archivo:
+        obstaculos = json.load(archivo).get('obstacles', [])
+    return escribir_curso(ruta_binaria, obstaculos, largo_chunk)
+
+
+class CourseFile:
+    """Curso binario abierto con mmap; se lee por chunks"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as archivo:
+            # El mapa sigue vivo aunque se cierre el archivo
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, num_tipos, self.inicio, self.largo_chunk, self.num_chunks, self.num_registros = \
+            CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            self._mapa.close()
+            raise ValueError(f"{ruta} no es un curso binario válido")
+        desplazamiento = CABECERA.size
+        self.tipos = tuple(
+            self._mapa[desplazamiento + i * ANCHO_NOMBRE_TIPO:
+                       desplazamiento + (i + 1) * ANCHO_NOMBRE_TIPO].rstrip(b'\0').decode('utf-8')
+            for i in range(num_tipos)
+        )
+        self._inicio_indice = desplazamiento + num_tipos * ANCHO_NOMBRE_TIPO
+        self._inicio_registros = self._inicio_indice + (self.num_chunks + 1) * ENTRADA_INDICE.size
+
+    def __len__(self):
+        return self.num_registros
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        """Libera el mmap (se puede llamar más de una vez)"""
+        self._mapa.close()
+
+    def inicio_chunk(self, indice):
+        """X donde empieza el chunk `indice`"""
+        return self.inicio + indice * self.largo_chunk
+
+    def chunk_de(self, x):
+        """Índice del chunk que contiene la posición x"""
+        return int((x - self.inicio) // self.largo_chunk)
+
+    def _registros_del_chunk(self, indice):
+        """Rango [primero, ultimo) de registros del chunk"""
+        primero, = ENTRADA_INDICE.unpack_from(self._mapa, self._inicio_indice + indice * ENTRADA_INDICE.size)
+        ultimo, = ENTRADA_INDICE.unpack_from(self._mapa, self._inicio_indice + (indice + 1) * ENTRADA_INDICE.size)
+        return primero, ultimo
+
+    def datos_chunk(self, indice):
+        """Obstáculos del chunk como dicts {'x', 'y', 'type'}; fuera del curso no hay ninguno"""
+        if not 0 <= indice < self.num_chunks:
+            return []
+        primero, ultimo = self._registros_del_chunk(indice)
+        tipos = self.tipos
+        bloque = self._mapa[self._inicio_registros + primero * REGISTRO.size:
+                            self._inicio_registros + ultimo * REGISTRO.size]
+        return [{'x': x, 'y': y, 'type': tipos[codigo]} for x, y, codigo in REGISTRO.iter_unpack(bloque)]
+
+    def datos_en_rango(self, x_min, x_max):
+        """Obstáculos con x_min <= x <= x_max, leyendo solo los chunks que tocan el rango"""
+        primero = max(self.chunk_de(x_min), 0)
+        ultimo = min(self.chunk_de(x_max), self.num_chunks - 1)
+        return [datos for indice in range(primero, ultimo + 1)
+                for datos in self.datos_chunk(indice) if x_min <= datos['x'] <= x_max]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: PYTHONPATH=src python -m utils.course_file entrada.json salida.bin [largo_chunk]")
+        sys.exit(1)
+    largo = int(sys.argv[3]) if len(sys.argv) > 3 else LARGO_CHUNK
+    cantidad = convertir_json(sys.argv[1], sys.argv[2], largo)
+    print(f"{cantidad} obstáculos escritos en {sys.argv[2]}")
@@ -0,0 +1,222 @@
+"""
+Bus de eventos del juego: reemplaza los print() del bucle de frames.
+
+Los subsistemas llaman a emitir(tipo, nivel, **datos). Si el nivel está
+por debajo del configurado el evento se descarta sin crear nada; si no,
+se agrega a un buffer circular de tamaño fijo (una deque con maxlen, cuyo
+append es atómico) y el hilo del juego sigue. Un hilo escritor vacía el
+buffer cada INTERVALO_ESCRITURA segundos y escribe en consola (texto) o
+en un archivo (una línea JSON por evento), con un límite de líneas por
+segundo. Si el buffer se llena se pierden los eventos más viejos y se
+cuentan en `perdidos`; los que no entran en el límite se resumen en una
+línea.
+
+Tipos de evento (el campo 'tipo', pensado para herramientas externas):
+spawn, batch_added, obstacle_removed, collision, restart, course_loaded,
+overlay, avl_checked, pool_stats, error y suppressed.
+"""
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERROR = 40
+NIVELES = {'debug': DEBUG, 'info': INFO, 'aviso': AVISO, 'error': ERROR}
+NOMBRES_NIVEL = {valor: nombre for nombre, valor in NIVELES.items()}
+
+# Tipos de evento
+SPAWN = 'spawn'
+LOTE = 'batch_added'
+ELIMINADO = 'obstacle_removed'
+COLISION = 'collision'
+REINICIO = 'restart'
+CURSO = 'course_loaded'
+OVERLAY = 'overlay'
+VALIDACION = 'avl_checked'
+POOL = 'pool_stats'
+FALLO = 'error'
+SUPRIMIDOS = 'suppressed'   # Lo escribe el propio bus cuando el límite de líneas descarta eventos
+
+
+def _texto_colision(datos):
+    if datos.get('saltando'):
+        return (f"¡Colisión durante salto con {datos['obstaculo']}! Sin pérdida de energía. "
+                f"Energía: {datos['energia']}")
+    return f"¡Colisión con {datos['obstaculo']}! Energía: {datos['energia']}"
+
+
+def _texto_validacion(datos):
+    if datos.get('resumen') is None:
+        if datos['obstaculos']:
+            # sorted_array y numpy no son árboles: no tienen raíz que validar
+            return (f"Índice sin árbol (backend {datos['backend']}, {datos['obstaculos']} obstáculos): "
+                    f"no hay AVL que validar")
+        return f"Índice vacío (backend {datos['backend']})"
+    if datos.get('contadores') is None:
+        return datos['resumen']
+    return f"{datos['resumen']} - contadores AVL: {datos['contadores']}"
+
+
+# Texto de consola por tipo (los mismos mensajes que antes imprimía cada módulo)
+FORMATOS = {
+    SPAWN: "Obstáculo agregado en posición ({x}, {y}) de tipo {obstaculo}",
+    LOTE: "Lote de {cantidad} obstáculos agregado entre X={x_min} y X={x_max}",
+    ELIMINADO: "Obstáculo eliminado en posición {x}",
+    COLISION: _texto_colision,
+    REINICIO: "Reinicio: {que}",
+    CURSO: "Curso binario {ruta}: {obstaculos} obstáculos en {chunks} chunks",
+    OVERLAY: "[AVL Overlay] Dibujando {nodos} nodos",
+    VALIDACION: _texto_validacion,
+    POOL: "Pool de obstáculos: {aciertos} reutilizados, {fallos} creados, {descartados} descartados, "
+          "{libres} libres (máximo {maximo_libres})",
+    FALLO: "Error en {donde}: {error}",
+    SUPRIMIDOS: "... {cantidad} eventos suprimidos por el límite de {limite} líneas/s",
+}
+
+CAPACIDAD_BUS = 4096
+INTERVALO_ESCRITURA = 0.05
+
+
+class Evento:
+    """Un evento del juego: tipo, nivel, momento y datos propios del tipo"""
+    __slots__ = ('tipo', 'nivel', 'tiempo', 'datos')
+
+    def __init__(self, tipo, nivel, datos):
+        self.tipo = tipo
+        self.nivel = nivel
+        self.tiempo = time.time()
+        self.datos = datos
+
+    def como_dict(self):
+        return {'t': round(self.tiempo, 4), 'nivel': NOMBRES_NIVEL.get(self.nivel, self.nivel),
+                'tipo': self.tipo, **self.datos}
+
+    def como_texto(self):
+        formato = FORMATOS.get(self.tipo)
+        if formato is not None:
+            try:
+                return formato(self.datos) if callable(formato) else formato.format(**self.datos)
+            except KeyError:
+                pass
+        detalle = ' '.join(f"{clave}={valor}" for clave, valor in self.datos.items())
+        return f"[{NOMBRES_NIVEL.get(self.nivel, self.nivel)}] {self.tipo} {detalle}".rstrip()
+
+
+class EventBus:
+    """Buffer circular de eventos con un hilo escritor en segundo plano.
+
+    `destino` es None para la consola o la ruta de un archivo (JSON por
+    línea). `max_por_segundo` limita las líneas escritas (None: sin límite).
+    """
+
+    def __init__(self, nivel=INFO, destino=None, max_por_segundo=50, capacidad=CAPACIDAD_BUS):
+        self.nivel = nivel
+        self.destino = destino
+        self.max_por_segundo = max_por_segundo
+        self._cola = deque(maxlen=capacidad)
+        self.emitidos = 0
+        self.perdidos = 0      # Pisados en el buffer lleno antes de escribirse
+        self.suprimidos = 0    # Descartados por el límite de líneas por segundo
+        self._archivo = open(destino, 'a', encoding='utf-8') if destino else None
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._escribir_en_bucle, name='bus-eventos', daemon=True)
+        self._hilo.start()
+
+    def activo(self, nivel):
+        """True si un evento de ese nivel se registraría (para no armar datos caros en vano)"""
+        return nivel >= self.nivel
+
+    def emitir(self, tipo, nivel=INFO, **datos):
+        if nivel >= self.nivel:
+            self._publicar(tipo, nivel, datos)
+
+    def _publicar(self, tipo, nivel, datos):
+        cola = self._cola
+        if len(cola) == cola.maxlen:
+            self.perdidos += 1
+        cola.append(Evento(tipo, nivel, datos))
+        self.emitidos += 1
+
+    def _escribir_en_bucle(self):
+        fichas = self.max_por_segundo
+        ultimo = time.monotonic()
+        suprimidos_avisados = 0
+        while True:
+            terminar = self._detener.wait(INTERVALO_ESCRITURA)
+            if self.max_por_segundo is not None:
+                ahora = time.monotonic()
+                fichas = min(self.max_por_segundo, fichas + (ahora - ultimo) * self.max_por_segundo)
+                ultimo = ahora
+            lineas = []
+            cola = self._cola
+            while cola:
+                evento = cola.popleft()
+                if self.max_por_segundo is not None:
+                    if fichas < 1:
+                        self.suprimidos += 1
+                        continue
+                    fichas -= 1
+                lineas.append(self._formatear(evento))
+            if self.suprimidos != suprimidos_avisados and (fichas >= 1 or terminar):
+                resumen = Evento(SUPRIMIDOS, AVISO, {'cantidad': self.suprimidos - suprimidos_avisados,
+                                                     'limite': self.max_por_segundo})
+                lineas.append(self._formatear(resumen))
+                suprimidos_avisados = self.suprimidos
+            if lineas:
+                salida = self._archivo or sys.stdout
+                salida.write('\n'.join(lineas) + '\n')
+                salida.flush()
+            if terminar:
+                return
+
+    def _formatear(self, evento):
+        if self._archivo is not None:
+            return json.dumps(evento.como_dict(), ensure_ascii=False, default=str)
+        return evento.como_texto()
+
+    def detener(self):
+        """Escribe lo pendiente y termina el hilo escritor"""
+        self._detener.set()
+        self._hilo.join()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+_bus = None
+
+
+def obtener_bus():
+    """Bus global; si nadie lo configuró se crea uno a consola con nivel INFO"""
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
+
+
+def configurar_bus(nivel='info', destino=None, max_por_segundo=50):
+    """Reemplaza el bus global (nivel por nombre: 'debug', 'info', 'aviso', 'error')"""
+    global _bus
+    if _bus is not None:
+        _bus.detener()
+    _bus = EventBus(NIVELES[nivel], destino, max_por_segundo)
+    return _bus
+
+
+def emitir(tipo, nivel=INFO, **datos):
+    """Publica un evento en el bus global"""
+    bus = _bus if _bus is not None else obtener_bus()
+    if nivel >= bus.nivel:
+        bus._publicar(tipo, nivel, datos)
+
+
+def detener_bus():
+    """Vacía y cierra el bus global"""
+    global _bus
+    if _bus is not None:
+        _bus.detener()
+        _bus = None